@@ -43,7 +43,9 @@ class BlogTagAdmin(admin.ModelAdmin):
 
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'author', 'category', 'status', 'is_featured', 'views_count', 'published_at')
+    list_display = ('title', 'author', 'category', 'status', 'is_featured', 'views_count', 'comments_count',
+                    'published_at')
+    list_select_related = ('author', 'category')
     list_filter = ('status', 'is_featured', 'category', 'author', 'created_at', 'published_at')
     search_fields = ('title', 'excerpt', 'content', 'meta_title')
     list_editable = ('status', 'is_featured')
@@ -76,12 +78,12 @@ class BlogPostAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Statistics', {
-            'fields': ('views_count', 'likes_count'),
+            'fields': ('views_count', 'likes_count', 'comments_count'),
             'classes': ('collapse',)
         })
     )
 
-    readonly_fields = ('views_count', 'likes_count')
+    readonly_fields = ('views_count', 'likes_count', 'comments_count')
 
     def save_model(self, request, obj, form, change):
         if not change:  # If creating new post
@@ -97,6 +99,8 @@ class BlogPostAdmin(admin.ModelAdmin):
 @admin.register(BlogComment)
 class BlogCommentAdmin(admin.ModelAdmin):
     list_display = ('name', 'post', 'status', 'created_at', 'moderated_by')
+    list_select_related = ('post', 'moderated_by')
+    raw_id_fields = ('post', 'parent')
     list_filter = ('status', 'created_at', 'moderated_by')
     search_fields = ('name', 'email', 'content', 'post__title')
     list_editable = ('status',)
@@ -125,15 +129,13 @@ class BlogCommentAdmin(admin.ModelAdmin):
     actions = ['approve_comments', 'reject_comments']
 
     def approve_comments(self, request, queryset):
-        for comment in queryset:
-            comment.approve(request.user)
-        self.message_user(request, f"{queryset.count()} comments approved.")
+        updated = queryset.approve(request.user)
+        self.message_user(request, f"{updated} comments approved.")
     approve_comments.short_description = "Approve selected comments"
 
     def reject_comments(self, request, queryset):
-        for comment in queryset:
-            comment.reject(request.user)
-        self.message_user(request, f"{queryset.count()} comments rejected.")
+        updated = queryset.reject(request.user)
+        self.message_user(request, f"{updated} comments rejected.")
     reject_comments.short_description = "Reject selected comments"
 
     class Media:
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        from core.signals import connect_related_content
+        from .related import BlogPostRelated
+        connect_related_content(BlogPostRelated())
+
+        from .signals import connect_comment_stats
+        connect_comment_stats()
@@ -0,0 +1,83 @@
+"""
+Comment threads for the blog
+A post's approved comments are fetched in one query and assembled into a tree
+in memory, then cached under a key that includes the post's
+comments_moderated_at, so approving, rejecting or editing a comment on one
+post only invalidates that post's tree. Each node carries its replies in
+.children (the replies manager would cost one query per node).
+"""
+
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+COMMENT_TREE_TIMEOUT = 60 * 60 * 24
+
+# What a rendered thread needs; email, IP and user agent stay out of the cache
+COMMENT_TREE_FIELDS = ('id', 'post_id', 'parent_id', 'name', 'website', 'content', 'status', 'created_at')
+
+
+def comment_tree_key(post):
+    moderated_at = post.comments_moderated_at
+    stamp = int(moderated_at.timestamp() * 1000) if moderated_at else 0
+    return f'blog_comment_tree:{post.pk}:{stamp}'
+
+
+def build_comment_tree(comments):
+    """
+    Root comments with .children set on every node, in the order given.
+    Replies whose parent is not in comments (pending, rejected) are dropped
+    along with their own replies.
+    """
+    by_id = {}
+    for comment in comments:
+        comment.children = []
+        by_id[comment.pk] = comment
+
+    roots = []
+    for comment in by_id.values():
+        if comment.parent_id is None:
+            roots.append(comment)
+        elif comment.parent_id in by_id:
+            by_id[comment.parent_id].children.append(comment)
+    return roots
+
+
+def load_comment_tree(post):
+    """Approved comment tree for a post; one query on a cache miss"""
+    from .models import BlogComment
+
+    def _load():
+        comments = (
+            BlogComment.objects.filter(post_id=post.pk, status='approved')
+            .only(*COMMENT_TREE_FIELDS)
+            .order_by('created_at', 'pk')
+        )
+        return build_comment_tree(list(comments))
+
+    return cache.get_or_set(comment_tree_key(post), _load, COMMENT_TREE_TIMEOUT)
+
+
+def refresh_comment_stats(post_ids):
+    """
+    Recount approved comments and move comments_moderated_at forward for
+    the given posts in one UPDATE; the old cached trees are no longer read
+    and expire on their own.
+    """
+    from .models import BlogComment, BlogPost
+
+    post_ids = {pk for pk in post_ids if pk is not None}
+    if not post_ids:
+        return 0
+    approved = (
+        BlogComment.objects.filter(post=OuterRef('pk'), status='approved')
+        .order_by()
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return BlogPost.objects.filter(pk__in=post_ids).update(
+        comments_count=Coalesce(Subquery(approved, output_field=IntegerField()), Value(0)),
+        comments_moderated_at=timezone.now(),
+    )
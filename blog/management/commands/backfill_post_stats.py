@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import BlogPost
+
+
+class Command(BaseCommand):
+    help = 'Compute stored word count, reading time and plain-text excerpt for existing blog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Posts per bulk update',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fields = list(BlogPost.TEXT_STATS_FIELDS)
+        self.stdout.write('📖 Backfilling blog post reading stats...')
+
+        checked = changed = 0
+        pending = []
+        queryset = BlogPost.objects.only('pk', 'content', *fields).order_by('pk')
+        for post in queryset.iterator(chunk_size=batch_size):
+            checked += 1
+            before = [getattr(post, field) for field in fields]
+            post.update_text_stats()
+            if [getattr(post, field) for field in fields] != before:
+                pending.append(post)
+            if len(pending) >= batch_size:
+                BlogPost.objects.bulk_update(pending, fields)
+                changed += len(pending)
+                pending = []
+        if pending:
+            BlogPost.objects.bulk_update(pending, fields)
+            changed += len(pending)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Blog posts: {changed} of {checked} updated'))
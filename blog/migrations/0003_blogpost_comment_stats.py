@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-19 00:22
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_approved_comments(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogComment = apps.get_model('blog', 'BlogComment')
+    approved = (
+        BlogComment.objects.filter(post=OuterRef('pk'), status='approved')
+        .order_by()
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    BlogPost.objects.update(
+        comments_count=Coalesce(Subquery(approved, output_field=IntegerField()), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blogpost_text_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Approved comments'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='comments_moderated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Last change to its comments; keys the cached comment tree', null=True),
+        ),
+        migrations.RunPython(count_approved_comments, migrations.RunPython.noop),
+    ]
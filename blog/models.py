@@ -1,10 +1,12 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.urls import reverse
-from django.utils.text import slugify
+from django.utils.html import strip_tags
+from django.utils.text import Truncator, slugify
 from django.utils import timezone
 from core.models import TimeStampedModel
 import readtime
+from readtime.result import Result as ReadingTime
 
 class BlogCategory(TimeStampedModel):
     """Blog post categories"""
@@ -52,6 +54,12 @@ class BlogTag(TimeStampedModel):
     def get_absolute_url(self):
         return reverse('blog:tag', kwargs={'slug': self.slug})
 
+class BlogPostQuerySet(models.QuerySet):
+    def listing(self):
+        """Card data only: the body is never loaded for lists (see update_text_stats)"""
+        return self.defer('content').select_related('category')
+
+
 class BlogPost(TimeStampedModel):
     """Blog posts"""
     STATUS_CHOICES = [
@@ -86,6 +94,19 @@ class BlogPost(TimeStampedModel):
     # Engagement
     views_count = models.PositiveIntegerField(default=0)
     likes_count = models.PositiveIntegerField(default=0)
+    # Maintained by blog.comments.refresh_comment_stats
+    comments_count = models.PositiveIntegerField(default=0, editable=False, help_text="Approved comments")
+    comments_moderated_at = models.DateTimeField(null=True, blank=True, editable=False,
+                                                 help_text="Last change to its comments; keys the cached comment tree")
+
+    # Derived from content on save (see update_text_stats) so listings never load it
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time_seconds = models.PositiveIntegerField(default=0, editable=False)
+    text_excerpt = models.CharField(max_length=300, blank=True, editable=False,
+                                    help_text="Plain-text start of the content")
+    TEXT_STATS_FIELDS = ('word_count', 'reading_time_seconds', 'text_excerpt')
+
+    objects = BlogPostQuerySet.as_manager()
 
     # Display options
     is_featured = models.BooleanField(default=False, help_text="Show on homepage")
@@ -109,8 +130,21 @@ class BlogPost(TimeStampedModel):
         elif self.status != 'published':
             self.published_at = None
 
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.update_text_stats()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.TEXT_STATS_FIELDS)
+
         super().save(*args, **kwargs)
 
+    def update_text_stats(self):
+        """Recompute word count, reading time and plain-text excerpt from content"""
+        text = strip_tags(self.content or '')
+        self.word_count = len(text.split())
+        self.reading_time_seconds = readtime.of_text(text).seconds if text.strip() else 0
+        self.text_excerpt = Truncator(' '.join(text.split())).chars(300)
+
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'slug': self.slug})
 
@@ -120,24 +154,65 @@ class BlogPost(TimeStampedModel):
         self.save(update_fields=['views_count'])
 
     def get_reading_time(self):
-        """Calculate estimated reading time"""
-        return readtime.of_text(self.content)
+        """Estimated reading time (stored on save; .minutes is at least 1)"""
+        return ReadingTime(seconds=self.reading_time_seconds)
+
+    @property
+    def reading_time_minutes(self):
+        return self.get_reading_time().minutes
 
     @property
     def is_published(self):
         """Check if post is published"""
         return self.status == 'published' and self.published_at
 
+    def get_comment_tree(self):
+        """Approved comments as a tree (see blog.comments)"""
+        from .comments import load_comment_tree
+        return load_comment_tree(self)
+
     def get_related_posts(self, limit=3):
-        """Get related posts based on category and tags"""
-        related = BlogPost.objects.filter(
-            status='published'
-        ).exclude(id=self.id)
+        """Get related posts based on tags, category and recency (precomputed, see blog.related)"""
+        from core.related import related_queryset
+        queryset = BlogPost.objects.listing().filter(status='published')
+        fallback = queryset.filter(category_id=self.category_id) if self.category_id else queryset
+        return related_queryset(self, queryset, limit, fallback)
+
+class BlogCommentQuerySet(models.QuerySet):
+    def approve(self, user=None):
+        return self.moderate('approved', user)
 
-        if self.category:
-            related = related.filter(category=self.category)
+    def reject(self, user=None):
+        return self.moderate('rejected', user)
+
+    def moderate(self, status, user=None):
+        """
+        Set status, moderator and timestamp on every comment in one UPDATE,
+        then recount the affected posts and log one activity entry per
+        comment in one INSERT. Returns the number of comments updated.
+        """
+        from core.surrogate import list_key, model_key, schedule_purge
+        from dashboard.models import ActivityLog
+        from .comments import refresh_comment_stats
+
+        now = timezone.now()
+        with transaction.atomic():
+            rows = list(self.values_list('pk', 'post_id', 'name', 'post__title'))
+            if not rows:
+                return 0
+            updated = self.update(status=status, moderated_by=user, moderated_at=now, updated_at=now)
+            post_ids = {post_id for _, post_id, _, _ in rows}
+            refresh_comment_stats(post_ids)
+            if user is not None:
+                verb = 'Approved' if status == 'approved' else 'Rejected'
+                ActivityLog.log_many(
+                    user, 'update', 'BlogComment',
+                    [(pk, f"{name} on {title}") for pk, _, name, title in rows],
+                    f"{verb} comment",
+                )
+            schedule_purge({list_key(BlogComment)} | {f'{model_key(BlogPost)}:{pk}' for pk in post_ids})
+        return updated
 
-        return related[:limit]
 
 class BlogComment(TimeStampedModel):
     """Blog post comments"""
@@ -165,6 +240,8 @@ class BlogComment(TimeStampedModel):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
 
+    objects = BlogCommentQuerySet.as_manager()
+
     class Meta:
         ordering = ['created_at']
         verbose_name = "Blog Comment"
@@ -175,17 +252,13 @@ class BlogComment(TimeStampedModel):
 
     def approve(self, user=None):
         """Approve comment"""
-        self.status = 'approved'
-        self.moderated_by = user
-        self.moderated_at = timezone.now()
-        self.save()
+        BlogComment.objects.filter(pk=self.pk).approve(user)
+        self.refresh_from_db(fields=['status', 'moderated_by', 'moderated_at', 'updated_at'])
 
     def reject(self, user=None):
         """Reject comment"""
-        self.status = 'rejected'
-        self.moderated_by = user
-        self.moderated_at = timezone.now()
-        self.save()
+        BlogComment.objects.filter(pk=self.pk).reject(user)
+        self.refresh_from_db(fields=['status', 'moderated_by', 'moderated_at', 'updated_at'])
 
     @property
     def is_approved(self):
@@ -0,0 +1,27 @@
+"""
+Related posts for the blog: shared tags weigh most, then the category,
+with recency as a tie-breaker (see core.related)
+"""
+
+from core.related import RelatedContent
+
+
+class BlogPostRelated(RelatedContent):
+    label = 'blog.BlogPost'
+    tag_field = 'tags'
+    categories = {'category_id': 1.0}
+
+    def candidates(self):
+        return self.model.objects.filter(status='published').defer('content')
+
+    def prepare(self, queryset):
+        return queryset.prefetch_related('tags')
+
+    def get_tags(self, obj):
+        return frozenset(tag.pk for tag in obj.tags.all())
+
+    def get_date(self, obj):
+        return obj.published_at or obj.created_at
+
+    def get_text(self, obj):
+        return f'{obj.title} {obj.excerpt}'
@@ -0,0 +1,33 @@
+"""
+Signal handlers for blog.
+Saving or deleting a comment keeps its post's approved-comment count and
+cached comment tree (blog.comments) up to date.
+"""
+
+from django.db.models.signals import post_delete, post_save
+
+from .comments import refresh_comment_stats
+from .models import BlogComment
+
+
+def update_comment_stats(sender, instance, **kwargs):
+    """Recount the post's approved comments and invalidate its comment tree"""
+    if kwargs.get('raw'):
+        return
+    # New comments wait for moderation; nothing visible changed yet
+    if kwargs.get('created') and instance.status != 'approved':
+        return
+    refresh_comment_stats([instance.post_id])
+
+
+def connect_comment_stats():
+    post_save.connect(
+        update_comment_stats,
+        sender=BlogComment,
+        dispatch_uid='blog_comment_stats_save',
+    )
+    post_delete.connect(
+        update_comment_stats,
+        sender=BlogComment,
+        dispatch_uid='blog_comment_stats_delete',
+    )
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from django.views.generic import ListView, DetailView
 from core.views import BaseContextMixin
+from core.warmup import is_cache_warmup
 from .models import BlogPost, BlogCategory, BlogTag
 
 class BlogPostListView(BaseContextMixin, ListView):
@@ -11,7 +12,7 @@ class BlogPostListView(BaseContextMixin, ListView):
     paginate_by = 10
 
     def get_queryset(self):
-        return BlogPost.objects.filter(status='published')
+        return BlogPost.objects.listing().filter(status='published')
 
 class BlogPostDetailView(BaseContextMixin, DetailView):
     """Blog post detail page"""
@@ -24,9 +25,16 @@ class BlogPostDetailView(BaseContextMixin, DetailView):
 
     def get_object(self):
         obj = super().get_object()
-        obj.increment_views()
+        if not is_cache_warmup(self.request):
+            obj.increment_views()
         return obj
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['related_posts'] = self.object.get_related_posts()
+        context['comments'] = self.object.get_comment_tree()
+        return context
+
 class BlogCategoryView(BaseContextMixin, ListView):
     """Blog posts by category"""
     model = BlogPost
@@ -35,7 +43,7 @@ class BlogCategoryView(BaseContextMixin, ListView):
     paginate_by = 10
 
     def get_queryset(self):
-        return BlogPost.objects.filter(
+        return BlogPost.objects.listing().filter(
             status='published',
             category__slug=self.kwargs['slug']
         )
@@ -48,7 +56,7 @@ class BlogTagView(BaseContextMixin, ListView):
     paginate_by = 10
 
     def get_queryset(self):
-        return BlogPost.objects.filter(
+        return BlogPost.objects.listing().filter(
             status='published',
             tags__slug=self.kwargs['slug']
         )
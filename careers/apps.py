@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CareersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'careers'
+
+    def ready(self):
+        from core.signals import connect_facet_counts
+        from .facets import JobFacets
+        connect_facet_counts(JobFacets())
@@ -0,0 +1,43 @@
+"""
+Filter counts for the job list (see core.facets)
+"""
+
+from django.db.models import Q
+
+from core.facets import Facet, FacetSet
+
+from .models import Department, JobPosition
+
+
+class JobFacets(FacetSet):
+    name = 'jobs'
+    facets = (
+        Facet('department', 'department__slug'),
+        Facet('job_type', 'job_type'),
+        Facet('experience', 'experience_level'),
+    )
+    filter_params = ('q', 'location', 'remote')
+    bounded_params = {'remote': {'1'}}
+    watched_models = (JobPosition, Department)
+
+    def base_queryset(self):
+        return JobPosition.objects.filter(status='active')
+
+    def filter_extra(self, queryset, params):
+        q = params.get('q')
+        if q:
+            queryset = queryset.filter(
+                Q(title__icontains=q)
+                | Q(summary__icontains=q)
+                | Q(description__icontains=q)
+                | Q(department__name__icontains=q)
+                | Q(location__icontains=q)
+            )
+
+        location = params.get('location')
+        if location:
+            queryset = queryset.filter(location__icontains=location)
+
+        if params.get('remote') == '1':
+            queryset = queryset.filter(remote_allowed=True)
+        return queryset
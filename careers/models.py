@@ -120,8 +120,9 @@ class JobPosition(TimeStampedModel):
 
     def increment_applications(self):
         """Increment applications count"""
-        self.applications_count += 1
-        self.save(update_fields=['applications_count'])
+        # Atomic in the database so concurrent applications are not lost
+        JobPosition.objects.filter(pk=self.pk).update(applications_count=models.F('applications_count') + 1)
+        self.refresh_from_db(fields=['applications_count'])
 
     @property
     def is_active(self):
@@ -1,60 +1,28 @@
 from django.shortcuts import render, redirect
 from django.views.generic import ListView, DetailView, FormView, TemplateView
 from django.contrib import messages
-from django.db.models import Q
+from django.db import transaction
+from core.facets import get_facet_set, with_counts
 from core.views import BaseContextMixin
+from core.warmup import is_cache_warmup
+from core.outbox import queue_email
+from core.uploads import spool_upload
 from .models import JobPosition, JobApplication, Department
 from .forms import JobApplicationForm
 
 class JobListView(BaseContextMixin, ListView):
     """List all active job positions"""
     model = JobPosition
+    surrogate_keys = ('department-list', 'career-page-content-list')
     template_name = 'careers/job_list.html'
     context_object_name = 'jobs'
     paginate_by = 10
 
     def get_queryset(self):
-        qs = JobPosition.objects.filter(status='active')
-        params = self.request.GET
-
-        # Search
-        q = params.get('q')
-        if q:
-            qs = qs.filter(
-                Q(title__icontains=q)
-                | Q(summary__icontains=q)
-                | Q(description__icontains=q)
-                | Q(department__name__icontains=q)
-                | Q(location__icontains=q)
-            )
-
-        # Department
-        dept = params.get('department')
-        if dept:
-            qs = qs.filter(department__slug=dept)
-
-        # Job type
-        job_type = params.get('job_type')
-        if job_type:
-            qs = qs.filter(job_type=job_type)
-
-        # Experience level
-        experience = params.get('experience')
-        if experience:
-            qs = qs.filter(experience_level=experience)
-
-        # Location
-        location = params.get('location')
-        if location:
-            qs = qs.filter(location__icontains=location)
-
-        # Remote allowed
-        remote = params.get('remote')
-        if remote == '1':
-            qs = qs.filter(remote_allowed=True)
-
+        # Search, department, job type, experience, location and remote filters
+        # live in careers.facets so the sidebar counts match the list.
         # Featured first already handled by model Meta ordering
-        return qs
+        return get_facet_set('jobs').filtered_queryset(self.request.GET)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -62,10 +30,12 @@ class JobListView(BaseContextMixin, ListView):
         params.pop('page', None)
         querystring = params.urlencode()
 
+        counts = get_facet_set('jobs').counts(self.request.GET)
+
         context.update({
-            'departments': Department.objects.filter(is_active=True).order_by('name'),
-            'job_types': JobPosition.JOB_TYPES,
-            'experience_levels': JobPosition.EXPERIENCE_LEVELS,
+            'departments': with_counts(Department.objects.filter(is_active=True).order_by('name'), counts['department']),
+            'job_types': with_counts(JobPosition.JOB_TYPES, counts['job_type']),
+            'experience_levels': with_counts(JobPosition.EXPERIENCE_LEVELS, counts['experience']),
             'current_filters': {
                 'q': self.request.GET.get('q', ''),
                 'department': self.request.GET.get('department', ''),
@@ -89,7 +59,8 @@ class JobDetailView(BaseContextMixin, DetailView):
 
     def get_object(self):
         obj = super().get_object()
-        obj.increment_views()
+        if not is_cache_warmup(self.request):
+            obj.increment_views()
         return obj
 
 class JobApplicationView(BaseContextMixin, FormView):
@@ -109,9 +80,33 @@ class JobApplicationView(BaseContextMixin, FormView):
         job = JobPosition.objects.get(slug=self.kwargs['slug'])
         application = form.save(commit=False)
         application.position = job
-        application.save()
 
-        job.increment_applications()
+        # Attachments are spooled locally and uploaded in the background, so
+        # the request never waits on remote storage
+        attachments = {}
+        for field_name in ('cv_file', 'cover_letter_file'):
+            uploaded = form.cleaned_data.get(field_name)
+            if uploaded:
+                attachments[field_name] = uploaded
+            setattr(application, field_name, '')
+
+        with transaction.atomic():
+            application.save()
+            for field_name, uploaded in attachments.items():
+                spool_upload(application, field_name, uploaded)
+            job.increment_applications()
+            queue_email(
+                subject=f'Application received: {job.title}',
+                body=(
+                    f'Dear {application.first_name},\n\n'
+                    f'Thank you for applying for the {job.title} position at Skyline Ghana Constructions. '
+                    f'We have received your application and our team will review it shortly.\n\n'
+                    f'Skyline Ghana Constructions'
+                ),
+                to=[application.email],
+                reply_to=[job.contact_email] if job.contact_email else None,
+                dedup_key=f'job-application-{application.pk}',
+            )
         messages.success(self.request, 'Your application has been submitted successfully!')
         return super().form_valid(form)
 
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from .signals import (
+            connect_file_cleanup, connect_homepage_rebuild, connect_image_placeholders,
+            connect_sitemap_regeneration, connect_surrogate_purges,
+        )
+        connect_file_cleanup()
+        connect_image_placeholders()
+        connect_sitemap_regeneration()
+        connect_surrogate_purges()
+        connect_homepage_rebuild()
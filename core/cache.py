@@ -0,0 +1,401 @@
+"""
+Two-tier cache backend for Skyline Ghana Constructions
+A small per-process LRU with short TTLs sits in front of the shared cache
+(Redis, or the database cache table when Redis is not configured), so hot
+keys such as site settings cost a dict lookup instead of a query. Values
+computed through get_or_set() are protected against stampedes: one caller
+per key recomputes while the others wait for (or keep serving) the previous
+value, and entries are refreshed a little before they expire, with a
+probability that rises as expiry approaches.
+
+Writes and deletes go to both tiers, but other processes may serve their
+local copy for up to LOCAL_TIMEOUT seconds, so keep it short. add(), incr()
+and decr() always go to the shared tier because they coordinate between
+processes.
+"""
+
+import logging
+import math
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Per-process state shared by every thread's backend instance (Django creates
+# one backend object per thread), keyed by cache alias
+_local_stores = {}
+_local_stats = {}
+_flight_locks = {}
+_state_lock = threading.Lock()
+
+STAT_NAMES = (
+    'local_hits', 'local_misses', 'shared_hits', 'shared_misses',
+    'computes', 'early_refreshes', 'lock_waits', 'stale_served',
+)
+
+
+class _Entry:
+    """Value stored by get_or_set(), with what XFetch needs to refresh early"""
+    __slots__ = ('value', 'expires_at', 'delta')
+
+    def __init__(self, value, expires_at, delta):
+        self.value = value
+        self.expires_at = expires_at
+        self.delta = delta
+
+    def __getstate__(self):
+        return (self.value, self.expires_at, self.delta)
+
+    def __setstate__(self, state):
+        self.value, self.expires_at, self.delta = state
+
+
+def _unwrap(value):
+    return value.value if isinstance(value, _Entry) else value
+
+
+class LocalStore:
+    """Bounded LRU of pickled values with per-entry expiry"""
+
+    def __init__(self, max_entries, max_value_size):
+        self.max_entries = max_entries
+        self.max_value_size = max_value_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, payload = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(payload)
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            self.delete(key)
+            return
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_value_size:
+            self.delete(key)
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache(BaseCache):
+    """
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.TieredCache',
+            'LOCATION': 'default',
+            'OPTIONS': {'SHARED_ALIAS': 'shared', 'LOCAL_TIMEOUT': 5},
+        },
+        'shared': {...},
+    }
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.name = location or 'default'
+        self.shared_alias = options.get('SHARED_ALIAS', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        self.lock_timeout = options.get('LOCK_TIMEOUT', 10)
+        self.early_refresh_beta = options.get('EARLY_REFRESH_BETA', 1.0)
+        self.stats_flush_interval = options.get('STATS_FLUSH_INTERVAL', 60)
+        with _state_lock:
+            if self.name not in _local_stores:
+                _local_stores[self.name] = LocalStore(
+                    max_entries=options.get('LOCAL_MAX_ENTRIES', 1000),
+                    max_value_size=options.get('LOCAL_MAX_VALUE_SIZE', 64 * 1024),
+                )
+                _local_stats[self.name] = {'counts': dict.fromkeys(STAT_NAMES, 0), 'flushed_at': time.monotonic()}
+        self.local = _local_stores[self.name]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _local_key(self, key, version):
+        return (key, self.version if version is None else version)
+
+    def _local_ttl(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.local_timeout
+        return min(self.local_timeout, timeout)
+
+    # Statistics
+
+    def _count(self, name, amount=1):
+        stats = _local_stats[self.name]
+        with _state_lock:
+            stats['counts'][name] += amount
+            due = time.monotonic() - stats['flushed_at'] >= self.stats_flush_interval
+        if due:
+            self.flush_stats()
+
+    def _stats_key(self, name):
+        return f'tiered_cache_stats:{self.name}:{name}'
+
+    def flush_stats(self):
+        """Add this process's counters to the shared totals and reset them"""
+        stats = _local_stats[self.name]
+        with _state_lock:
+            counts = {name: value for name, value in stats['counts'].items() if value}
+            stats['counts'] = dict.fromkeys(STAT_NAMES, 0)
+            stats['flushed_at'] = time.monotonic()
+        for name, value in counts.items():
+            key = self._stats_key(name)
+            try:
+                self.shared.add(key, 0, None)
+                self.shared.incr(key, value)
+            except Exception as e:
+                logger.warning(f"Could not publish cache stats {key}: {e}")
+
+    def process_stats(self):
+        """Counters for this process since the last flush"""
+        with _state_lock:
+            counts = dict(_local_stats[self.name]['counts'])
+        counts['local_entries'] = len(self.local)
+        return counts
+
+    def shared_stats(self):
+        """Counters published by every process"""
+        values = self.shared.get_many([self._stats_key(name) for name in STAT_NAMES])
+        return {name: values.get(self._stats_key(name), 0) for name in STAT_NAMES}
+
+    def reset_stats(self):
+        self.shared.delete_many([self._stats_key(name) for name in STAT_NAMES])
+        with _state_lock:
+            _local_stats[self.name]['counts'] = dict.fromkeys(STAT_NAMES, 0)
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        value = self._get_entry(key, version)
+        return default if value is _MISSING else _unwrap(value)
+
+    def _get_entry(self, key, version):
+        """Local tier first, then shared; returns _MISSING on a miss"""
+        local_key = self._local_key(key, version)
+        value = self.local.get(local_key)
+        if value is not _MISSING:
+            self._count('local_hits')
+            return value
+        self._count('local_misses')
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._count('shared_misses')
+            return _MISSING
+        self._count('shared_hits')
+        self.local.set(local_key, value, self.local_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self.local.set(self._local_key(key, version), value, self._local_ttl(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.local.set(self._local_key(key, version), value, self._local_ttl(timeout))
+        return added
+
+    def delete(self, key, version=None):
+        self.local.delete(self._local_key(key, version))
+        return self.shared.delete(key, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def has_key(self, key, version=None):
+        if self.local.get(self._local_key(key, version)) is not _MISSING:
+            return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(self._local_key(key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self.local.delete(self._local_key(key, version))
+        return self.shared.decr(key, delta, version=version)
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remaining = []
+        for key in keys:
+            value = self.local.get(self._local_key(key, version))
+            if value is _MISSING:
+                remaining.append(key)
+            else:
+                found[key] = _unwrap(value)
+        self._count('local_hits', len(found))
+        if remaining:
+            self._count('local_misses', len(remaining))
+            shared = self.shared.get_many(remaining, version=version)
+            self._count('shared_hits', len(shared))
+            self._count('shared_misses', len(remaining) - len(shared))
+            for key, value in shared.items():
+                self.local.set(self._local_key(key, version), value, self.local_timeout)
+                found[key] = _unwrap(value)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        ttl = self._local_ttl(timeout)
+        for key, value in data.items():
+            if key not in failed:
+                self.local.set(self._local_key(key, version), value, ttl)
+        return failed
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.local.delete(self._local_key(key, version))
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Single-flight get_or_set with probabilistic early refresh (XFetch):
+        only one caller per key computes default() while others wait for the
+        result or keep serving the value that is about to expire.
+        """
+        entry = self._get_entry(key, version)
+        if entry is not _MISSING and not self._should_refresh(entry):
+            return _unwrap(entry)
+        if entry is not _MISSING:
+            self._count('early_refreshes')
+        if not callable(default):
+            if entry is _MISSING:
+                self.add(key, default, timeout, version=version)
+                return self.get(key, default, version=version)
+            return _unwrap(entry)
+
+        with self._flight_lock(key, version):
+            # Another thread in this process may have refreshed it already
+            fresh = self.local.get(self._local_key(key, version))
+            if fresh is not _MISSING and not self._should_refresh(fresh):
+                return _unwrap(fresh)
+
+            lock_key = f'{key}:lock'
+            if self.shared.add(lock_key, 1, self.lock_timeout, version=version):
+                try:
+                    return self._compute(key, default, timeout, version)
+                finally:
+                    self.shared.delete(lock_key, version=version)
+
+            # Someone else is computing: serve the old value, or wait for theirs
+            if entry is not _MISSING:
+                self._count('stale_served')
+                return _unwrap(entry)
+            self._count('lock_waits')
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                value = self.shared.get(key, _MISSING, version=version)
+                if value is not _MISSING:
+                    self.local.set(self._local_key(key, version), value, self.local_timeout)
+                    return _unwrap(value)
+            return self._compute(key, default, timeout, version)
+
+    def _compute(self, key, default, timeout, version):
+        self._count('computes')
+        started = time.monotonic()
+        value = default()
+        delta = time.monotonic() - started
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        expires_at = time.time() + timeout if timeout is not None else None
+        self.set(key, _Entry(value, expires_at, delta), timeout, version=version)
+        return value
+
+    def _should_refresh(self, entry):
+        """XFetch: refresh early with probability rising as expiry nears"""
+        if not isinstance(entry, _Entry) or entry.expires_at is None or entry.delta <= 0:
+            return False
+        jitter = -entry.delta * self.early_refresh_beta * math.log(random.random() or 1e-12)
+        return time.time() + jitter >= entry.expires_at
+
+    @contextmanager
+    def _flight_lock(self, key, version):
+        """
+        Per-key lock so threads of one process compute a value once. Entries
+        are reference counted and dropped when no thread holds or waits on
+        them, so unbounded key spaces (generations, search digests) don't grow.
+        """
+        lock_key = (self.name, *self._local_key(key, version))
+        with _state_lock:
+            entry = _flight_locks.get(lock_key)
+            if entry is None:
+                entry = _flight_locks[lock_key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with _state_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del _flight_locks[lock_key]
+
+
+
+def get_generation(key):
+    """
+    Current value of a generation counter in the default cache. Cache keys
+    that embed it are all retired at once by bump_generation(key).
+    """
+    from django.core.cache import cache
+
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def bump_generation(key):
+    from django.core.cache import cache
+
+    cache.add(key, 1, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
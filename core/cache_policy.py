@@ -0,0 +1,149 @@
+"""
+HTTP cache policies for Skyline Ghana Constructions
+Cache-Control is chosen per route: a view decorated with @cache_policy wins,
+then settings.CACHE_POLICIES keyed by URL name ('blog:post_detail', or
+'dashboard:*' for a whole namespace), then CACHE_POLICY_DEFAULT. Responses
+that carry per-visitor state (cookies, CSRF tokens, flash messages, a logged
+in user) are never sent as public, whatever the policy says, so a CDN or the
+page cache can only ever store anonymous pages.
+"""
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .conditional import expires_header
+
+# Named policies; settings.CACHE_POLICIES may reference these or give a dict
+PRESETS = {
+    # Anonymous pages: browsers revalidate often, shared caches hold longer
+    'public': {
+        'public': True,
+        'max_age': 300,
+        's_maxage': 3600,
+        'stale_while_revalidate': 60,
+        'vary': ['Accept-Encoding'],
+    },
+    # Crawler-facing files that change rarely (sitemaps, robots.txt, manifest)
+    'crawler': {
+        'public': True,
+        'max_age': 3600,
+        's_maxage': 86400,
+        'stale_while_revalidate': 3600,
+    },
+    # Per-user pages: the browser may keep them but must revalidate
+    'private': {
+        'private': True,
+        'no_cache': True,
+    },
+    # Forms, dashboard, anything sensitive
+    'no-store': {
+        'private': True,
+        'no_store': True,
+    },
+    # Fingerprinted build output
+    'static': {
+        'public': True,
+        'max_age': 31536000,
+        'immutable': True,
+        'expires': True,
+    },
+    'media': {
+        'public': True,
+        'max_age': 604800,
+    },
+}
+
+# Cache-Control directives understood in a policy dict
+DIRECTIVES = (
+    'public', 'private', 'no_cache', 'no_store', 'max_age', 's_maxage',
+    'stale_while_revalidate', 'stale_if_error', 'immutable', 'must_revalidate',
+)
+
+# Only these statuses may be stored by shared caches (304 refreshes a stored copy)
+CACHEABLE_STATUSES = {200, 203, 204, 300, 301, 304, 404, 410}
+
+
+def cache_policy(policy):
+    """
+    Attach a policy (preset name or dict) to a view function or class:
+
+        @cache_policy('crawler')
+        class RobotsTxtView(TemplateView): ...
+    """
+    def decorator(view):
+        view.cache_policy = policy
+        return view
+    return decorator
+
+
+def resolve_policy(policy):
+    """Return the policy dict for a preset name or dict"""
+    if isinstance(policy, dict):
+        return policy
+    try:
+        return PRESETS[policy]
+    except KeyError:
+        raise ValueError(f"Unknown cache policy '{policy}'")
+
+
+def policy_for_request(request):
+    """Pick the policy for a request from the view, URL name or path"""
+    if request.path.startswith(settings.STATIC_URL):
+        return resolve_policy('static')
+    if request.path.startswith(settings.MEDIA_URL):
+        return resolve_policy('media')
+
+    match = getattr(request, 'resolver_match', None)
+    if match is not None:
+        view = match.func
+        policy = getattr(view, 'cache_policy', None) or getattr(getattr(view, 'view_class', None), 'cache_policy', None)
+        if policy:
+            return resolve_policy(policy)
+
+        policies = getattr(settings, 'CACHE_POLICIES', {})
+        if match.view_name in policies:
+            return resolve_policy(policies[match.view_name])
+        for namespace in reversed(match.namespaces):
+            wildcard = f'{namespace}:*'
+            if wildcard in policies:
+                return resolve_policy(policies[wildcard])
+
+    return resolve_policy(getattr(settings, 'CACHE_POLICY_DEFAULT', 'private'))
+
+
+def has_visitor_state(request, response):
+    """True when the response is specific to this visitor"""
+    if response.cookies:
+        return True
+    # get_token() was called while rendering: the page embeds a CSRF token
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        return True
+    messages = getattr(request, '_messages', None)
+    if messages is not None and getattr(messages, 'used', False):
+        return True
+    # Only consult the user when the session was loaded anyway; touching it
+    # here would add Vary: Cookie to every response
+    session = getattr(request, 'session', None)
+    if session is None or not session.accessed:
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_authenticated)
+
+
+def apply_policy(request, response, policy):
+    """Write Cache-Control/Vary/Expires for a policy, downgrading shared policies when unsafe"""
+    directives = {key: policy[key] for key in DIRECTIVES if key in policy}
+    shared = directives.get('public')
+    if shared and (
+        request.method not in ('GET', 'HEAD')
+        or response.status_code not in CACHEABLE_STATUSES
+        or has_visitor_state(request, response)
+    ):
+        directives = dict(PRESETS['private'])
+
+    patch_cache_control(response, **directives)
+    if policy.get('vary'):
+        patch_vary_headers(response, policy['vary'])
+    if policy.get('expires') and 'max_age' in directives:
+        response['Expires'] = expires_header(directives['max_age'])
+    return response
@@ -0,0 +1,44 @@
+"""
+Conditional GET helpers for Skyline Ghana Constructions
+Responses derived from database rows advertise a strong ETag and Last-Modified
+computed from updated_at maxima, so crawlers and returning browsers are
+answered with 304 Not Modified from a header check, before anything renders.
+"""
+
+import hashlib
+import time
+from functools import lru_cache
+
+from django.db.models import Max
+from django.template.loader import get_template
+from django.utils.http import http_date
+
+
+def latest_updated_at(*querysets):
+    """Newest updated_at across the given querysets/models, or None"""
+    latest = None
+    for queryset in querysets:
+        if hasattr(queryset, '_default_manager'):
+            queryset = queryset._default_manager.all()
+        value = queryset.aggregate(latest=Max('updated_at'))['latest']
+        if value and (latest is None or value > latest):
+            latest = value
+    return latest
+
+
+def make_etag(*parts):
+    """Strong ETag (unquoted; condition() adds the quotes) over the given parts"""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def expires_header(max_age):
+    """Value for an Expires header max_age seconds from now"""
+    return http_date(time.time() + max_age)
+
+
+@lru_cache(maxsize=None)
+def template_digest(template_name):
+    """Hash of a template's source; templates only change with a deploy"""
+    template = get_template(template_name)
+    source = getattr(getattr(template, 'template', None), 'source', '')
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
@@ -0,0 +1,136 @@
+"""
+Facet counts for Skyline Ghana Constructions
+A FacetSet describes a filtered listing (projects, gallery images, jobs):
+its base queryset, how request parameters filter it and which dimensions
+get counts. Counts for each dimension come from one grouped query over the
+listing filtered by every other active parameter, so picking a department
+still shows how many roles each other department has. Results are cached
+per set of active parameters under a content version that signals move
+forward when a watched model changes. Only bounded combinations are cached
+(facet values that exist, flags from a fixed set); free-text searches are
+counted uncached so they cannot flood the shared cache.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from .cache import bump_generation, get_generation
+
+_registry = {}
+
+
+class Facet:
+    """One filter dimension: the GET parameter and the field it groups by"""
+
+    def __init__(self, param, field):
+        self.param = param
+        self.field = field
+
+
+class FacetSet:
+    """Subclass per listing and register(); views filter through apply_filters"""
+    name = None
+    facets = ()
+    # Non-facet parameters that also narrow the listing (search, location, ...)
+    filter_params = ()
+    # Non-facet parameters with a fixed set of values, {param: values}; counts
+    # for any other non-facet parameter (free text) are not cached
+    bounded_params = {}
+    # Models whose changes move the content version forward
+    watched_models = ()
+    timeout = 60 * 10
+
+    def base_queryset(self):
+        raise NotImplementedError
+
+    def filter_extra(self, queryset, params):
+        """Apply filter_params; facet parameters are handled by apply_filters"""
+        return queryset
+
+    def apply_filters(self, queryset, params, exclude=None):
+        """Filter by every active parameter, except the facet named exclude"""
+        for facet in self.facets:
+            value = params.get(facet.param)
+            if value and facet.param != exclude:
+                queryset = queryset.filter(**{facet.field: value})
+        return self.filter_extra(queryset, params)
+
+    def filtered_queryset(self, params):
+        return self.apply_filters(self.base_queryset(), params)
+
+    def active_params(self, params):
+        names = [facet.param for facet in self.facets] + list(self.filter_params)
+        return {name: params.get(name) for name in sorted(names) if params.get(name)}
+
+    def compute_counts(self, params):
+        """{param: {value: count}}, one grouped query per facet"""
+        counts = {}
+        for facet in self.facets:
+            queryset = self.apply_filters(self.base_queryset(), params, exclude=facet.param)
+            rows = queryset.order_by().values_list(facet.field).annotate(total=Count('pk', distinct=True))
+            counts[facet.param] = {value: total for value, total in rows if value not in (None, '')}
+        return counts
+
+    def cacheable(self, active):
+        """True when every active parameter comes from a bounded set of values"""
+        facet_params = {facet.param for facet in self.facets}
+        known = None
+        for name, value in active.items():
+            if name in facet_params:
+                # Only facet values that exist: the unfiltered counts list every one
+                if known is None:
+                    known = self.counts({})
+                if value not in {str(option) for option in known.get(name, {})}:
+                    return False
+            elif value not in self.bounded_params.get(name, ()):
+                return False
+        return True
+
+    def counts(self, params):
+        """compute_counts for the active parameters, cached when they are bounded"""
+        active = self.active_params(params)
+        if not self.cacheable(active):
+            return self.compute_counts(active)
+        digest = hashlib.md5(repr(sorted(active.items())).encode('utf-8')).hexdigest()
+        key = f'facets:{self.name}:{content_version(self.name)}:{digest}'
+        return cache.get_or_set(key, lambda: self.compute_counts(active), self.timeout)
+
+
+def register(facet_set):
+    _registry[facet_set.name] = facet_set
+    return facet_set
+
+
+def get_facet_set(name):
+    return _registry[name]
+
+
+def registered_facet_sets():
+    return list(_registry.values())
+
+
+def content_version(name):
+    return get_generation(f'facets_version:{name}')
+
+
+def bump_content_version(name):
+    """Retire every cached count for a facet set"""
+    bump_generation(f'facets_version:{name}')
+
+
+def with_counts(options, counts):
+    """
+    Pair filter options with their counts for templates:
+    objects get .facet_count, (value, label) choices become (value, label, count)
+    """
+    paired = []
+    for option in options:
+        if isinstance(option, (tuple, list)):
+            value, label = option
+            paired.append((value, label, counts.get(value, 0)))
+        else:
+            option.facet_count = counts.get(option.slug, 0)
+            paired.append(option)
+    return paired
@@ -0,0 +1,91 @@
+"""
+Homepage data for Skyline Ghana Constructions
+The homepage is the busiest route, so everything it renders (site settings
+and their image URLs, the active carousel, testimonials and the headline
+stats) is assembled by build_homepage() in a fixed handful of queries and
+kept in the cache as one bundle. Saving any of the models it draws from
+rebuilds the bundle in the background, so a warm homepage render makes no
+database queries.
+"""
+
+import logging
+
+from django.core.cache import cache
+
+from .tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+HOMEPAGE_KEY = 'homepage_bundle'
+HOMEPAGE_TIMEOUT = 60 * 60 * 24
+
+# Models shown on the homepage; their saves and deletes rebuild the bundle
+HOMEPAGE_MODELS = (
+    'core.SiteSettings',
+    'core.HomepageCarouselImage',
+    'core.Testimonial',
+)
+
+# SiteSettings images used by core/home.html, resolved to URLs once per build
+HOMEPAGE_IMAGE_FIELDS = (
+    'hero_background', 'hero_card_image', 'about_hero_image', 'why_choose_us_image',
+    'featured_service_1_image', 'featured_service_2_image', 'featured_service_3_image',
+    'default_testimonial_image',
+)
+
+TESTIMONIAL_LIMIT = 8
+
+
+def _image_url(file):
+    try:
+        return file.url if file else ''
+    except Exception as e:
+        logger.warning(f"Could not resolve URL for {file.name}: {e}")
+        return ''
+
+
+def build_homepage():
+    """Everything core/home.html needs, in three queries"""
+    from .context_processors import _load_site_settings
+    from .models import Testimonial
+
+    site_settings = _load_site_settings()
+    carousel = list(site_settings.homepage_carousel_images.filter(is_active=True).order_by('order', 'id'))
+    testimonials = list(Testimonial.objects.filter(is_active=True).order_by('-is_featured', '-created_at')[:TESTIMONIAL_LIMIT])
+    for testimonial in testimonials:
+        testimonial.image_url = _image_url(testimonial.image)
+
+    return {
+        'site_settings': site_settings,
+        'images': {field: _image_url(getattr(site_settings, field)) for field in HOMEPAGE_IMAGE_FIELDS},
+        'carousel': carousel,
+        'testimonials': testimonials,
+        'stats': {
+            'years_experience': site_settings.years_experience,
+            'projects_completed': site_settings.projects_completed,
+            'square_feet_built': site_settings.square_feet_built,
+            'client_satisfaction': site_settings.client_satisfaction,
+        },
+    }
+
+
+def get_homepage():
+    """The cached bundle, built on a miss"""
+    return cache.get_or_set(HOMEPAGE_KEY, build_homepage, HOMEPAGE_TIMEOUT)
+
+
+def rebuild_homepage():
+    """Replace the cached bundle; readers keep the old one until the new one is stored"""
+    # Clear the flag first so changes made during the build schedule another one
+    cache.delete(_pending_key())
+    cache.set(HOMEPAGE_KEY, build_homepage(), HOMEPAGE_TIMEOUT)
+
+
+def _pending_key():
+    return f'{HOMEPAGE_KEY}_pending'
+
+
+def schedule_homepage_rebuild():
+    """Coalesce bursts of saves (an admin page with inlines) into one rebuild"""
+    if cache.add(_pending_key(), True, 300):
+        run_in_background(rebuild_homepage)
@@ -0,0 +1,71 @@
+"""
+Image placeholders for Skyline Ghana Constructions
+Computes intrinsic dimensions and a base64 low-quality image placeholder
+(LQIP) so templates can reserve layout space and paint a preview before the
+full image arrives. Placeholders are written with update(), so
+placeholder_updated is sent afterwards for the caches and CDN keys that
+post_save would otherwise have invalidated.
+"""
+
+import base64
+import io
+import logging
+
+from django.apps import apps
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Sent with sender=model, instance=row after a row's placeholder is stored
+placeholder_updated = Signal()
+
+# Longest edge of the inline preview; ~16px JPEGs are 300-600 bytes as base64
+LQIP_SIZE = 16
+LQIP_QUALITY = 40
+
+
+def build_placeholder(data):
+    """Return (width, height, lqip_data_uri) for raw image bytes"""
+    with Image.open(io.BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        width, height = img.size
+        preview = img.convert('RGB')
+        preview.thumbnail((LQIP_SIZE, LQIP_SIZE))
+        buffer = io.BytesIO()
+        preview.save(buffer, format='JPEG', quality=LQIP_QUALITY, optimize=True)
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return width, height, f"data:image/jpeg;base64,{encoded}"
+
+
+def update_image_placeholder(model_label, pk):
+    """Compute and store placeholder data for one row (background step)"""
+    model = apps.get_model(model_label)
+    obj = model._default_manager.filter(pk=pk).first()
+    if obj is None or not obj.placeholder_is_stale:
+        return
+
+    image = obj.get_placeholder_image()
+    values = {
+        'image_width': None,
+        'image_height': None,
+        'image_lqip': '',
+        'image_placeholder_for': image.name if image else '',
+    }
+    if image:
+        try:
+            image.open('rb')
+            try:
+                data = image.read()
+            finally:
+                image.close()
+            values['image_width'], values['image_height'], values['image_lqip'] = build_placeholder(data)
+        except Exception as e:
+            logger.warning(f"Could not build placeholder for {model_label} #{pk}: {e}")
+            return
+
+    # update() keeps updated_at and post_save handlers out of it
+    model._default_manager.filter(pk=pk).update(**values)
+    for field, value in values.items():
+        setattr(obj, field, value)
+    placeholder_updated.send(sender=model, instance=obj)
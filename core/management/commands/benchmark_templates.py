@@ -0,0 +1,75 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import Engine, engines
+from django.test import RequestFactory
+
+from core.templating import iter_template_names, warm_template_cache
+
+
+class Command(BaseCommand):
+    help = 'Measure per-template compile time (uncached) versus render time (cached loader)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Iterations per measurement')
+        parser.add_argument('--top', type=int, default=20, help='Show the N slowest templates to compile')
+        parser.add_argument('--template', action='append', help='Only benchmark this template (repeatable)')
+
+    def handle(self, *args, **options):
+        backend = engines['django']
+        engine = backend.engine
+        uncached = Engine(
+            dirs=engine.dirs,
+            context_processors=engine.context_processors,
+            loaders=[
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+            libraries=engine.libraries,
+            builtins=engine.builtins[len(Engine.default_builtins):],
+            string_if_invalid=engine.string_if_invalid,
+        )
+        request = RequestFactory().get('/')
+        names = options['template'] or list(iter_template_names(engine))
+        repeat = max(options['repeat'], 1)
+
+        self.stdout.write(f'⏱️ Benchmarking {len(names)} template(s), {repeat} iteration(s) each...')
+        compiled, failed, warm_seconds = warm_template_cache()
+        self.stdout.write(f'🔥 Warm-up compiled {compiled} templates in {warm_seconds * 1000:.0f}ms ({failed} failed)')
+
+        results = []
+        for name in names:
+            try:
+                compile_ms = self.measure(lambda: uncached.get_template(name), repeat)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'⚠️ {name}: compile failed ({e})'))
+                continue
+            template = backend.get_template(name)
+            try:
+                render_ms = self.measure(lambda: template.render({}, request), repeat)
+            except Exception:
+                # Most pages need view context; compile time is still meaningful
+                render_ms = None
+            results.append((name, compile_ms, render_ms))
+
+        results.sort(key=lambda row: row[1], reverse=True)
+        self.stdout.write(f'\n{"template":<50} {"compile":>10} {"render":>10}')
+        for name, compile_ms, render_ms in results[:options['top']]:
+            render = f'{render_ms:8.2f}ms' if render_ms is not None else '       n/a'
+            self.stdout.write(f'{name:<50} {compile_ms:8.2f}ms {render}')
+
+        total_compile = sum(row[1] for row in results)
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Cold compile of all templates: {total_compile:.0f}ms per worker without warm-up'
+        ))
+
+    @staticmethod
+    def measure(func, repeat):
+        """Median wall time of func() in milliseconds"""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,197 @@
+import io
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Container readiness checks in a single process: DB wait, migrations, cache table, seed data, static manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--db-timeout',
+            type=float,
+            default=30,
+            help='Give up waiting for the database after this many seconds',
+        )
+        parser.add_argument(
+            '--no-migrate',
+            action='store_true',
+            help='Fail instead of applying unapplied migrations',
+        )
+        parser.add_argument(
+            '--sample-data',
+            action='store_true',
+            help='Populate sample data (development/demo machines only)',
+        )
+        parser.add_argument(
+            '--warm-cache',
+            action='store_true',
+            help='Render sitemap URLs, within the boot budget, so the shared cache tier is warm for the first visitors',
+        )
+        parser.add_argument(
+            '--budget',
+            type=float,
+            default=20,
+            help='Skip optional steps that would start after this many seconds',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('🚀 Booting Skyline Ghana Constructions...'))
+        self.timings = []
+        started = time.monotonic()
+        self.deadline = started + options['budget']
+
+        self.step('⏳ Database', self.wait_for_db, options['db_timeout'])
+        self.step('📦 Migrations', self.check_migrations, options['no_migrate'])
+        self.step('🗄️ Cache table', self.setup_cache_table)
+        self.step('⚙️ Site settings', self.seed_site_settings)
+        self.step('👥 Visitor tracking', self.check_visitor_tracking, required=False)
+        self.step('📁 Static manifest', self.check_static_manifest)
+        self.step('🔗 Related content', self.build_related_content, required=False)
+        self.step('🗺️ Sitemaps', self.write_sitemaps, required=False)
+        if options['sample_data']:
+            self.step('📊 Sample data', call_command, 'populate_sample_data', required=False)
+        if options['warm_cache']:
+            self.step('🔥 Cache warm-up', self.warm_cache, required=False)
+
+        total = time.monotonic() - started
+        self.stdout.write('\n⏱️ Boot timings:')
+        for name, duration in self.timings:
+            self.stdout.write(f'   {name:<24} {duration:6.2f}s')
+        style = self.style.SUCCESS if total <= options['budget'] else self.style.WARNING
+        self.stdout.write(style(f'✅ Boot completed in {total:.2f}s (budget {options["budget"]:.0f}s)'))
+
+    def step(self, name, func, *args, required=True):
+        """
+        Run one boot step, recording its duration. Optional steps only warn on
+        failure and are skipped once the budget has run out, so a slow
+        optional step cannot hold up the server.
+        """
+        started = time.monotonic()
+        if not required and started >= self.deadline:
+            self.stdout.write(self.style.WARNING(f'{name}: skipped (boot budget used up)'))
+            return
+        try:
+            message = func(*args)
+        except Exception as e:
+            self.timings.append((name, time.monotonic() - started))
+            if required:
+                raise CommandError(f'{name} failed: {e}')
+            self.stdout.write(self.style.WARNING(f'{name}: skipped ({e})'))
+            return
+        duration = time.monotonic() - started
+        self.timings.append((name, duration))
+        self.stdout.write(f'{name}: {message or "ok"} ({duration:.2f}s)')
+
+    def wait_for_db(self, timeout):
+        """Connect with exponential backoff until timeout"""
+        connection = connections[DEFAULT_DB_ALIAS]
+        deadline = time.monotonic() + timeout
+        delay = 0.25
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                connection.ensure_connection()
+                return f'connected after {attempts} attempt(s)'
+            except Exception as e:
+                connection.close()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(f'database not ready after {attempts} attempts: {e}')
+                self.stdout.write(f'   🔄 DB not ready, retrying in {delay:.2f}s ({e})')
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 5)
+
+    def check_migrations(self, no_migrate):
+        """Apply migrations only when the plan is non-empty"""
+        connection = connections[DEFAULT_DB_ALIAS]
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plan:
+            return 'up to date'
+        if no_migrate:
+            raise CommandError(f'{len(plan)} unapplied migration(s)')
+        call_command('migrate', interactive=False, verbosity=0)
+        return f'applied {len(plan)} migration(s)'
+
+    def setup_cache_table(self):
+        """createcachetable is idempotent; only run it for database caches"""
+        if not any('DatabaseCache' in cache['BACKEND'] for cache in settings.CACHES.values()):
+            return 'not using a database cache'
+        call_command('createcachetable', verbosity=0)
+        return 'ready'
+
+    def seed_site_settings(self):
+        """Create default site settings and fill zeroed statistics on new deployments"""
+        from core.models import SiteSettings
+
+        site_settings = SiteSettings.objects.first()
+        if site_settings is None:
+            call_command('init_site_settings', stdout=io.StringIO())
+            return 'created defaults'
+        if site_settings.projects_completed == 0:
+            site_settings.projects_completed = 500
+            site_settings.square_feet_built = 1000000
+            site_settings.client_satisfaction = 98
+            site_settings.years_experience = 25
+            site_settings.save()
+            return 'statistics updated with default values'
+        return 'already configured'
+
+    def check_visitor_tracking(self):
+        from dashboard.models import SystemMetrics
+
+        metric, created = SystemMetrics.objects.get_or_create(
+            metric_name='visitors',
+            metric_date=timezone.localdate(),
+            defaults={'metric_value': 0},
+        )
+        if created:
+            return 'initialized for today'
+        return f'{int(metric.metric_value)} visitors today'
+
+    def build_related_content(self):
+        """Compute related content once for models that have none (first deploy of the feature, fresh database)"""
+        from core.related import build_missing_related
+
+        built = build_missing_related()
+        return f"built {', '.join(built)}" if built else 'already computed'
+
+    def write_sitemaps(self):
+        """Sitemap files live on local disk, so each new container writes them once"""
+        from core.sitemaps import SITEMAPS, generate_sitemaps
+
+        generate_sitemaps()
+        return f'{len(SITEMAPS)} sections'
+
+    def warm_cache(self):
+        """
+        Fill the shared cache tier until the boot budget runs out. The boot
+        process's local tier is discarded when it exits; workers' local tiers
+        fill from the shared tier on first use.
+        """
+        from core.warmup import warm_cache
+
+        results = warm_cache(concurrency=4, limit=50, timeout=max(self.deadline - time.monotonic(), 0))
+        failed = sum(1 for result in results if result.status is None or result.status >= 400)
+        return f'{len(results)} URLs rendered ({failed} failed)'
+
+    def check_static_manifest(self):
+        """Static files are collected at image build time; fail fast if the manifest is missing"""
+        if not isinstance(staticfiles_storage, ManifestFilesMixin):
+            return 'not using a manifest storage'
+        manifest = staticfiles_storage.hashed_files
+        if not manifest:
+            raise CommandError(
+                f'{staticfiles_storage.manifest_name} missing or empty in {settings.STATIC_ROOT}; '
+                'run collectstatic when building the image'
+            )
+        return f'{len(manifest)} files'
@@ -0,0 +1,35 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import TieredCache
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters per tier published by TieredCache in every worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alias', default='default', help='Cache alias to report on')
+        parser.add_argument('--reset', action='store_true', help='Zero the published counters afterwards')
+
+    def handle(self, *args, **options):
+        cache = caches[options['alias']]
+        if not isinstance(cache, TieredCache):
+            raise CommandError(f"Cache '{options['alias']}' is not a TieredCache")
+
+        stats = cache.shared_stats()
+        local_lookups = stats['local_hits'] + stats['local_misses']
+        shared_lookups = stats['shared_hits'] + stats['shared_misses']
+
+        self.stdout.write(f"📊 Tiered cache '{options['alias']}' (shared tier: '{cache.shared_alias}')")
+        self.stdout.write(f"   Local tier:  {stats['local_hits']} hits / {local_lookups} lookups ({self.ratio(stats['local_hits'], local_lookups)})")
+        self.stdout.write(f"   Shared tier: {stats['shared_hits']} hits / {shared_lookups} lookups ({self.ratio(stats['shared_hits'], shared_lookups)})")
+        self.stdout.write(f"   Computes: {stats['computes']}, early refreshes: {stats['early_refreshes']}, "
+                          f"lock waits: {stats['lock_waits']}, stale served: {stats['stale_served']}")
+
+        if options['reset']:
+            cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('✅ Counters reset'))
+
+    @staticmethod
+    def ratio(hits, lookups):
+        return f'{hits / lookups:.1%}' if lookups else 'n/a'
@@ -0,0 +1,36 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from core.images import update_image_placeholder
+from core.mixins import ImagePlaceholderMixin
+
+
+class Command(BaseCommand):
+    help = 'Compute stored width/height and LQIP previews for images that are missing or stale'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Recompute every image, not only stale ones',
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in apps.get_models():
+            if not issubclass(model, ImagePlaceholderMixin):
+                continue
+            qs = model._default_manager.all()
+            if options['force']:
+                qs.update(image_placeholder_for='')
+            else:
+                qs = qs.exclude(image_placeholder_for=F(model.placeholder_image_field))
+
+            pks = list(qs.values_list('pk', flat=True))
+            for pk in pks:
+                update_image_placeholder(model._meta.label, pk)
+            total += len(pks)
+            self.stdout.write(f'🖼️ {model._meta.verbose_name_plural}: {len(pks)} processed')
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Image placeholders computed for {total} image(s)'))
@@ -94,8 +94,7 @@ class Command(BaseCommand):
         self.stdout.write('🗄️ Setting up cache...')
         try:
             # Create cache table if using database cache
-            cache_backend = settings.CACHES['default']['BACKEND']
-            if 'DatabaseCache' in cache_backend:
+            if any('DatabaseCache' in cache['BACKEND'] for cache in settings.CACHES.values()):
                 call_command('createcachetable', verbosity=0)
                 self.stdout.write('✅ Cache table created')
             
@@ -0,0 +1,108 @@
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from core.models import StoredFile, FileDeletion
+from dashboard.activity import ARCHIVE_PREFIX
+
+
+class Command(BaseCommand):
+    help = 'Find stored media files that are no longer referenced by any model'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--remote',
+            action='store_true',
+            help='Compare against the live ImageKit file listing instead of the local upload registry',
+        )
+        parser.add_argument(
+            '--path',
+            type=str,
+            default='/skyline/',
+            help='ImageKit folder to scan with --remote (default: /skyline/)',
+        )
+        parser.add_argument(
+            '--fix-refcounts',
+            action='store_true',
+            help='Reset StoredFile.ref_count to the number of actual references',
+        )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Queue the orphaned files for deletion',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔍 Collecting file references from the database...')
+        referenced = self.get_referenced_names()
+        self.stdout.write(f'  {len(referenced)} referenced file(s)')
+
+        if options['fix_refcounts']:
+            self.fix_refcounts(referenced)
+
+        if options['remote']:
+            backend = getattr(default_storage, 'backend', None)
+            if backend is None:
+                self.stdout.write(self.style.ERROR('❌ The default storage cannot list remote files'))
+                return
+            self.stdout.write(f"☁️ Listing stored files under {options['path']}...")
+            stored = dict(backend.list_files(path=options['path']))
+        else:
+            stored = dict(StoredFile.objects.values_list('name', 'file_id').iterator(chunk_size=2000))
+        self.stdout.write(f'  {len(stored)} stored file(s)')
+
+        already_queued = set(
+            FileDeletion.objects.filter(status='pending').values_list('name', flat=True)
+        )
+        # Activity log archives are never referenced by a FileField
+        orphans = sorted(
+            name for name in stored
+            if name not in referenced and name not in already_queued and not name.startswith(ARCHIVE_PREFIX)
+        )
+
+        if not orphans:
+            self.stdout.write(self.style.SUCCESS('✅ No orphaned files found'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'⚠️ {len(orphans)} orphaned file(s):'))
+        for name in orphans:
+            self.stdout.write(f'  - {name}')
+
+        if options['enqueue']:
+            FileDeletion.objects.bulk_create(
+                [FileDeletion(name=name, file_id=stored[name] or '') for name in orphans],
+                batch_size=500,
+            )
+            StoredFile.objects.filter(name__in=orphans).delete()
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Queued {len(orphans)} file(s); run process_file_deletions to remove them'
+            ))
+
+    def fix_refcounts(self, referenced):
+        """Bring ref_count in line with references (e.g. after files were replaced)"""
+        fixed = []
+        for stored in StoredFile.objects.only('pk', 'name', 'ref_count').iterator(chunk_size=2000):
+            actual = referenced.get(stored.name, 0)
+            if actual and actual != stored.ref_count:
+                stored.ref_count = actual
+                fixed.append(stored)
+        StoredFile.objects.bulk_update(fixed, ['ref_count'], batch_size=500)
+        self.stdout.write(f'  Corrected {len(fixed)} reference count(s)')
+
+    def get_referenced_names(self):
+        """Reference counts for every non-empty FileField/ImageField value across all models"""
+        referenced = Counter()
+        for model in apps.get_models():
+            file_fields = [f.name for f in model._meta.concrete_fields if isinstance(f, models.FileField)]
+            for field_name in file_fields:
+                names = (
+                    model._default_manager.exclude(**{field_name: ''})
+                    .exclude(**{f'{field_name}__isnull': True})
+                    .values_list(field_name, flat=True)
+                    .iterator(chunk_size=2000)
+                )
+                referenced.update(name.lstrip('/') for name in names)
+        return referenced
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sitemaps import SITEMAPS, generate_sitemaps, get_sitemap_root
+
+
+class Command(BaseCommand):
+    help = 'Write gzipped sitemap sections and the sitemap index to SITEMAP_ROOT'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--section',
+            action='append',
+            choices=list(SITEMAPS),
+            help='Only regenerate this section (repeatable); the index is always rewritten',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            generate_sitemaps(options['section'])
+        except OSError as e:
+            raise CommandError(f'Could not write sitemaps: {e}')
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Sitemaps written to {get_sitemap_root()}')
+        )
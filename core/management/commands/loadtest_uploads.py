@@ -0,0 +1,56 @@
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.storage import LocalStandInStorage
+
+
+class Command(BaseCommand):
+    help = 'Load-test the media upload path against the local stand-in storage (no network)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Number of uploads')
+        parser.add_argument('--concurrency', type=int, default=8, help='Parallel uploaders')
+        parser.add_argument('--size', type=int, default=256 * 1024, help='Payload size in bytes')
+        parser.add_argument(
+            '--unique',
+            type=int,
+            default=20,
+            help='Number of distinct payloads (the rest are re-uploads of the same bytes)',
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, LocalStandInStorage):
+            raise CommandError('Set USE_LOCAL_MEDIA_STAND_IN=True so uploads stay on this machine')
+
+        payloads = [os.urandom(options['size']) for _ in range(max(options['unique'], 1))]
+        timings = []
+
+        def upload(i):
+            started = time.perf_counter()
+            try:
+                default_storage.save(f'loadtest/upload-{i}.jpg', ContentFile(payloads[i % len(payloads)]))
+            finally:
+                connection.close()
+            return time.perf_counter() - started
+
+        self.stdout.write(
+            f"🚀 Uploading {options['count']} file(s) ({len(payloads)} distinct) "
+            f"with {options['concurrency']} worker(s)..."
+        )
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            timings.extend(pool.map(upload, range(options['count'])))
+        elapsed = time.perf_counter() - started
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f'⏱️ Total: {elapsed:.2f}s ({options["count"] / elapsed:.1f} uploads/s)')
+        self.stdout.write(f'📊 p50: {statistics.median(timings) * 1000:.1f} ms, p95: {p95 * 1000:.1f} ms')
+        self.stdout.write(self.style.SUCCESS('✅ Load test completed'))
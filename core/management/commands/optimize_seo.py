@@ -1,9 +1,10 @@
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.core.cache import cache
+from django.apps import apps
+from core.mixins import SEOMixin
 from core.models import SiteSettings
 import os
-import requests
 from urllib.parse import urljoin
 
 
@@ -26,6 +27,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear SEO-related cache',
         )
+        parser.add_argument(
+            '--backfill-seo',
+            action='store_true',
+            help='Recompute materialised SEO metadata (seo_data) for all SEO-enabled models',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per bulk update when backfilling SEO metadata',
+        )
         parser.add_argument(
             '--all',
             action='store_true',
@@ -37,6 +49,7 @@ class Command(BaseCommand):
             options['check_urls'] = True
             options['fix_meta'] = True
             options['clear_cache'] = True
+            options['backfill_seo'] = True
 
         self.stdout.write(
             self.style.SUCCESS('🔍 Starting SEO optimization...')
@@ -48,6 +61,9 @@ class Command(BaseCommand):
         if options['fix_meta']:
             self.fix_meta_tags()
 
+        if options['backfill_seo']:
+            self.backfill_seo_data(options['batch_size'])
+
         if options['check_urls']:
             self.check_important_urls()
 
@@ -80,6 +96,31 @@ class Command(BaseCommand):
                 self.style.ERROR(f'❌ Error clearing SEO cache: {e}')
             )
 
+    def backfill_seo_data(self, batch_size):
+        """Materialise SEOMixin.seo_data in bulk, writing only rows that changed"""
+        self.stdout.write('🏷️ Backfilling materialised SEO metadata...')
+        for model in apps.get_models():
+            if not issubclass(model, SEOMixin):
+                continue
+            checked = changed = 0
+            pending = []
+            for obj in model._default_manager.all().iterator(chunk_size=batch_size):
+                checked += 1
+                data = obj.build_seo_data()
+                if data != obj.seo_data:
+                    obj.seo_data = data
+                    pending.append(obj)
+                if len(pending) >= batch_size:
+                    model._default_manager.bulk_update(pending, ['seo_data'])
+                    changed += len(pending)
+                    pending = []
+            if pending:
+                model._default_manager.bulk_update(pending, ['seo_data'])
+                changed += len(pending)
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ {model._meta.verbose_name_plural}: {changed} of {checked} updated')
+            )
+
     def fix_meta_tags(self):
         """Fix common meta tag issues"""
         self.stdout.write('🏷️ Checking and fixing meta tags...')
@@ -123,6 +164,8 @@ class Command(BaseCommand):
 
     def check_important_urls(self):
         """Check if important URLs are accessible"""
+        import requests
+
         self.stdout.write('🌐 Checking important URLs...')
         
         base_url = 'http://127.0.0.1:8000'  # Development URL
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.storage import BULK_DELETE_LIMIT, process_file_deletions
+
+
+class Command(BaseCommand):
+    help = 'Delete queued media files from ImageKit using batched bulk-delete calls'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BULK_DELETE_LIMIT,
+            help=f'Files per bulk-delete call (max {BULK_DELETE_LIMIT})',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep sweeping the queue instead of exiting once it is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=60,
+            help='Seconds between sweeps when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = process_file_deletions(batch_size=options['batch_size'])
+            if deleted or not options['loop']:
+                self.stdout.write(
+                    self.style.SUCCESS(f'✅ Deleted {deleted} file(s) from ImageKit')
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
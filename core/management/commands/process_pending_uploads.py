@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.uploads import process_pending_uploads
+
+
+class Command(BaseCommand):
+    help = 'Upload spooled form attachments to media storage, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Uploads claimed per batch',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='Give up on an upload after this many failures',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep sweeping the queue instead of exiting once it is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=60,
+            help='Seconds between sweeps when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            uploaded = process_pending_uploads(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+            )
+            if uploaded or not options['loop']:
+                self.stdout.write(
+                    self.style.SUCCESS(f'✅ Uploaded {uploaded} spooled file(s)')
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
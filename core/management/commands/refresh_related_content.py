@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.related import rebuild_related, registered_engines
+
+
+class Command(BaseCommand):
+    help = 'Rebuild precomputed related content (blog posts, projects) from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            help='Only rebuild this model label, e.g. blog.BlogPost (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        labels = [engine.label for engine in registered_engines()]
+        selected = options['model'] or labels
+        unknown = set(selected) - set(labels)
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(sorted(unknown))}; choose from {', '.join(labels)}")
+
+        for label in selected:
+            rows = rebuild_related(label)
+            self.stdout.write(self.style.SUCCESS(f'🔗 {label}: neighbours computed for {rows} rows'))
@@ -155,12 +155,15 @@ class Command(BaseCommand):
                 continue
             all_models.extend(app_config.get_models())
         
-        # Clear models in reverse order to handle foreign key constraints
-        for model in reversed(all_models):
-            count = model.objects.count()
-            if count > 0:
-                model.objects.all().delete()
-                self.stdout.write(f'  Cleared {count} {model._meta.model_name} records')
+        # Clear models in reverse order to handle foreign key constraints.
+        # The restored rows reference the same media, so keep the files.
+        from core.signals import suspend_file_cleanup
+        with suspend_file_cleanup():
+            for model in reversed(all_models):
+                count = model.objects.count()
+                if count > 0:
+                    model.objects.all().delete()
+                    self.stdout.write(f'  Cleared {count} {model._meta.model_name} records')
 
     def restore_database_data(self, backup_path):
         """Restore database data from backup"""
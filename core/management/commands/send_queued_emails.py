@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.outbox import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbox emails in batches over a single SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Messages sent per SMTP connection',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='Give up on a message after this many failures',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep sweeping the outbox instead of exiting once it is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=60,
+            help='Seconds between sweeps when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_queued_emails(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+            )
+            if sent or not options['loop']:
+                self.stdout.write(
+                    self.style.SUCCESS(f'✅ Sent {sent} queued email(s)')
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
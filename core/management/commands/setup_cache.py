@@ -7,9 +7,8 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         """Create cache table if using database cache"""
-        cache_backend = settings.CACHES['default']['BACKEND']
-        
-        if 'DatabaseCache' in cache_backend:
+        # The database cache usually sits behind the tiered 'default' alias
+        if any('DatabaseCache' in cache['BACKEND'] for cache in settings.CACHES.values()):
             self.stdout.write('Creating cache table...')
             try:
                 call_command('createcachetable')
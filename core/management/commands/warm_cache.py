@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sitemaps import SITEMAPS
+from core.warmup import sitemap_paths, summarize, warm_urls
+
+
+class Command(BaseCommand):
+    help = 'Render every sitemap URL in-process to warm caches and compiled templates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--section',
+            action='append',
+            choices=sorted(SITEMAPS),
+            help='Only warm this sitemap section (repeatable)',
+        )
+        parser.add_argument('--concurrency', type=int, default=4, help='Requests rendered in parallel')
+        parser.add_argument('--limit', type=int, help='At most this many URLs per section')
+        parser.add_argument('--repeat', type=int, default=1, help='Render each URL this many times')
+        parser.add_argument('--timeout', type=float, help='Stop starting new requests after this many seconds')
+
+    def handle(self, *args, **options):
+        paths = sitemap_paths(options['section'], options['limit'])
+        if not paths:
+            raise CommandError('No URLs found in the selected sitemap sections')
+
+        self.stdout.write(f"🔥 Warming {len(paths)} URLs with {options['concurrency']} thread(s)...")
+        results = warm_urls(
+            paths, concurrency=options['concurrency'], repeat=options['repeat'], timeout=options['timeout'],
+        )
+
+        summary = summarize(results)
+        self.stdout.write(f'\n{"url name":<36} {"count":>6} {"p50":>10} {"p95":>10} {"max":>10} {"errors":>7}')
+        for url_name, row in sorted(summary.items(), key=lambda item: item[1]['p95'], reverse=True):
+            self.stdout.write(
+                f"{url_name:<36} {row['count']:>6} {row['p50']:8.1f}ms {row['p95']:8.1f}ms "
+                f"{row['max']:8.1f}ms {row['errors']:>7}"
+            )
+
+        failed = [result for result in results if result.status is None or result.status >= 400]
+        for result in failed:
+            self.stdout.write(self.style.WARNING(f'⚠️ {result.path}: {result.status or result.error}'))
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        skipped = len(paths) * max(options['repeat'], 1) - len(results)
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'⏱️ Timed out with {skipped} request(s) not rendered'))
+        self.stdout.write(style(f'✅ Rendered {len(results)} requests ({len(failed)} failed)'))
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
+from datetime import timedelta
+
 from django.utils import timezone
 from django.conf import settings
 from django.urls import resolve
 from django.http import HttpResponsePermanentRedirect
 from dashboard.models import SystemMetrics
 
+from .cache_policy import apply_policy, policy_for_request
+
 
 class VisitorTrackingMiddleware:
     """
     Lightweight visitor tracking.
     - Increments a daily "visitors" counter stored in `dashboard.models.SystemMetrics`.
     - Skips admin, dashboard, static, media, and staff-auth paths.
+    - Remembers today's visit in a small cookie rather than the session, so
+      public pages never load the session (which would add Vary: Cookie).
     """
 
+    VISIT_COOKIE = "skyline_visit"
+
     EXCLUDED_PREFIXES = (
         "/admin/",
         "/my-admin/",
@@ -30,8 +38,19 @@ class VisitorTrackingMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        self._maybe_track(request)
-        return self.get_response(request)
+        tracked = self._maybe_track(request)
+        response = self.get_response(request)
+        if tracked:
+            tomorrow = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            response.set_cookie(
+                self.VISIT_COOKIE,
+                timezone.localdate().isoformat(),
+                max_age=int((tomorrow - timezone.localtime()).total_seconds()) + 1,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
 
     def _maybe_track(self, request):
         try:
@@ -55,21 +74,9 @@ class VisitorTrackingMiddleware:
             if any(indicator in user_agent for indicator in bot_indicators):
                 return
 
-            # Count unique session per day to reduce inflation
-            session = getattr(request, "session", None)
-            today_key = f"visited:{timezone.localdate().isoformat()}"
-
-            if session is not None:
-                # Check if this session already visited today
-                if session.get(today_key):
-                    return
-
-                # Mark session as visited today
-                session[today_key] = True
-                session.modified = True
-            else:
-                # If no session available, still track but this might cause some inflation
-                pass
+            # Count unique visitors per day to reduce inflation
+            if request.COOKIES.get(self.VISIT_COOKIE) == timezone.localdate().isoformat():
+                return
 
             # Increment daily counter
             metric_date = timezone.localdate()
@@ -86,6 +93,7 @@ class VisitorTrackingMiddleware:
 
             # Refresh from database to get actual value for logging
             obj.refresh_from_db()
+            return True
 
         except Exception as e:
             # Log error in development but don't interrupt requests
@@ -119,27 +127,30 @@ class WWWRedirectMiddleware:
 
 class CacheControlMiddleware:
     """
-    Middleware to add cache control headers for better performance
+    Apply the route's cache policy (core.cache_policy) unless the view
+    already set Cache-Control itself
     """
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         response = self.get_response(request)
+        if not response.has_header('Cache-Control'):
+            apply_policy(request, response, policy_for_request(request))
+        return response
+
 
-        # Add cache headers for static files
-        if request.path.startswith('/static/'):
-            # Cache static files for 1 year
-            response['Cache-Control'] = 'public, max-age=31536000, immutable'
-            response['Expires'] = 'Thu, 31 Dec 2025 23:59:59 GMT'
-        elif request.path.startswith('/media/'):
-            # Cache media files for 1 week
-            response['Cache-Control'] = 'public, max-age=604800'
-        elif request.path.endswith(('.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.woff', '.woff2')):
-            # Cache other assets for 1 month
-            response['Cache-Control'] = 'public, max-age=2592000'
-        else:
-            # Cache HTML pages for 1 hour
-            response['Cache-Control'] = 'public, max-age=3600'
+class SurrogateKeyMiddleware:
+    """
+    Send the surrogate keys collected while rendering (core.surrogate) on
+    responses a shared cache may store, so CDN copies can be purged by content
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
 
+    def __call__(self, request):
+        response = self.get_response(request)
+        keys = getattr(request, 'surrogate_keys', None)
+        if keys and 'public' in response.get('Cache-Control', ''):
+            response[getattr(settings, 'SURROGATE_KEY_HEADER', 'Surrogate-Key')] = ' '.join(sorted(keys))
         return response
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 23:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_stored_files'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedfile',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='SHA-256 of the file content', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='storedfile',
+            name='ref_count',
+            field=models.PositiveIntegerField(default=1, help_text='Number of field values sharing this file'),
+        ),
+        migrations.AlterField(
+            model_name='storedfile',
+            name='file_id',
+            field=models.CharField(blank=True, help_text='Provider file id, e.g. ImageKit fileId (required for deletion)', max_length=100),
+        ),
+    ]
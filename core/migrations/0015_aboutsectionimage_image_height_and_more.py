@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_stored_file_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutsectionimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='aboutsectionimage',
+            name='image_lqip',
+            field=models.TextField(blank=True, editable=False, help_text='Base64 data URI of a tiny preview'),
+        ),
+        migrations.AddField(
+            model_name='aboutsectionimage',
+            name='image_placeholder_for',
+            field=models.CharField(blank=True, editable=False, help_text='Image name the stored dimensions/preview were computed from', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='aboutsectionimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='homepagecarouselimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='homepagecarouselimage',
+            name='image_lqip',
+            field=models.TextField(blank=True, editable=False, help_text='Base64 data URI of a tiny preview'),
+        ),
+        migrations.AddField(
+            model_name='homepagecarouselimage',
+            name='image_placeholder_for',
+            field=models.CharField(blank=True, editable=False, help_text='Image name the stored dimensions/preview were computed from', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='homepagecarouselimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 23:53
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_aboutsectionimage_image_height_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('app_label', models.CharField(max_length=100)),
+                ('model_name', models.CharField(max_length=100)),
+                ('object_id', models.PositiveIntegerField()),
+                ('field_name', models.CharField(max_length=100)),
+                ('spool_name', models.CharField(help_text='Path of the spooled file under SPOOL_ROOT', max_length=500)),
+                ('target_name', models.CharField(help_text="Name generated by the field's upload_to", max_length=500)),
+                ('stored_name', models.CharField(blank=True, max_length=500)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('uploading', 'Uploading'), ('uploaded', 'Uploaded'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Pending Upload',
+                'verbose_name_plural': 'Pending Uploads',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
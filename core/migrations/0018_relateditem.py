@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_outbound_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('app_label', models.CharField(max_length=100)),
+                ('model_name', models.CharField(max_length=100)),
+                ('source_id', models.PositiveIntegerField()),
+                ('target_id', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Related Item',
+                'verbose_name_plural': 'Related Items',
+                'ordering': ['app_label', 'model_name', 'source_id', 'rank'],
+                'indexes': [models.Index(fields=['app_label', 'model_name', 'source_id', 'rank'], name='core_relate_app_lab_b22edc_idx')],
+                'unique_together': {('app_label', 'model_name', 'source_id', 'target_id')},
+            },
+        ),
+    ]
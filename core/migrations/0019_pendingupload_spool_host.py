@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_relateditem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingupload',
+            name='spool_host',
+            field=models.CharField(blank=True, db_index=True, help_text='Machine whose local spool holds the file', max_length=255),
+        ),
+    ]
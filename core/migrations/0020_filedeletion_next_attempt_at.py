@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 00:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_pendingupload_spool_host'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filedeletion',
+            name='next_attempt_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
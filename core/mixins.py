@@ -36,9 +36,55 @@ class SEOMixin(models.Model):
         blank=True,
         help_text="Open Graph description. Leave blank to use meta_description."
     )
+
+    # Resolved meta values (fallbacks, keywords, og_image URL), materialised on
+    # save so rendering meta tags does no ORM or storage work
+    seo_data = models.JSONField(default=dict, blank=True, editable=False)
     
     class Meta:
         abstract = True
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'seo_data' not in update_fields and not (
+            set(update_fields) & self.seo_source_fields()
+        ):
+            return
+        # Computed after saving so og_image uses the stored file name
+        data = self.build_seo_data()
+        if data != self.seo_data:
+            self.seo_data = data
+            type(self)._default_manager.filter(pk=self.pk).update(seo_data=data)
+
+    def seo_source_fields(self):
+        """Fields whose change invalidates seo_data"""
+        return {
+            'meta_title', 'meta_description', 'meta_keywords', 'og_title', 'og_description',
+            'title', 'name', 'description', 'short_description', 'category', 'featured_image', 'image',
+        }
+
+    def build_seo_data(self):
+        """Resolve every meta value with its fallbacks"""
+        og_image = ''
+        image = getattr(self, 'featured_image', None) or getattr(self, 'image', None)
+        if image:
+            try:
+                og_image = image.url
+            except Exception:
+                og_image = ''
+        return {
+            'title': self.get_meta_title(),
+            'description': self.get_meta_description(),
+            'keywords': self.get_meta_keywords(),
+            'og_title': self.get_og_title(),
+            'og_description': self.get_og_description(),
+            'og_image': og_image,
+        }
+
+    def get_seo_data(self):
+        """Materialised meta values, built on the fly for rows not yet backfilled"""
+        return self.seo_data or self.build_seo_data()
     
     def get_meta_title(self):
         """Get SEO title with fallback to main title"""
@@ -127,3 +173,32 @@ class StatusMixin(models.Model):
     class Meta:
         abstract = True
         ordering = ['order', 'id']
+
+
+class ImagePlaceholderMixin(models.Model):
+    """
+    Intrinsic dimensions and a tiny inline preview (LQIP) for a model's main
+    image, filled in by a background step after the image changes
+    """
+    placeholder_image_field = 'image'
+
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_lqip = models.TextField(blank=True, editable=False, help_text="Base64 data URI of a tiny preview")
+    image_placeholder_for = models.CharField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        help_text="Image name the stored dimensions/preview were computed from",
+    )
+
+    class Meta:
+        abstract = True
+
+    def get_placeholder_image(self):
+        return getattr(self, self.placeholder_image_field)
+
+    @property
+    def placeholder_is_stale(self):
+        image = self.get_placeholder_image()
+        return (image.name if image else '') != self.image_placeholder_for
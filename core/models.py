@@ -1,9 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
 from PIL import Image
 import os
+from .mixins import ImagePlaceholderMixin
 
 class TimeStampedModel(models.Model):
     """Abstract base model with created and updated timestamps"""
@@ -116,16 +117,17 @@ class SiteSettings(models.Model):
     def __str__(self):
         return self.site_name
 
-    def save(self, *args, **kwargs):
-        """Clear cache when site settings are updated"""
-        super().save(*args, **kwargs)
-        from django.core.cache import cache
-        cache.delete('site_settings_v2')  # Clear cached site settings
+    @property
+    def version(self):
+        """Changes on every save; used to key caches derived from site settings"""
+        return int(self.updated_at.timestamp() * 1_000_000) if self.updated_at else 0
 
     def save(self, *args, **kwargs):
         # Resize logo and favicon if we have a local filesystem path (FileSystemStorage).
         # Remote storages (e.g., ImageKit) may not support .path; in that case we skip resizing.
         super().save(*args, **kwargs)
+        from django.core.cache import cache
+        cache.delete('site_settings_v2')  # Clear cached site settings
 
         def _resize_image_field(field, size):
             try:
@@ -154,7 +156,7 @@ class SiteSettings(models.Model):
         _resize_image_field(self.favicon, (128, 128))
 
 
-class AboutSectionImage(TimeStampedModel):
+class AboutSectionImage(ImagePlaceholderMixin, TimeStampedModel):
     """Additional images for the About section tall image area"""
     site_settings = models.ForeignKey(SiteSettings, on_delete=models.CASCADE, related_name='about_images')
     image = models.ImageField(upload_to='site/about/')
@@ -170,7 +172,7 @@ class AboutSectionImage(TimeStampedModel):
         return f"About Image #{self.pk} (order {self.order})"
 
 
-class HomepageCarouselImage(TimeStampedModel):
+class HomepageCarouselImage(ImagePlaceholderMixin, TimeStampedModel):
     """Images for the homepage carousel section"""
     site_settings = models.ForeignKey(SiteSettings, on_delete=models.CASCADE, related_name='homepage_carousel_images')
     image = models.ImageField(upload_to='site/homepage_carousel/')
@@ -187,6 +189,28 @@ class HomepageCarouselImage(TimeStampedModel):
         return f"Homepage Carousel Image #{self.pk} (order {self.order})"
 
 
+class ContactInquiryQuerySet(models.QuerySet):
+    def mark_as_responded(self, user, response):
+        """Record the same admin response on every inquiry in one UPDATE, logging each"""
+        from dashboard.models import ActivityLog
+
+        now = timezone.now()
+        with transaction.atomic():
+            rows = [(pk, f"{name} - {subject}") for pk, name, subject in self.values_list('pk', 'name', 'subject')]
+            if not rows:
+                return 0
+            updated = self.update(
+                admin_response=response,
+                responded_by=user,
+                responded_at=now,
+                status='in_progress',
+                updated_at=now,
+            )
+            if user is not None:
+                ActivityLog.log_many(user, 'update', 'ContactInquiry', rows, 'Responded to inquiry')
+        return updated
+
+
 class ContactInquiry(TimeStampedModel):
     """Contact form submissions"""
     INQUIRY_TYPES = [
@@ -222,6 +246,8 @@ class ContactInquiry(TimeStampedModel):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
 
+    objects = ContactInquiryQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Contact Inquiry"
@@ -232,11 +258,8 @@ class ContactInquiry(TimeStampedModel):
 
     def mark_as_responded(self, user, response):
         """Mark inquiry as responded with admin response"""
-        self.admin_response = response
-        self.responded_by = user
-        self.responded_at = timezone.now()
-        self.status = 'in_progress'
-        self.save()
+        ContactInquiry.objects.filter(pk=self.pk).mark_as_responded(user, response)
+        self.refresh_from_db(fields=['admin_response', 'responded_by', 'responded_at', 'status', 'updated_at'])
 
 class Newsletter(TimeStampedModel):
     """Newsletter subscriptions"""
@@ -326,3 +349,130 @@ class TeamMember(TimeStampedModel):
         if self.certifications:
             return [cert.strip() for cert in self.certifications.split('\n') if cert.strip()]
         return []
+
+
+class StoredFile(TimeStampedModel):
+    """Files uploaded through the media storage, keyed by name and content hash"""
+    name = models.CharField(max_length=500, unique=True, help_text="Stored path as saved on model fields")
+    file_id = models.CharField(max_length=100, blank=True, help_text="Provider file id, e.g. ImageKit fileId (required for deletion)")
+    size = models.PositiveBigIntegerField(default=0)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, help_text="SHA-256 of the file content")
+    ref_count = models.PositiveIntegerField(default=1, help_text="Number of field values sharing this file")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Stored File"
+        verbose_name_plural = "Stored Files"
+
+    def __str__(self):
+        return self.name
+
+
+class FileDeletion(TimeStampedModel):
+    """Queued remote file deletions, processed in batches by the deletion sweeper"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('deleted', 'Deleted'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=500, blank=True)
+    file_id = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "File Deletion"
+        verbose_name_plural = "File Deletions"
+
+    def __str__(self):
+        return f"{self.name or self.file_id} ({self.status})"
+
+
+class PendingUpload(TimeStampedModel):
+    """Files spooled to local disk during a request, uploaded to media storage in the background"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('uploading', 'Uploading'),
+        ('uploaded', 'Uploaded'),
+        ('failed', 'Failed'),
+    ]
+
+    app_label = models.CharField(max_length=100)
+    model_name = models.CharField(max_length=100)
+    object_id = models.PositiveIntegerField()
+    field_name = models.CharField(max_length=100)
+    spool_name = models.CharField(max_length=500, help_text="Path of the spooled file under SPOOL_ROOT")
+    spool_host = models.CharField(max_length=255, blank=True, db_index=True, help_text="Machine whose local spool holds the file")
+    target_name = models.CharField(max_length=500, help_text="Name generated by the field's upload_to")
+    stored_name = models.CharField(max_length=500, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Pending Upload"
+        verbose_name_plural = "Pending Uploads"
+
+    def __str__(self):
+        return f"{self.target_name} ({self.status})"
+
+
+class OutboundEmail(TimeStampedModel):
+    """Transactional email outbox, sent in batches by the outbox worker"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=300)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list, blank=True)
+    dedup_key = models.CharField(max_length=200, unique=True, null=True, blank=True,
+                                 help_text="Messages queued twice with the same key are sent once")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+
+class RelatedItem(TimeStampedModel):
+    """Precomputed nearest neighbours of a row (see core.related)"""
+    app_label = models.CharField(max_length=100)
+    model_name = models.CharField(max_length=100)
+    source_id = models.PositiveIntegerField()
+    target_id = models.PositiveIntegerField()
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['app_label', 'model_name', 'source_id', 'rank']
+        verbose_name = "Related Item"
+        verbose_name_plural = "Related Items"
+        unique_together = [('app_label', 'model_name', 'source_id', 'target_id')]
+        indexes = [
+            models.Index(fields=['app_label', 'model_name', 'source_id', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.app_label}.{self.model_name} {self.source_id} -> {self.target_id} ({self.score:.2f})"
@@ -0,0 +1,147 @@
+"""
+Transactional email outbox for Skyline Ghana Constructions
+Requests only insert core.models.OutboundEmail rows; the background pool (or
+`manage.py send_queued_emails`) sends them in batches over a single SMTP
+connection, retrying failures with exponential backoff. Retries are picked
+up by the periodic sweep (PERIODIC_TASKS in settings).
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_DELAY = 60
+MAX_RETRY_DELAY = 6 * 60 * 60
+# Messages stuck in "sending" this long (worker recycled mid-batch) are retried
+STALE_SEND_AFTER = timedelta(minutes=15)
+
+
+def queue_email(subject, body, to, from_email=None, reply_to=None, dedup_key=None):
+    """
+    Add a message to the outbox and wake the sender once the current
+    transaction commits. Returns the OutboundEmail row.
+    """
+    from .models import OutboundEmail
+
+    if isinstance(to, str):
+        to = [to]
+    if isinstance(reply_to, str):
+        reply_to = [reply_to]
+
+    values = {
+        'subject': subject[:300],
+        'body': body,
+        'from_email': from_email or settings.DEFAULT_FROM_EMAIL,
+        'to': list(to),
+        'reply_to': list(reply_to or []),
+    }
+    if dedup_key:
+        try:
+            with transaction.atomic():
+                email, created = OutboundEmail.objects.get_or_create(dedup_key=dedup_key, defaults=values)
+        except IntegrityError:
+            email, created = OutboundEmail.objects.get(dedup_key=dedup_key), False
+        if not created:
+            return email
+    else:
+        email = OutboundEmail.objects.create(**values)
+
+    run_in_background(send_queued_emails)
+    return email
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY))
+
+
+def _claim(batch_size, max_attempts):
+    """Mark a batch of due messages as sending so concurrent workers skip them"""
+    from .models import OutboundEmail
+
+    now = timezone.now()
+    with transaction.atomic():
+        due = OutboundEmail.objects.select_for_update(skip_locked=True).filter(
+            Q(status='pending', next_attempt_at__lte=now)
+            | Q(status='sending', updated_at__lt=now - STALE_SEND_AFTER),
+            attempts__lt=max_attempts,
+        ).order_by('next_attempt_at')[:batch_size]
+        ids = list(due.values_list('id', flat=True))
+        if ids:
+            OutboundEmail.objects.filter(id__in=ids).update(status='sending', updated_at=now)
+    return list(OutboundEmail.objects.filter(id__in=ids))
+
+
+def _mark_failed(email, error, max_attempts, now):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.status = 'failed' if email.attempts >= max_attempts else 'pending'
+    email.next_attempt_at = now + _retry_delay(email.attempts)
+
+
+def send_queued_emails(batch_size=50, max_attempts=5):
+    """
+    Send due outbox messages, one SMTP connection per batch.
+    Returns the number of messages sent.
+    """
+    from .models import OutboundEmail
+
+    sent_total = 0
+    while True:
+        batch = _claim(batch_size, max_attempts)
+        if not batch:
+            break
+
+        now = timezone.now()
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            # Server unreachable - back off the whole batch
+            logger.error(f"Could not connect to the mail server: {e}")
+            for email in batch:
+                _mark_failed(email, e, max_attempts, now)
+                email.updated_at = now
+            OutboundEmail.objects.bulk_update(
+                batch, ['status', 'attempts', 'last_error', 'next_attempt_at', 'updated_at']
+            )
+            break
+
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email,
+                    to=email.to,
+                    reply_to=email.reply_to or None,
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as e:
+                    logger.warning(f"Sending email #{email.pk} failed (attempt {email.attempts + 1}): {e}")
+                    _mark_failed(email, e, max_attempts, now)
+                else:
+                    email.status = 'sent'
+                    email.sent_at = timezone.now()
+                    email.last_error = ''
+                    sent_total += 1
+                # Record each result straight away: a crash later in the batch
+                # must not leave a sent message looking unsent
+                email.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at', 'updated_at'])
+        finally:
+            connection.close()
+
+        if len(batch) < batch_size:
+            break
+
+    return sent_total
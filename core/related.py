@@ -0,0 +1,324 @@
+"""
+Related content for Skyline Ghana Constructions
+Each registered model (blog posts, projects) gets its top-N neighbours scored
+by shared tags, shared categories, recency and, optionally, TF-IDF similarity
+of titles and summaries. Scores are precomputed into core.RelatedItem and
+refreshed incrementally when a row or its tags change, so detail pages read
+related content with one indexed lookup.
+"""
+
+import logging
+import math
+import re
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from .models import RelatedItem
+
+logger = logging.getLogger(__name__)
+
+Features = namedtuple('Features', 'tags categories date terms')
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has in is it its of on or our that the this to was were will with'
+    ' we you your how what why when into over more than about'.split()
+)
+
+_registry = {}
+
+
+class RelatedContent:
+    """How rows of one model are compared; subclass per model and register()"""
+    label = None
+    # Neighbours stored per row
+    limit = 6
+    # Many-to-many field get_tags() reads, used to find rows sharing a tag
+    tag_field = None
+    # Score weights; categories maps a field to its weight
+    tag_weight = 3.0
+    categories = {}
+    recency_weight = 0.5
+    recency_half_life_days = 180
+    text_weight = 1.0
+
+    @property
+    def model(self):
+        from django.apps import apps
+        return apps.get_model(self.label)
+
+    @property
+    def use_text(self):
+        return getattr(settings, 'RELATED_CONTENT_TFIDF', False)
+
+    def candidates(self):
+        """Rows that may appear as related content"""
+        return self.model._default_manager.all()
+
+    def get_tags(self, obj):
+        return frozenset()
+
+    def get_date(self, obj):
+        return obj.created_at
+
+    def get_text(self, obj):
+        return ''
+
+    def prepare(self, queryset):
+        """Add select/prefetch_related needed by get_tags/get_text"""
+        return queryset
+
+    def load_features(self, queryset=None):
+        """{pk: Features} for every candidate (or those in queryset), in a fixed number of queries"""
+        features = {}
+        queryset = self.candidates() if queryset is None else queryset
+        for obj in self.prepare(queryset).iterator(chunk_size=500):
+            features[obj.pk] = Features(
+                tags=self.get_tags(obj),
+                categories=tuple((field, getattr(obj, field)) for field in self.categories),
+                date=self.get_date(obj),
+                terms=tokenize(self.get_text(obj)) if self.use_text else Counter(),
+            )
+        return features
+
+    def score(self, source, target, idf=None):
+        """Similarity of target to source; 0 means unrelated"""
+        score = 0.0
+        if source.tags and target.tags:
+            score += self.tag_weight * len(source.tags & target.tags) / len(source.tags | target.tags)
+        for (field, value), (_, other) in zip(source.categories, target.categories):
+            if value is not None and value == other:
+                score += self.categories[field]
+        if idf is not None and source.terms and target.terms:
+            score += self.text_weight * cosine(source.terms, target.terms, idf)
+        if score <= 0:
+            return 0.0
+        # Recency only breaks ties between otherwise related rows
+        if target.date:
+            age_days = max((timezone.now() - target.date).total_seconds() / 86400, 0)
+            score += self.recency_weight * 0.5 ** (age_days / self.recency_half_life_days)
+        return score
+
+    def neighbours(self, pk, features, idf=None):
+        """Top-N [(target_id, score)] for one row"""
+        source = features[pk]
+        scored = []
+        for other_pk, target in features.items():
+            if other_pk == pk:
+                continue
+            score = self.score(source, target, idf)
+            if score > 0:
+                scored.append((other_pk, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:self.limit]
+
+
+def register(engine):
+    _registry[engine.label] = engine
+    return engine
+
+
+def get_engine(label):
+    return _registry[label]
+
+
+def registered_engines():
+    return list(_registry.values())
+
+
+def tokenize(text):
+    words = re.findall(r'[a-z0-9]+', (text or '').lower())
+    return Counter(word for word in words if len(word) > 2 and word not in STOPWORDS)
+
+
+def inverse_document_frequencies(features):
+    documents = [f.terms for f in features.values() if f.terms]
+    if not documents:
+        return None
+    frequency = Counter(term for terms in documents for term in terms)
+    return {term: math.log((1 + len(documents)) / (1 + count)) + 1 for term, count in frequency.items()}
+
+
+def cosine(a, b, idf):
+    shared = a.keys() & b.keys()
+    if not shared:
+        return 0.0
+    dot = sum(a[t] * b[t] * idf.get(t, 1) ** 2 for t in shared)
+    norm_a = math.sqrt(sum((count * idf.get(t, 1)) ** 2 for t, count in a.items()))
+    norm_b = math.sqrt(sum((count * idf.get(t, 1)) ** 2 for t, count in b.items()))
+    return dot / (norm_a * norm_b) if norm_a and norm_b else 0.0
+
+
+def _items(engine):
+    meta = engine.model._meta
+    return RelatedItem.objects.filter(app_label=meta.app_label, model_name=meta.model_name)
+
+
+def _write(engine, source_id, neighbours):
+    meta = engine.model._meta
+    _items(engine).filter(source_id=source_id).delete()
+    RelatedItem.objects.bulk_create([
+        RelatedItem(
+            app_label=meta.app_label,
+            model_name=meta.model_name,
+            source_id=source_id,
+            target_id=target_id,
+            score=score,
+            rank=rank,
+        )
+        for rank, (target_id, score) in enumerate(neighbours, start=1)
+    ])
+
+
+def _stored(engine, source_ids, chunk_size=500):
+    """{source_id: [(target_id, score)]} in rank order for the given rows"""
+    stored = {}
+    for start in range(0, len(source_ids), chunk_size):
+        items = _items(engine).filter(source_id__in=source_ids[start:start + chunk_size])
+        for source_id, target_id, score in items.order_by('source_id', 'rank').values_list(
+            'source_id', 'target_id', 'score'
+        ):
+            stored.setdefault(source_id, []).append((target_id, score))
+    return stored
+
+
+def rebuild_related(label):
+    """Recompute every row's neighbours; returns the number of rows"""
+    engine = get_engine(label)
+    features = engine.load_features()
+    idf = inverse_document_frequencies(features) if engine.use_text else None
+    with transaction.atomic():
+        _items(engine).delete()
+        for pk in features:
+            _write(engine, pk, engine.neighbours(pk, features, idf))
+    return len(features)
+
+
+def _neighbourhood(engine, pk):
+    """
+    Features for pk and every row it can score above zero against: rows that
+    share a tag or a category value with it. Text similarity can relate any
+    two rows, so with TF-IDF on (or tags the engine cannot query) this is
+    the whole table.
+    """
+    if engine.use_text:
+        return engine.load_features()
+    own = engine.load_features(engine.candidates().filter(pk=pk))
+    if pk not in own:
+        return own
+    source = own[pk]
+    if source.tags and not engine.tag_field:
+        return engine.load_features()
+    related = Q(pk=pk)
+    if source.tags:
+        related |= Q(**{f'{engine.tag_field}__in': source.tags})
+    for field, value in source.categories:
+        if value is not None:
+            related |= Q(**{field: value})
+    return engine.load_features(engine.candidates().filter(related).distinct())
+
+
+def refresh_related(label, pk):
+    """
+    Incremental refresh after one row changed: recompute its own list, then
+    merge it into (or drop it from) the lists of rows it shares a tag or
+    category with and of rows that list it now. Only that neighbourhood is
+    read and written, so a save costs O(rows related to it) - O(N) when
+    TF-IDF is on. A list is only recomputed in full when the changed row
+    falls out of a full list, since a better candidate may have been cut
+    from it earlier. Scores of other pairs drift as IDF and recency change;
+    rebuild_related corrects that.
+    """
+    engine = get_engine(label)
+    features = _neighbourhood(engine, pk)
+    idf = inverse_document_frequencies(features) if engine.use_text else None
+    listing = set(_items(engine).filter(target_id=pk).values_list('source_id', flat=True))
+    sources = sorted((set(features) | listing) - {pk})
+    stored = _stored(engine, sources)
+
+    with transaction.atomic():
+        if pk in features:
+            _write(engine, pk, engine.neighbours(pk, features, idf))
+        else:
+            _items(engine).filter(source_id=pk).delete()
+
+        updated = 0
+        for source_id in sources:
+            current = stored.get(source_id, [])
+            kept = [(target, score) for target, score in current if target != pk]
+            old_score = next((score for target, score in current if target == pk), None)
+            if pk in features and source_id in features:
+                new_score = engine.score(features[source_id], features[pk], idf)
+            else:
+                new_score = 0.0
+
+            dropped = old_score is not None and new_score < old_score
+            if dropped and len(current) >= engine.limit:
+                candidates = features if engine.use_text else _neighbourhood(engine, source_id)
+                neighbours = engine.neighbours(source_id, candidates, idf) if source_id in candidates else []
+            else:
+                merged = kept + ([(pk, new_score)] if new_score > 0 else [])
+                merged.sort(key=lambda item: (-item[1], item[0]))
+                neighbours = merged[:engine.limit]
+
+            # Scores drift with recency; only a different order is worth a write
+            if [target for target, _ in neighbours] != [target for target, _ in current]:
+                _write(engine, source_id, neighbours)
+                updated += 1
+    logger.info(f"Related content for {label} {pk} refreshed ({updated} other rows updated)")
+    return updated
+
+
+def _pending_key(label, pk):
+    return f'related_pending:{label}:{pk}'
+
+
+def schedule_related_refresh(label, pk):
+    """Coalesce bursts of saves (e.g. post save followed by tags.set) into one refresh"""
+    from django.core.cache import cache
+    from .tasks import run_in_background
+
+    if cache.add(_pending_key(label, pk), True, 300):
+        run_in_background(_run_refresh, label, pk)
+
+
+def _run_refresh(label, pk):
+    from django.core.cache import cache
+
+    # Clear the flag first so changes made during the refresh schedule another run
+    cache.delete(_pending_key(label, pk))
+    refresh_related(label, pk)
+
+
+def related_queryset(obj, queryset, limit, fallback=None):
+    """
+    Neighbours of obj from queryset in rank order, as one query on the
+    RelatedItem index. Until obj's neighbours have been computed (a fresh
+    deploy, a row saved moments ago) the first limit rows of fallback are
+    returned instead, so detail pages never lose their related items.
+    """
+    meta = obj._meta
+    items = RelatedItem.objects.filter(app_label=meta.app_label, model_name=meta.model_name, source_id=obj.pk)
+    ranks = items.filter(target_id=OuterRef('pk')).values('rank')[:1]
+    related = list(
+        queryset.filter(pk__in=items.values('target_id'))
+        .annotate(related_rank=Subquery(ranks))
+        .order_by('related_rank')[:limit]
+    )
+    if not related and fallback is not None:
+        related = list(fallback.exclude(pk=obj.pk)[:limit])
+    return related
+
+
+def build_missing_related():
+    """Rebuild every registered model that has no stored neighbours yet; returns the labels built"""
+    built = []
+    for engine in registered_engines():
+        model = engine.model
+        if not RelatedItem.objects.filter(app_label=model._meta.app_label, model_name=model._meta.model_name).exists():
+            rebuild_related(engine.label)
+            built.append(engine.label)
+    return built
@@ -0,0 +1,263 @@
+"""
+Signal handlers for core.
+Model changes are turned into the background work and cache invalidation
+they call for, wired up by the connect_*() functions called from each app's
+ready():
+- media files are released when the rows referencing them are deleted,
+  otherwise ImageKit keeps (and bills for) every deleted project image
+- image dimensions and LQIP placeholders are computed after uploads
+- sitemap sections are regenerated and CDN surrogate keys purged
+- related content (core.related) is refreshed for the changed row
+- facet count versions (core.facets) are bumped
+- the cached homepage bundle (core.homepage) is rebuilt
+Saves that only bump counters (COUNTER_UPDATE_FIELDS) are ignored.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .mixins import ImagePlaceholderMixin
+from .tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+# Apps whose models own uploaded media
+MEDIA_APPS = ('core', 'services', 'projects', 'blog', 'careers', 'dashboard')
+
+_state = threading.local()
+
+
+@contextmanager
+def suspend_file_cleanup():
+    """Keep media files when rows are deleted only to be re-created (e.g. restores)"""
+    previous = getattr(_state, 'suspended', False)
+    _state.suspended = True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def _file_fields(model):
+    return [f for f in model._meta.concrete_fields if isinstance(f, models.FileField)]
+
+
+def delete_files_on_delete(sender, instance, **kwargs):
+    """Queue every file referenced by a deleted row for removal from storage"""
+    if getattr(_state, 'suspended', False):
+        return
+    for field in _file_fields(sender):
+        file = getattr(instance, field.name)
+        if not file or not file.name:
+            continue
+        name, storage = file.name, file.storage
+
+        def _delete(name=name, storage=storage):
+            try:
+                storage.delete(name)
+            except Exception as e:
+                logger.warning(f"Could not delete {name} from storage: {e}")
+
+        transaction.on_commit(_delete)
+
+
+def connect_file_cleanup():
+    for app_label in MEDIA_APPS:
+        for model in apps.get_app_config(app_label).get_models():
+            if _file_fields(model):
+                post_delete.connect(
+                    delete_files_on_delete,
+                    sender=model,
+                    dispatch_uid=f'delete_files_{model._meta.label_lower}',
+                )
+
+
+def schedule_image_placeholder(sender, instance, **kwargs):
+    """Recompute dimensions/LQIP in the background when the image changed"""
+    if kwargs.get('raw') or not instance.placeholder_is_stale:
+        return
+    from .images import update_image_placeholder
+    run_in_background(update_image_placeholder, sender._meta.label, instance.pk)
+
+
+def connect_image_placeholders():
+    for model in apps.get_models():
+        if issubclass(model, ImagePlaceholderMixin):
+            post_save.connect(
+                schedule_image_placeholder,
+                sender=model,
+                dispatch_uid=f'image_placeholder_{model._meta.label_lower}',
+            )
+
+
+# Saves that only bump counters don't change what a sitemap or page shows
+COUNTER_UPDATE_FIELDS = {'views_count', 'likes_count', 'applications_count'}
+
+
+def schedule_sitemap_regeneration(sender, instance, **kwargs):
+    """Rewrite the sitemap sections listing this model once the change commits"""
+    if kwargs.get('raw'):
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= COUNTER_UPDATE_FIELDS:
+        return
+
+    from .sitemaps import SITEMAPS, bump_sitemap_version, schedule_sitemap_section
+
+    for section, sitemap in SITEMAPS.items():
+        if sender not in sitemap.watched_models():
+            continue
+        # Other machines notice the new version on their next sitemap request
+        transaction.on_commit(partial(bump_sitemap_version, section))
+        schedule_sitemap_section(section)
+
+
+def connect_sitemap_regeneration():
+    from .sitemaps import SITEMAPS
+
+    models = {model for sitemap in SITEMAPS.values() for model in sitemap.watched_models()}
+    for model in models:
+        label = model._meta.label_lower
+        post_save.connect(
+            schedule_sitemap_regeneration,
+            sender=model,
+            dispatch_uid=f'sitemap_save_{label}',
+        )
+        post_delete.connect(
+            schedule_sitemap_regeneration,
+            sender=model,
+            dispatch_uid=f'sitemap_delete_{label}',
+        )
+
+
+def schedule_surrogate_purge(sender, instance, **kwargs):
+    """Purge CDN copies of the pages showing this row once the change commits"""
+    if kwargs.get('raw'):
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= COUNTER_UPDATE_FIELDS:
+        return
+
+    from .surrogate import keys_for_instance, purge_surrogate_keys
+
+    run_in_background(purge_surrogate_keys, sorted(keys_for_instance(instance)))
+
+
+def connect_surrogate_purges():
+    from .images import placeholder_updated
+    from .surrogate import purge_models
+
+    for model in purge_models():
+        label = model._meta.label_lower
+        placeholder_updated.connect(
+            schedule_surrogate_purge,
+            sender=model,
+            dispatch_uid=f'surrogate_placeholder_{label}',
+        )
+        post_save.connect(
+            schedule_surrogate_purge,
+            sender=model,
+            dispatch_uid=f'surrogate_save_{label}',
+        )
+        post_delete.connect(
+            schedule_surrogate_purge,
+            sender=model,
+            dispatch_uid=f'surrogate_delete_{label}',
+        )
+
+
+def schedule_related_refresh(sender, instance, **kwargs):
+    """Refresh precomputed related content once a row changes"""
+    if kwargs.get('raw'):
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= COUNTER_UPDATE_FIELDS:
+        return
+
+    from .related import schedule_related_refresh as schedule
+    schedule(instance._meta.label, instance.pk)
+
+
+def schedule_related_refresh_for_tags(sender, instance, action, reverse, pk_set, model, **kwargs):
+    """Tags changed on a row (or rows were added to a tag)"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    from .related import schedule_related_refresh as schedule
+    if not reverse:
+        schedule(instance._meta.label, instance.pk)
+    elif pk_set:
+        for pk in pk_set:
+            schedule(model._meta.label, pk)
+
+
+def connect_related_content(engine):
+    """Register an engine (core.related) and keep its table fresh"""
+    from .related import register
+
+    register(engine)
+    model = engine.model
+    label = model._meta.label_lower
+    post_save.connect(schedule_related_refresh, sender=model, dispatch_uid=f'related_save_{label}')
+    post_delete.connect(schedule_related_refresh, sender=model, dispatch_uid=f'related_delete_{label}')
+    if engine.tag_field:
+        m2m_changed.connect(
+            schedule_related_refresh_for_tags,
+            sender=getattr(model, engine.tag_field).through,
+            dispatch_uid=f'related_tags_{label}',
+        )
+
+
+def bump_facet_version(sender, **kwargs):
+    """A listing's contents changed: retire its cached facet counts"""
+    if kwargs.get('raw'):
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= COUNTER_UPDATE_FIELDS:
+        return
+
+    from .facets import bump_content_version, registered_facet_sets
+    for facet_set in registered_facet_sets():
+        if sender in facet_set.watched_models:
+            bump_content_version(facet_set.name)
+
+
+def connect_facet_counts(facet_set):
+    """Register a FacetSet (core.facets) and version its counts by its watched models"""
+    from .facets import register
+
+    register(facet_set)
+    for model in facet_set.watched_models:
+        label = model._meta.label_lower
+        post_save.connect(bump_facet_version, sender=model, dispatch_uid=f'facets_save_{label}')
+        post_delete.connect(bump_facet_version, sender=model, dispatch_uid=f'facets_delete_{label}')
+
+
+def schedule_homepage_rebuild(sender, **kwargs):
+    """Rebuild the cached homepage bundle once the change commits"""
+    if kwargs.get('raw'):
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= COUNTER_UPDATE_FIELDS:
+        return
+
+    from .homepage import schedule_homepage_rebuild as schedule
+    schedule()
+
+
+def connect_homepage_rebuild():
+    from .homepage import HOMEPAGE_MODELS
+    from .images import placeholder_updated
+
+    for label in HOMEPAGE_MODELS:
+        model = apps.get_model(label)
+        uid = model._meta.label_lower
+        post_save.connect(schedule_homepage_rebuild, sender=model, dispatch_uid=f'homepage_save_{uid}')
+        post_delete.connect(schedule_homepage_rebuild, sender=model, dispatch_uid=f'homepage_delete_{uid}')
+        placeholder_updated.connect(schedule_homepage_rebuild, sender=model, dispatch_uid=f'homepage_placeholder_{uid}')
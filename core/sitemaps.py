@@ -1,40 +1,51 @@
+"""
+Sitemaps for Skyline Ghana Constructions
+Sections are written as static gzipped files plus a sitemap index under
+SITEMAP_ROOT, and regenerated in the background when their model changes,
+so crawler hits never build sitemaps. SITEMAP_ROOT is local to each machine:
+a change moves a shared per-section version forward, each machine records
+the version its files were built from, and a machine that serves a file
+older than the shared version regenerates that section in the background.
+"""
+
+import gzip
+import json
+import logging
+import os
+import socket
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
+from django.template.loader import render_to_string
 from django.urls import reverse
-from django.utils import timezone
-from datetime import datetime
+from django.utils.dateparse import parse_datetime
 from projects.models import Project
 from services.models import Service, ServiceCategory
 from blog.models import BlogPost
 from careers.models import JobPosition
 
+from .cache import bump_generation, get_generation
+from .conditional import latest_updated_at, make_etag
 
-class BaseSitemap(Sitemap):
-    """Base sitemap class with production URL enforcement"""
-    protocol = 'https'
-
-    def get_urls(self, site=None, **kwargs):
-        """Override to ensure production URLs with caching"""
-        from django.core.cache import cache
+logger = logging.getLogger(__name__)
 
-        # Try to get from cache first
-        cache_key = f'sitemap_{self.__class__.__name__.lower()}'
-        urls = cache.get(cache_key)
+# sitemaps.org limit per file; larger sections are split into numbered pages
+MAX_URLS_PER_FILE = 50000
 
-        if urls is None:
-            urls = super().get_urls(site=site, **kwargs)
-            for url in urls:
-                # Force production domain
-                if 'localhost' in url['location'] or '127.0.0.1' in url['location']:
-                    url['location'] = url['location'].replace('http://localhost:8000', 'https://skylinegh.com')
-                    url['location'] = url['location'].replace('https://localhost:8000', 'https://skylinegh.com')
-                    url['location'] = url['location'].replace('http://127.0.0.1:8000', 'https://skylinegh.com')
-                # Ensure no www in URLs
-                url['location'] = url['location'].replace('://www.', '://')
 
-            # Cache for 1 hour
-            cache.set(cache_key, urls, 3600)
+class BaseSitemap(Sitemap):
+    """Base sitemap class with production URL enforcement"""
+    protocol = 'https'
+    limit = MAX_URLS_PER_FILE
+    # Model whose changes regenerate this section (see core.signals)
+    model = None
 
-        return urls
+    @classmethod
+    def watched_models(cls):
+        """Models whose saves/deletes regenerate this section"""
+        return (cls.model,) if cls.model is not None else ()
 
 class StaticViewSitemap(BaseSitemap):
     """Sitemap for static pages"""
@@ -56,11 +67,44 @@ class StaticViewSitemap(BaseSitemap):
     def location(self, item):
         return reverse(item)
 
+    def sources(self, item):
+        """Querysets whose newest updated_at is the page's last modification"""
+        from core.models import (
+            AboutSectionImage, HomepageCarouselImage, SiteSettings, TeamMember, Testimonial,
+        )
+        from projects.models import ProjectImage
+
+        projects = Project.objects.filter(is_published=True)
+        services = Service.objects.filter(is_active=True)
+        posts = BlogPost.objects.filter(status='published', published_at__isnull=False)
+        jobs = JobPosition.objects.filter(status='active')
+        site = SiteSettings.objects.all()
+        return {
+            'core:home': [site, HomepageCarouselImage.objects.all(), Testimonial.objects.all(),
+                          projects, services, posts],
+            'core:about': [site, AboutSectionImage.objects.all(), TeamMember.objects.all()],
+            'core:contact': [site],
+            'projects:project_list': [projects],
+            'projects:gallery': [ProjectImage.objects.filter(project__is_published=True)],
+            'careers:job_list': [jobs],
+            'blog:post_list': [posts],
+            'services:service_list': [services, ServiceCategory.objects.filter(is_active=True)],
+        }.get(item, [site])
+
     def lastmod(self, item):
-        # Return more specific last modified dates for different pages
-        if item == 'core:home':
-            return timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        return timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return latest_updated_at(*self.sources(item))
+
+    @classmethod
+    def watched_models(cls):
+        from core.models import (
+            AboutSectionImage, HomepageCarouselImage, SiteSettings, TeamMember, Testimonial,
+        )
+        from projects.models import ProjectImage
+
+        return (
+            SiteSettings, HomepageCarouselImage, AboutSectionImage, TeamMember, Testimonial,
+            Project, ProjectImage, Service, ServiceCategory, BlogPost, JobPosition,
+        )
 
     def priority(self, item):
         # Set different priorities for different pages
@@ -78,6 +122,7 @@ class StaticViewSitemap(BaseSitemap):
 
 class ProjectSitemap(BaseSitemap):
     """Sitemap for project pages"""
+    model = Project
     changefreq = 'monthly'
     priority = 0.8
 
@@ -96,6 +141,7 @@ class ProjectSitemap(BaseSitemap):
 
 class ServiceSitemap(BaseSitemap):
     """Sitemap for service pages"""
+    model = Service
     changefreq = 'monthly'
     priority = 0.9
     
@@ -110,6 +156,7 @@ class ServiceSitemap(BaseSitemap):
 
 class ServiceCategorySitemap(BaseSitemap):
     """Sitemap for service category pages"""
+    model = ServiceCategory
     changefreq = 'monthly'
     priority = 0.8
     
@@ -124,6 +171,7 @@ class ServiceCategorySitemap(BaseSitemap):
 
 class BlogSitemap(BaseSitemap):
     """Sitemap for blog posts"""
+    model = BlogPost
     changefreq = 'weekly'
     priority = 0.6
     
@@ -140,6 +188,7 @@ class BlogSitemap(BaseSitemap):
 
 class JobSitemap(BaseSitemap):
     """Sitemap for job postings"""
+    model = JobPosition
     changefreq = 'weekly'
     priority = 0.7
     
@@ -152,3 +201,198 @@ class JobSitemap(BaseSitemap):
     
     def location(self, obj):
         return obj.get_absolute_url()
+
+
+SITEMAPS = {
+    'static': StaticViewSitemap,
+    'projects': ProjectSitemap,
+    'services': ServiceSitemap,
+    'service_categories': ServiceCategorySitemap,
+    'blog': BlogSitemap,
+    'jobs': JobSitemap,
+}
+
+
+class SitemapSite:
+    """Minimal stand-in for django.contrib.sites' Site (the sites framework is not installed)"""
+
+    def __init__(self, domain):
+        self.domain = self.name = domain
+
+
+def get_sitemap_root():
+    return Path(getattr(settings, 'SITEMAP_ROOT', settings.BASE_DIR / 'sitemaps'))
+
+
+def get_sitemap_domain():
+    return getattr(settings, 'SITEMAP_DOMAIN', 'skylinegh.com')
+
+
+def _write_atomic(path, data):
+    """Write to a temporary file and rename, so readers never see a partial file"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+
+def _page_filename(section, page):
+    return f'sitemap-{section}-{page}.xml.gz'
+
+
+def write_sitemap_section(section, update_index=True):
+    """Render one section into gzipped files (one per MAX_URLS_PER_FILE URLs)"""
+    sitemap = SITEMAPS[section]()
+    site = SitemapSite(get_sitemap_domain())
+    root = get_sitemap_root()
+    root.mkdir(parents=True, exist_ok=True)
+    # Read before rendering, so a change made meanwhile leaves the files stale
+    version = sitemap_version(section)
+
+    pages = sitemap.paginator.num_pages
+    lastmod = None
+    files = {}
+    for page in range(1, pages + 1):
+        urls = sitemap.get_urls(page=page, site=site, protocol='https')
+        page_lastmod = max((url['lastmod'] for url in urls if url.get('lastmod')), default=None)
+        if page_lastmod and (lastmod is None or page_lastmod > lastmod):
+            lastmod = page_lastmod
+        xml = render_to_string('sitemap.xml', {'urlset': urls})
+        filename = _page_filename(section, page)
+        _write_atomic(root / filename, gzip.compress(xml.encode('utf-8'), mtime=0))
+        files[filename] = _file_meta(xml, page_lastmod)
+
+    # Remove pages left over from when the section was larger
+    prefix = f'sitemap-{section}-'
+    for path in root.glob(f'{prefix}*.xml.gz'):
+        number = path.name[len(prefix):-len('.xml.gz')]
+        if number.isdigit() and int(number) > pages:
+            path.unlink(missing_ok=True)
+
+    meta = {'pages': pages, 'lastmod': _isoformat(lastmod), 'files': files, 'version': version}
+    _write_atomic(root / f'sitemap-{section}.json', json.dumps(meta).encode('utf-8'))
+    if update_index:
+        write_sitemap_index()
+    return pages
+
+
+def write_sitemap_index():
+    """Write sitemap.xml listing every generated section page"""
+    root = get_sitemap_root()
+    domain = get_sitemap_domain()
+    entries = []
+    lastmod = None
+    for section in SITEMAPS:
+        try:
+            meta = json.loads((root / f'sitemap-{section}.json').read_text())
+        except (OSError, ValueError):
+            continue
+        last_mod = parse_datetime(meta['lastmod']) if meta.get('lastmod') else None
+        if last_mod and (lastmod is None or last_mod > lastmod):
+            lastmod = last_mod
+        for page in range(1, meta['pages'] + 1):
+            entries.append({
+                'location': f'https://{domain}/{_page_filename(section, page)}',
+                'last_mod': last_mod,
+            })
+    xml = render_to_string('sitemap_index.xml', {'sitemaps': entries})
+    _write_atomic(root / 'sitemap.xml', xml.encode('utf-8'))
+    meta = {'files': {'sitemap.xml': _file_meta(xml, lastmod)}}
+    _write_atomic(root / 'sitemap-index.json', json.dumps(meta).encode('utf-8'))
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _file_meta(xml, lastmod):
+    """ETag of the XML body and newest lastmod inside it, for conditional GETs"""
+    return {'etag': make_etag(xml), 'lastmod': _isoformat(lastmod)}
+
+
+def get_sitemap_file_meta(filename):
+    """
+    {'etag', 'lastmod'} recorded when a served sitemap file was written, or
+    None. Read from the small JSON beside it so a 304 never opens the file.
+    """
+    if filename == 'sitemap.xml':
+        meta_name = 'sitemap-index.json'
+    else:
+        section = filename[len('sitemap-'):].rsplit('-', 1)[0]
+        meta_name = f'sitemap-{section}.json'
+    try:
+        meta = json.loads((get_sitemap_root() / meta_name).read_text())
+    except (OSError, ValueError):
+        return None
+    file_meta = meta.get('files', {}).get(filename)
+    if not file_meta:
+        return None
+    return {
+        'etag': file_meta['etag'],
+        'lastmod': parse_datetime(file_meta['lastmod']) if file_meta.get('lastmod') else None,
+    }
+
+
+def generate_sitemaps(sections=None):
+    """Regenerate the given sections (default: all) and the index"""
+    for section in sections or SITEMAPS:
+        write_sitemap_section(section, update_index=False)
+    write_sitemap_index()
+
+
+def sitemap_version(section):
+    """Shared version of a section; moves forward whenever its content changes"""
+    return get_generation(f'sitemap_version:{section}')
+
+
+def bump_sitemap_version(section):
+    bump_generation(f'sitemap_version:{section}')
+
+
+def _local_version(section):
+    try:
+        return json.loads((get_sitemap_root() / f'sitemap-{section}.json').read_text()).get('version')
+    except (OSError, ValueError):
+        return None
+
+
+def _pending_key(section):
+    # Per machine: every machine rewrites its own copy of the files
+    return f'sitemap_pending_{socket.gethostname()}_{section}'
+
+
+def schedule_sitemap_section(section):
+    """Regenerate a section on this machine once the current transaction commits, coalescing bursts"""
+    from django.core.cache import cache
+    from .tasks import run_in_background
+
+    if cache.add(_pending_key(section), True, 300):
+        run_in_background(regenerate_sitemap_section, section)
+
+
+def refresh_stale_sitemaps(filename='sitemap.xml'):
+    """
+    Schedule regeneration of the sections behind a served file whose local
+    copy is older than the shared version (changed on another machine).
+    The stale file is still served this time.
+    """
+    if filename == 'sitemap.xml':
+        sections = list(SITEMAPS)
+    else:
+        sections = [filename[len('sitemap-'):].rsplit('-', 1)[0]]
+    for section in sections:
+        if section in SITEMAPS and _local_version(section) != sitemap_version(section):
+            schedule_sitemap_section(section)
+
+
+def regenerate_sitemap_section(section):
+    """Background step scheduled by core.signals and refresh_stale_sitemaps"""
+    from django.core.cache import cache
+
+    # Clear the flag first so changes made during generation schedule another run
+    cache.delete(_pending_key(section))
+    write_sitemap_section(section)
@@ -0,0 +1,56 @@
+"""
+Static file storage for Skyline Ghana Constructions
+Runs once at image build time (collectstatic): CSS/JS are minified, names are
+content-hashed into staticfiles.json, and WhiteNoise writes gzip and Brotli
+variants next to each file. At runtime the manifest is only read.
+"""
+
+import logging
+import os
+
+import rcssmin
+import rjsmin
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+logger = logging.getLogger(__name__)
+
+
+class MinifiedManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """CompressedManifestStaticFilesStorage that minifies CSS/JS before hashing"""
+
+    minifiers = {
+        '.css': rcssmin.cssmin,
+        '.js': rjsmin.jsmin,
+    }
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = self.minify(paths)
+        yield from super().post_process(paths, dry_run, **options)
+
+    def minify(self, paths):
+        """
+        Minify collected copies in place and point hashing at them, so the
+        content hash (and the compressed variants) reflect the minified bytes.
+        """
+        saved = 0
+        paths = dict(paths)
+        for path in paths:
+            minifier = self.minifiers.get(os.path.splitext(path)[1].lower())
+            if minifier is None or '.min.' in path:
+                continue
+            with self.open(path) as f:
+                try:
+                    original = f.read().decode('utf-8')
+                except UnicodeDecodeError:
+                    continue
+            minified = minifier(original)
+            if len(minified) >= len(original):
+                continue
+            self.delete(path)
+            self._save(path, ContentFile(minified.encode('utf-8')))
+            paths[path] = (self, path)
+            saved += len(original) - len(minified)
+        logger.info(f"Minified static files, saved {saved} bytes")
+        return paths
@@ -1,24 +1,67 @@
 """
-ImageKit Storage Backend for Skyline Ghana Constructions
-Handles file uploads to ImageKit CDN for both development and production
+Media storage backends for Skyline Ghana Constructions
+Uploads are content-addressed: identical bytes are stored once and shared
+through a refcount table (core.models.StoredFile). The remote blob store sits
+behind the MediaBackend interface, with ImageKit for production and a local
+filesystem stand-in for development and network-free load testing.
 """
 
-from django.core.files.storage import Storage
+from django.core.files.storage import Storage, FileSystemStorage
 from django.core.files.base import ContentFile
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 from django.utils.deconstruct import deconstructible
 from imagekitio import ImageKit
+from datetime import timedelta
+import hashlib
+import os
+import time
 import uuid
 import logging
 import mimetypes
-from urllib.parse import urljoin
+from urllib.request import urlopen
 
 logger = logging.getLogger(__name__)
 
-@deconstructible
-class ImageKitStorage(Storage):
+# file_id recorded for files the development fallback wrote to local disk;
+# process_file_deletions removes those with FileSystemStorage by name
+LOCAL_FILE_ID = 'local'
+
+
+class MediaBackend:
     """
-    Simplified and reliable ImageKit.io storage backend
+    Interface for the blob store behind ContentAddressedStorage.
+    file_id is whatever the provider needs to delete a file later.
+    """
+
+    def upload(self, name, file_content, folder):
+        """Store bytes and return (stored_path, file_id)"""
+        raise NotImplementedError
+
+    def open(self, name):
+        """Return the stored bytes for name"""
+        raise NotImplementedError
+
+    def url(self, name):
+        raise NotImplementedError
+
+    def bulk_delete(self, file_ids):
+        """Delete files and return the set of ids confirmed deleted"""
+        raise NotImplementedError
+
+    def resolve_file_id(self, name):
+        """Find the file_id for a stored path that was recorded without one"""
+        return ''
+
+    def list_files(self, path='/skyline/'):
+        """Yield (stored_path, file_id) for every file under path"""
+        raise NotImplementedError
+
+
+class ImageKitBackend(MediaBackend):
+    """
+    Simplified and reliable ImageKit.io backend
     """
 
     def __init__(self):
@@ -33,134 +76,291 @@ class ImageKitStorage(Storage):
         except Exception as e:
             logger.error(f"Failed to initialize ImageKit storage: {e}")
             raise
-    
-    def _open(self, name, mode='rb'):
-        """
-        Open a file from ImageKit storage
-        Note: This is a simplified implementation for read operations
-        """
-        # For most use cases, we don't need to read files back from ImageKit
-        # This method is required by Django's Storage interface
-        return ContentFile(b'')
-    
-    def _save(self, name, content):
+
+    def upload(self, name, file_content, folder):
         """
-        Save file to ImageKit
+        Upload file to ImageKit
         """
         try:
-            # Generate unique filename if needed
-            if not name:
-                name = str(uuid.uuid4())
-
-            # Get file extension
-            file_extension = name.split('.')[-1] if '.' in name else ''
-
-            # Create unique file ID
-            file_id = f"{uuid.uuid4()}.{file_extension}" if file_extension else str(uuid.uuid4())
-
-            # Determine folder based on file type
-            folder = self._get_folder_by_type(name)
-
-            # Read file content
-            content.seek(0)
-            file_content = content.read()
-
-            # Convert to base64 data URL for proper ImageKit upload
-            import base64
-
-            # Detect MIME type
-            mime_type, _ = mimetypes.guess_type(name)
-            if not mime_type:
-                # Default to appropriate type based on file extension
-                if name.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg')):
-                    ext = name.split('.')[-1].lower()
-                    if ext == 'jpg':
-                        ext = 'jpeg'
-                    mime_type = f"image/{ext}"
-                else:
-                    mime_type = "application/octet-stream"
-
-            # Encode as base64 data URL for images, raw bytes for other files
-            if mime_type.startswith('image/'):
-                file_base64 = base64.b64encode(file_content).decode('utf-8')
-                upload_data = f"data:{mime_type};base64,{file_base64}"
-            else:
-                upload_data = file_content
-
-            # Upload to ImageKit using proper SDK format
-            try:
-                from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
-
-                options = UploadFileRequestOptions(
-                    folder=folder,
-                    use_unique_file_name=True,
-                )
-
-                upload_response = self.imagekit.upload_file(
-                    file=upload_data,
-                    file_name=file_id,
-                    options=options
-                )
-            except ImportError:
-                # Fallback for older SDK versions
-                upload_response = self.imagekit.upload_file(
-                    file=file_content,
-                    file_name=file_id
-                )
-
-            # Handle different response formats from ImageKit SDK
-            try:
-                if hasattr(upload_response, 'response_metadata') and upload_response.response_metadata.http_status_code == 200:
-                    # Try to get the uploaded file path (includes folder structure)
-                    if hasattr(upload_response, 'file_path'):
-                        # Use file_path which includes the folder structure
-                        uploaded_path = upload_response.file_path.lstrip('/')
-                        logger.info(f"Successfully uploaded file: {uploaded_path}")
-                        return uploaded_path
-                    elif hasattr(upload_response, 'name'):
-                        # Fallback to name and construct path
-                        uploaded_name = upload_response.name
-                        uploaded_path = f"{folder.strip('/')}/{uploaded_name}".lstrip('/')
-                        logger.info(f"Successfully uploaded file: {uploaded_path}")
-                        return uploaded_path
-                    elif hasattr(upload_response, 'response_metadata') and hasattr(upload_response.response_metadata, 'raw'):
-                        raw_data = upload_response.response_metadata.raw
-                        if 'filePath' in raw_data:
-                            uploaded_path = raw_data['filePath'].lstrip('/')
-                        else:
-                            uploaded_name = raw_data.get('name', file_id)
-                            uploaded_path = f"{folder.strip('/')}/{uploaded_name}".lstrip('/')
-                        logger.info(f"Successfully uploaded file: {uploaded_path}")
-                        return uploaded_path
-                    else:
-                        # Construct path manually
-                        uploaded_path = f"{folder.strip('/')}/{file_id}".lstrip('/')
-                        logger.info(f"Successfully uploaded file: {uploaded_path}")
-                        return uploaded_path
-                else:
-                    logger.error(f"ImageKit upload failed with status code")
-                    raise Exception("Failed to upload to ImageKit")
-            except Exception as response_error:
-                logger.error(f"Error processing ImageKit response: {response_error}")
-                # If we can't process the response but upload might have succeeded,
-                # return the constructed path
-                uploaded_path = f"{folder.strip('/')}/{file_id}".lstrip('/')
-                logger.info(f"Using constructed path: {uploaded_path}")
-                return uploaded_path
-
+            return self._upload(name, file_content, folder)
         except Exception as e:
             logger.error(f"Error uploading file to ImageKit: {e}")
-            # Fallback to local storage in development or if ImageKit fails
-            if settings.DEBUG or not hasattr(self, 'imagekit'):
+            # Fallback to local storage in development
+            if settings.DEBUG:
                 try:
-                    from django.core.files.storage import default_storage
                     logger.warning("Falling back to local storage")
-                    return default_storage._save(name, content)
+                    return FileSystemStorage().save(name, ContentFile(file_content)), LOCAL_FILE_ID
                 except Exception as fallback_error:
                     logger.error(f"Fallback storage also failed: {fallback_error}")
                     raise e
             raise
 
+    def _upload(self, name, file_content, folder):
+        # Get file extension
+        file_extension = name.split('.')[-1] if '.' in name else ''
+
+        # Create unique file ID
+        file_id = f"{uuid.uuid4()}.{file_extension}" if file_extension else str(uuid.uuid4())
+
+        # Convert to base64 data URL for proper ImageKit upload
+        import base64
+
+        # Detect MIME type
+        mime_type, _ = mimetypes.guess_type(name)
+        if not mime_type:
+            # Default to appropriate type based on file extension
+            if name.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg')):
+                ext = name.split('.')[-1].lower()
+                if ext == 'jpg':
+                    ext = 'jpeg'
+                mime_type = f"image/{ext}"
+            else:
+                mime_type = "application/octet-stream"
+
+        # Encode as base64 data URL for images, raw bytes for other files
+        if mime_type.startswith('image/'):
+            file_base64 = base64.b64encode(file_content).decode('utf-8')
+            upload_data = f"data:{mime_type};base64,{file_base64}"
+        else:
+            upload_data = file_content
+
+        # Upload to ImageKit using proper SDK format
+        try:
+            from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
+
+            options = UploadFileRequestOptions(
+                folder=folder,
+                use_unique_file_name=True,
+            )
+
+            upload_response = self.imagekit.upload_file(
+                file=upload_data,
+                file_name=file_id,
+                options=options
+            )
+        except ImportError:
+            # Fallback for older SDK versions
+            upload_response = self.imagekit.upload_file(
+                file=file_content,
+                file_name=file_id
+            )
+
+        # Handle different response formats from ImageKit SDK
+        remote_file_id = ''
+        try:
+            if hasattr(upload_response, 'response_metadata') and upload_response.response_metadata.http_status_code == 200:
+                raw_data = getattr(upload_response.response_metadata, 'raw', None) or {}
+                remote_file_id = getattr(upload_response, 'file_id', None) or raw_data.get('fileId', '')
+                # Try to get the uploaded file path (includes folder structure)
+                if hasattr(upload_response, 'file_path'):
+                    # Use file_path which includes the folder structure
+                    uploaded_path = upload_response.file_path.lstrip('/')
+                elif hasattr(upload_response, 'name'):
+                    # Fallback to name and construct path
+                    uploaded_name = upload_response.name
+                    uploaded_path = f"{folder.strip('/')}/{uploaded_name}".lstrip('/')
+                elif raw_data:
+                    if 'filePath' in raw_data:
+                        uploaded_path = raw_data['filePath'].lstrip('/')
+                    else:
+                        uploaded_name = raw_data.get('name', file_id)
+                        uploaded_path = f"{folder.strip('/')}/{uploaded_name}".lstrip('/')
+                else:
+                    # Construct path manually
+                    uploaded_path = f"{folder.strip('/')}/{file_id}".lstrip('/')
+                logger.info(f"Successfully uploaded file: {uploaded_path}")
+            else:
+                logger.error(f"ImageKit upload failed with status code")
+                raise Exception("Failed to upload to ImageKit")
+        except Exception as response_error:
+            logger.error(f"Error processing ImageKit response: {response_error}")
+            # If we can't process the response but upload might have succeeded,
+            # return the constructed path; the sweeper resolves the fileId later
+            uploaded_path = f"{folder.strip('/')}/{file_id}".lstrip('/')
+            logger.info(f"Using constructed path: {uploaded_path}")
+
+        return uploaded_path, remote_file_id
+
+    def open(self, name):
+        with urlopen(self.url(name), timeout=30) as response:
+            return response.read()
+
+    def url(self, name):
+        # Construct ImageKit URL
+        base_url = settings.IMAGEKIT_URL_ENDPOINT.rstrip('/')
+        clean_name = name.lstrip('/')
+
+        return f"{base_url}/{clean_name}"
+
+    def resolve_file_id(self, name):
+        """Look up the ImageKit fileId for a stored path (used for legacy uploads)"""
+        from imagekitio.models.ListAndSearchFileRequestOptions import ListAndSearchFileRequestOptions
+
+        folder, _, filename = ('/' + name.lstrip('/')).rpartition('/')
+        result = self.imagekit.list_files(options=ListAndSearchFileRequestOptions(
+            path=f"{folder}/",
+            search_query=f'name = "{filename}"',
+            limit=1,
+        ))
+        for item in getattr(result, 'list', None) or []:
+            return item.file_id
+        return ''
+
+    def bulk_delete(self, file_ids):
+        """Delete up to 100 files in one API call; returns the ids ImageKit confirmed"""
+        file_ids = list(file_ids)
+        try:
+            response = self.imagekit.bulk_file_delete(file_ids=file_ids)
+        except Exception as e:
+            # One missing id fails the whole bulk request; retry file by file
+            if len(file_ids) == 1:
+                raise
+            logger.warning(f"Bulk delete failed ({e}), deleting files individually")
+            deleted = set()
+            for file_id in file_ids:
+                try:
+                    self.imagekit.delete_file(file_id=file_id)
+                    deleted.add(file_id)
+                except Exception as item_error:
+                    logger.warning(f"Could not delete ImageKit file {file_id}: {item_error}")
+            return deleted
+        deleted = getattr(response, 'successfully_deleted_file_ids', None)
+        if deleted is None:
+            raw = getattr(getattr(response, 'response_metadata', None), 'raw', None) or {}
+            deleted = raw.get('successfullyDeletedFileIds', [])
+        return set(deleted)
+
+    def list_files(self, path='/skyline/', page_size=1000):
+        """Yield (file_path, file_id) for every file under path"""
+        from imagekitio.models.ListAndSearchFileRequestOptions import ListAndSearchFileRequestOptions
+
+        skip = 0
+        while True:
+            result = self.imagekit.list_files(options=ListAndSearchFileRequestOptions(
+                path=path, skip=skip, limit=page_size,
+            ))
+            items = getattr(result, 'list', None) or []
+            for item in items:
+                yield item.file_path.lstrip('/'), item.file_id
+            if len(items) < page_size:
+                return
+            skip += page_size
+
+
+class LocalMediaBackend(MediaBackend):
+    """
+    Filesystem stand-in for ImageKit, used in development and load tests.
+    Set LOCAL_MEDIA_BACKEND_LATENCY (seconds) to simulate provider round trips.
+    """
+
+    def __init__(self):
+        self.location = getattr(settings, 'LOCAL_MEDIA_BACKEND_ROOT', settings.MEDIA_ROOT)
+        self.latency = getattr(settings, 'LOCAL_MEDIA_BACKEND_LATENCY', 0)
+        self.filesystem = FileSystemStorage(location=self.location, base_url=settings.MEDIA_URL)
+
+    def _simulate_round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def upload(self, name, file_content, folder):
+        self._simulate_round_trip()
+        extension = os.path.splitext(name)[1].lower()
+        path = self.filesystem.save(f"{folder.strip('/')}/{uuid.uuid4()}{extension}", ContentFile(file_content))
+        return path, path
+
+    def open(self, name):
+        with self.filesystem.open(name, 'rb') as f:
+            return f.read()
+
+    def url(self, name):
+        return self.filesystem.url(name)
+
+    def bulk_delete(self, file_ids):
+        self._simulate_round_trip()
+        deleted = set()
+        for file_id in file_ids:
+            self.filesystem.delete(file_id)
+            deleted.add(file_id)
+        return deleted
+
+    def resolve_file_id(self, name):
+        return name if self.filesystem.exists(name) else ''
+
+    def list_files(self, path='/skyline/'):
+        root = path.strip('/')
+        for dirpath, _, filenames in os.walk(os.path.join(self.location, root)):
+            for filename in filenames:
+                stored = os.path.relpath(os.path.join(dirpath, filename), self.location).replace(os.sep, '/')
+                yield stored, stored
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    """
+    Django storage that hashes content before upload and reuses an existing
+    object when the SHA-256 matches. StoredFile.ref_count tracks how many
+    field values share a stored object; it is only removed at zero.
+    """
+    backend_class = None
+
+    def __init__(self):
+        self.backend = self.backend_class()
+
+    def _open(self, name, mode='rb'):
+        """
+        Open a stored file (fetched from the backend)
+        """
+        try:
+            return ContentFile(self.backend.open(name), name=name)
+        except Exception as e:
+            logger.warning(f"Could not read {name} from storage: {e}")
+            return ContentFile(b'', name=name)
+
+    def _save(self, name, content):
+        """
+        Save file, deduplicating on content hash
+        """
+        from .models import StoredFile
+
+        # Generate unique filename if needed
+        if not name:
+            name = str(uuid.uuid4())
+
+        content.seek(0)
+        file_content = content.read()
+        content_hash = hashlib.sha256(file_content).hexdigest()
+
+        # Lock the row delete() locks: either the reference is added before a
+        # concurrent delete() reads ref_count, or the row is already gone (and
+        # queued for deletion) and the content is uploaded afresh below
+        with transaction.atomic():
+            existing = (
+                StoredFile.objects.select_for_update()
+                .filter(content_hash=content_hash).order_by('pk').first()
+            )
+            if existing:
+                StoredFile.objects.filter(pk=existing.pk).update(ref_count=F('ref_count') + 1)
+                logger.info(f"Reusing stored file {existing.name} for identical upload {name}")
+                return existing.name
+
+        # Determine folder based on file type
+        folder = self._get_folder_by_type(name)
+        uploaded_path, remote_file_id = self.backend.upload(name, file_content, folder)
+
+        try:
+            StoredFile.objects.update_or_create(
+                name=uploaded_path,
+                defaults={
+                    'file_id': remote_file_id or '',
+                    'size': len(file_content),
+                    'content_hash': content_hash,
+                    'ref_count': 1,
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Could not record uploaded file {uploaded_path}: {e}")
+        return uploaded_path
+
     def _get_folder_by_type(self, filename):
         """
         Determine ImageKit folder based on file type
@@ -190,47 +390,41 @@ class ImageKitStorage(Storage):
 
     def delete(self, name):
         """
-        Delete file from ImageKit
+        Release one reference to name. At zero references the file is queued
+        for deletion; the API calls are batched by process_file_deletions().
         """
+        if not name:
+            return
         try:
-            # Extract file_id from name if possible
-            file_id = name.split('/')[-1] if '/' in name else name
-
-            # Delete from ImageKit
-            delete_response = self.imagekit.delete_file(file_id=file_id)
-
-            # Handle different response formats
-            try:
-                if hasattr(delete_response, 'response_metadata') and delete_response.response_metadata.http_status_code == 204:
-                    logger.info(f"Successfully deleted file: {name}")
-                    return True
-                else:
-                    logger.warning(f"Failed to delete file from ImageKit: {name}")
-                    return False
-            except Exception as response_error:
-                logger.warning(f"Could not verify deletion response: {response_error}")
-                # Assume deletion was successful if no exception was raised
-                logger.info(f"Assuming file was deleted: {name}")
-                return True
-
+            from .models import StoredFile, FileDeletion
+            from .tasks import run_in_background
+
+            with transaction.atomic():
+                stored = StoredFile.objects.select_for_update().filter(name=name).first()
+                if stored and stored.ref_count > 1:
+                    StoredFile.objects.filter(pk=stored.pk).update(ref_count=F('ref_count') - 1)
+                    return
+                FileDeletion.objects.create(name=name, file_id=stored.file_id if stored else '')
+                if stored:
+                    stored.delete()
+            run_in_background(process_file_deletions)
         except Exception as e:
-            logger.error(f"Error deleting file from ImageKit: {e}")
-            return False
+            logger.error(f"Error queueing deletion for {name}: {e}")
 
     def exists(self, name):
         """
-        Check if file exists in ImageKit
-        Note: ImageKit doesn't provide a direct exists API,
-        so we return False to always allow uploads with unique names
+        Stored names are unique per upload, so we return False to always
+        allow uploads
         """
         return False
 
     def size(self, name):
         """
-        Return file size (ImageKit doesn't provide direct size API)
+        Return file size as recorded at upload time
         """
-        return 0
-    
+        from .models import StoredFile
+        return StoredFile.objects.filter(name=name).values_list('size', flat=True).first() or 0
+
     def url(self, name):
         """
         Return the URL for accessing the file
@@ -242,12 +436,8 @@ class ImageKitStorage(Storage):
         if name.startswith('http'):
             return name
 
-        # Construct ImageKit URL
-        base_url = settings.IMAGEKIT_URL_ENDPOINT.rstrip('/')
-        clean_name = name.lstrip('/')
+        return self.backend.url(name)
 
-        return f"{base_url}/{clean_name}"
-    
     def get_available_name(self, name, max_length=None):
         """
         Get an available filename
@@ -256,18 +446,146 @@ class ImageKitStorage(Storage):
 
     def get_accessed_time(self, name):
         """
-        Return last accessed time (not supported by ImageKit)
+        Return last accessed time (not supported by remote backends)
         """
-        raise NotImplementedError("ImageKit storage doesn't support accessed time")
+        raise NotImplementedError("Media storage doesn't support accessed time")
 
     def get_created_time(self, name):
         """
-        Return creation time (not supported by ImageKit)
+        Return creation time (not supported by remote backends)
         """
-        raise NotImplementedError("ImageKit storage doesn't support creation time")
+        raise NotImplementedError("Media storage doesn't support creation time")
 
     def get_modified_time(self, name):
         """
-        Return last modified time (not supported by ImageKit)
+        Return last modified time (not supported by remote backends)
         """
-        raise NotImplementedError("ImageKit storage doesn't support modified time")
+        raise NotImplementedError("Media storage doesn't support modified time")
+
+
+@deconstructible
+class ImageKitStorage(ContentAddressedStorage):
+    """
+    Content-addressed storage on ImageKit.io (production default storage)
+    """
+    backend_class = ImageKitBackend
+
+
+@deconstructible
+class LocalStandInStorage(ContentAddressedStorage):
+    """
+    Content-addressed storage on the local filesystem, exercising the same
+    hashing, dedup and deletion queue as ImageKitStorage without network
+    """
+    backend_class = LocalMediaBackend
+
+
+# ImageKit bulk delete accepts at most 100 file ids per request
+BULK_DELETE_LIMIT = 100
+# Base delay before retrying a failed deletion; doubles on every attempt
+RETRY_BASE_DELAY = 60
+MAX_RETRY_DELAY = 6 * 60 * 60
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY))
+
+
+def _retry_later(item, error, now, max_attempts):
+    """Count a failed attempt and back off; give up after max_attempts"""
+    item.attempts += 1
+    item.last_error = error
+    item.next_attempt_at = now + _retry_delay(item.attempts)
+    if item.attempts >= max_attempts:
+        item.status = 'failed'
+
+
+def process_file_deletions(batch_size=BULK_DELETE_LIMIT, max_batches=None, max_attempts=5):
+    """
+    Drain the FileDeletion queue with batched bulk-delete calls.
+    Returns the number of files confirmed deleted.
+    """
+    from django.core.files.storage import default_storage
+    from django.utils import timezone
+    from .models import FileDeletion
+
+    backend = getattr(default_storage, 'backend', None)
+    if not isinstance(backend, MediaBackend):
+        return 0
+
+    batch_size = min(batch_size, BULK_DELETE_LIMIT)
+    deleted_total = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            batch = list(
+                FileDeletion.objects.select_for_update(skip_locked=True)
+                .filter(status='pending', attempts__lt=max_attempts, next_attempt_at__lte=timezone.now())
+                .order_by('created_at')[:batch_size]
+            )
+            if not batch:
+                break
+            batches += 1
+            now = timezone.now()
+
+            # Rows queued without a fileId (legacy uploads) are resolved by path
+            unresolved = set()
+            for item in batch:
+                if not item.file_id and settings.DEBUG and item.name and FileSystemStorage().exists(item.name):
+                    # Fallback uploads recorded before LOCAL_FILE_ID existed
+                    item.file_id = LOCAL_FILE_ID
+                if item.file_id == LOCAL_FILE_ID:
+                    # Written to local disk by the development upload fallback
+                    try:
+                        FileSystemStorage().delete(item.name)
+                    except Exception as e:
+                        _retry_later(item, f"Could not delete local file: {e}", now, max_attempts)
+                        unresolved.add(item.pk)
+                    else:
+                        item.status = 'deleted'
+                        item.processed_at = now
+                    continue
+                if not item.file_id and item.name:
+                    try:
+                        item.file_id = backend.resolve_file_id(item.name)
+                    except Exception as e:
+                        # Lookup failed, not "no such file" - keep the row and retry later
+                        _retry_later(item, f"Could not resolve fileId: {e}", now, max_attempts)
+                        unresolved.add(item.pk)
+                        continue
+                    if not item.file_id:
+                        # Nothing on ImageKit under that path - treat as already gone
+                        item.status = 'deleted'
+                        item.processed_at = now
+
+            to_delete = [item for item in batch if item.status == 'pending' and item.pk not in unresolved]
+            confirmed = set()
+            error = ''
+            if to_delete:
+                try:
+                    confirmed = backend.bulk_delete({item.file_id for item in to_delete})
+                except Exception as e:
+                    error = str(e)
+                    logger.error(f"ImageKit bulk delete failed: {e}")
+
+            for item in batch:
+                item.updated_at = now
+            for item in to_delete:
+                if item.file_id in confirmed:
+                    item.attempts += 1
+                    item.status = 'deleted'
+                    item.processed_at = now
+                    item.last_error = ''
+                else:
+                    _retry_later(item, error or 'Not confirmed by ImageKit', now, max_attempts)
+            deleted_total += len(confirmed)
+
+            FileDeletion.objects.bulk_update(
+                batch, ['file_id', 'status', 'attempts', 'next_attempt_at', 'last_error', 'processed_at', 'updated_at']
+            )
+            if error:
+                # Provider is failing - stop and let the next sweep retry
+                break
+
+    return deleted_total
@@ -0,0 +1,168 @@
+"""
+Surrogate keys for Skyline Ghana Constructions
+Public pages are tagged with the content they show (project:<id>,
+service-category:<id>, blog-post-list, site-settings, ...) in a Surrogate-Key
+header, so a CDN can keep them for a long time. When a row changes, the keys it
+affects are purged through the configured purger (settings.SURROGATE_PURGER).
+"""
+
+import json
+import logging
+import re
+import threading
+import urllib.request
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# One key for the whole model rather than per row: it is on every page
+SINGLETON_MODELS = {'core.SiteSettings'}
+
+# Models whose rows appear on public pages; saves/deletes purge their keys
+PURGE_MODELS = (
+    'core.SiteSettings',
+    'core.HomepageCarouselImage',
+    'core.AboutSectionImage',
+    'core.Testimonial',
+    'core.TeamMember',
+    'projects.Project',
+    'projects.ProjectImage',
+    'projects.ProjectCategory',
+    'projects.ProjectTag',
+    'services.Service',
+    'services.ServiceCategory',
+    'services.ServiceImage',
+    'services.ServiceHighlight',
+    'services.ServicePageImage',
+    'blog.BlogPost',
+    'blog.BlogCategory',
+    'blog.BlogTag',
+    'blog.BlogComment',
+    'careers.JobPosition',
+    'careers.Department',
+    'careers.CareerPageContent',
+)
+
+
+def model_key(model):
+    """Kebab-case model name: ServiceCategory -> service-category"""
+    return re.sub(r'(?<!^)(?=[A-Z])', '-', model._meta.object_name).lower()
+
+
+def list_key(model):
+    """Key carried by pages listing rows of model"""
+    return f'{model_key(model)}-list'
+
+
+def surrogate_key(instance):
+    """Key carried by pages showing this row"""
+    if instance._meta.label in SINGLETON_MODELS:
+        return model_key(type(instance))
+    return f'{model_key(type(instance))}:{instance.pk}'
+
+
+def keys_for_instance(instance):
+    """Keys to purge when a row changes: itself, its model's lists and its parents"""
+    keys = {surrogate_key(instance), list_key(type(instance))}
+    for field in instance._meta.concrete_fields:
+        if not isinstance(field, models.ForeignKey):
+            continue
+        remote = field.remote_field.model
+        value = getattr(instance, field.attname)
+        if value is None or remote._meta.label not in PURGE_MODELS or remote._meta.label in SINGLETON_MODELS:
+            continue
+        keys.add(f'{model_key(remote)}:{value}')
+    return keys
+
+
+def add_surrogate_keys(request, *keys):
+    """Tag the response to this request (written by SurrogateKeyMiddleware)"""
+    if not hasattr(request, 'surrogate_keys'):
+        request.surrogate_keys = set()
+    request.surrogate_keys.update(key for key in keys if key)
+
+
+class BasePurger:
+    """Purges cached responses by surrogate key"""
+
+    def purge(self, keys):
+        raise NotImplementedError
+
+
+class NullPurger(BasePurger):
+    """No CDN in front of the app"""
+
+    def purge(self, keys):
+        pass
+
+
+class LocalPurger(BasePurger):
+    """Records purged keys in memory; stand-in for a CDN in tests and development"""
+
+    purged = []
+    _lock = threading.Lock()
+
+    def purge(self, keys):
+        with self._lock:
+            self.purged.extend(sorted(keys))
+        logger.info(f"Purged surrogate keys: {' '.join(sorted(keys))}")
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls.purged.clear()
+
+
+class HTTPPurger(BasePurger):
+    """
+    POST {"surrogate_keys": [...]} to SURROGATE_PURGE_URL, the batch purge
+    format used by Fastly (other CDNs can sit behind a small adapter)
+    """
+
+    def purge(self, keys):
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        token = getattr(settings, 'SURROGATE_PURGE_TOKEN', '')
+        if token:
+            headers[getattr(settings, 'SURROGATE_PURGE_TOKEN_HEADER', 'Fastly-Key')] = token
+        request = urllib.request.Request(
+            settings.SURROGATE_PURGE_URL,
+            data=json.dumps({'surrogate_keys': sorted(keys)}).encode('utf-8'),
+            headers=headers,
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            response.read()
+
+
+_purger = None
+
+
+def get_purger():
+    global _purger
+    if _purger is None:
+        _purger = import_string(getattr(settings, 'SURROGATE_PURGER', 'core.surrogate.NullPurger'))()
+    return _purger
+
+
+def purge_surrogate_keys(keys):
+    """Background step scheduled by core.signals"""
+    try:
+        get_purger().purge(set(keys))
+    except Exception as e:
+        logger.warning(f"Surrogate key purge failed for {' '.join(sorted(keys))}: {e}")
+
+
+def schedule_purge(keys):
+    """Purge keys once the current transaction commits; for bulk updates, which send no signals"""
+    from .tasks import run_in_background
+
+    if keys:
+        run_in_background(purge_surrogate_keys, sorted(keys))
+
+
+def purge_models():
+    return [apps.get_model(label) for label in PURGE_MODELS]
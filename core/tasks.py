@@ -0,0 +1,93 @@
+"""
+Lightweight in-process background tasks for Skyline Ghana Constructions
+There is no task broker in this deployment, so slow work (remote storage
+calls, batched sends) is handed to a small thread pool once the current
+transaction commits. Every queue fed this way is persisted in the database
+and can also be drained by a management command, so nothing is lost when a
+gunicorn worker is recycled. Retries are picked up by a periodic sweep
+(PERIODIC_TASKS) that each worker starts after forking.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Create the pool lazily so it is never inherited across a gunicorn fork"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+                    thread_name_prefix='skyline-bg',
+                )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background task {getattr(func, '__name__', func)} failed")
+    finally:
+        close_old_connections()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) on the background pool after the current
+    transaction commits. Set BACKGROUND_TASKS_EAGER = True to run inline.
+    """
+    def submit():
+        if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+            _run(func, args, kwargs)
+        else:
+            _get_executor().submit(_run, func, args, kwargs)
+
+    transaction.on_commit(submit)
+
+
+_periodic_thread = None
+
+
+def _run_periodic(schedule):
+    # Random first run so workers and machines do not sweep in lockstep
+    next_run = {func: time.monotonic() + random.uniform(0, interval) for func, interval in schedule}
+    while True:
+        for func, interval in schedule:
+            if time.monotonic() >= next_run[func]:
+                _run(func, (), {})
+                next_run[func] = time.monotonic() + interval
+        time.sleep(max(min(next_run.values()) - time.monotonic(), 1))
+
+
+def start_periodic_tasks():
+    """
+    Start a daemon thread running each PERIODIC_TASKS entry ({dotted path:
+    seconds}) on its interval, so queued retries run even when nothing new
+    is queued. Called from gunicorn's post_fork; sweeps claim rows with
+    skip_locked, so every worker running them is safe.
+    """
+    global _periodic_thread
+    tasks = getattr(settings, 'PERIODIC_TASKS', {})
+    if _periodic_thread is not None or not tasks:
+        return
+    schedule = [(import_string(path), interval) for path, interval in tasks.items()]
+    _periodic_thread = threading.Thread(
+        target=_run_periodic, args=(schedule,), name='skyline-periodic', daemon=True,
+    )
+    _periodic_thread.start()
@@ -1,4 +1,9 @@
+import json
+import threading
+from collections import OrderedDict
+
 from django import template
+from django.core.cache import cache
 from django.utils.safestring import mark_safe
 from django.conf import settings
 
@@ -50,7 +55,14 @@ def seo_meta(context, obj=None):
     }
     
     # Override with object data if provided
-    if obj and hasattr(obj, 'get_meta_title'):
+    if obj and hasattr(obj, 'get_seo_data'):
+        # Materialised on save (SEOMixin.seo_data) - no ORM or storage work here
+        seo_data = obj.get_seo_data()
+        meta_data.update({
+            key: seo_data.get(key) or meta_data[key]
+            for key in ('title', 'description', 'keywords', 'og_title', 'og_description', 'og_image')
+        })
+    elif obj and hasattr(obj, 'get_meta_title'):
         meta_data.update({
             'title': obj.get_meta_title(),
             'description': obj.get_meta_description(),
@@ -73,190 +85,221 @@ def seo_meta(context, obj=None):
     return meta_data
 
 
-@register.simple_tag(takes_context=True)
-def structured_data(context, obj=None, obj_type='WebPage'):
-    """
-    Generate JSON-LD structured data
-    Usage: {% structured_data object "Article" %}
-    """
-    site_settings = context.get('site_settings')
+# Per-worker memo of rendered JSON-LD, keyed by object version and settings version
+JSONLD_LRU_SIZE = 512
+# Site-wide blocks are also shared across workers through the cache
+JSONLD_SHARED_TIMEOUT = 60 * 60 * 24
 
-    data = {
-        "@context": "https://schema.org",
-        "@type": obj_type,
-    }
+_jsonld_lru = OrderedDict()
+_jsonld_lock = threading.Lock()
 
-    # Add construction company specific data for homepage
-    if obj_type == 'WebPage' and not obj:
-        data.update({
-            "@type": ["Organization", "LocalBusiness", "GeneralContractor"],
-            "name": "Skyline Ghana Constructions",
-            "alternateName": ["Skyline GH", "Skylink GH", "Skylink", "SkylineGH", "Skyline Ghana"],
-            "url": "https://skylinegh.com",
-            "logo": site_settings.logo.url if site_settings and hasattr(site_settings, 'logo') and site_settings.logo else "https://skylinegh.com/static/images/skyline-logo.png",
-            "image": site_settings.logo.url if site_settings and hasattr(site_settings, 'logo') and site_settings.logo else "https://skylinegh.com/static/images/skyline-logo-og.png",
-            "description": "Leading construction company in Ghana specializing in residential, commercial, and industrial building projects. Expert contractors delivering quality construction services across Accra and Ghana.",
-            "slogan": "Building Dreams, Creating Futures",
-            "foundingDate": "2015",
-            "keywords": "skylinegh, skyline GH, Skylink GH, Skylink, construction Ghana, building contractors Ghana",
-            "address": {
-                "@type": "PostalAddress",
-                "streetAddress": site_settings.address_line_1 if site_settings and hasattr(site_settings, 'address_line_1') and site_settings.address_line_1 else "123 Independence Avenue",
-                "addressLocality": site_settings.city if site_settings and hasattr(site_settings, 'city') and site_settings.city else "East Legon",
-                "addressRegion": site_settings.region if site_settings and hasattr(site_settings, 'region') and site_settings.region else "Greater Accra",
-                "postalCode": site_settings.postal_code if site_settings and hasattr(site_settings, 'postal_code') and site_settings.postal_code else "GA-123-4567",
-                "addressCountry": "GH"
+
+def _lru_get(key):
+    with _jsonld_lock:
+        value = _jsonld_lru.get(key)
+        if value is not None:
+            _jsonld_lru.move_to_end(key)
+        return value
+
+
+def _lru_set(key, value):
+    with _jsonld_lock:
+        _jsonld_lru[key] = value
+        _jsonld_lru.move_to_end(key)
+        while len(_jsonld_lru) > JSONLD_LRU_SIZE:
+            _jsonld_lru.popitem(last=False)
+
+
+def _organization_data(site_settings):
+    """Organization/LocalBusiness block for the homepage"""
+    return {
+        "@type": ["Organization", "LocalBusiness", "GeneralContractor"],
+        "name": "Skyline Ghana Constructions",
+        "alternateName": ["Skyline GH", "Skylink GH", "Skylink", "SkylineGH", "Skyline Ghana"],
+        "url": "https://skylinegh.com",
+        "logo": site_settings.logo.url if site_settings and hasattr(site_settings, 'logo') and site_settings.logo else "https://skylinegh.com/static/images/skyline-logo.png",
+        "image": site_settings.logo.url if site_settings and hasattr(site_settings, 'logo') and site_settings.logo else "https://skylinegh.com/static/images/skyline-logo-og.png",
+        "description": "Leading construction company in Ghana specializing in residential, commercial, and industrial building projects. Expert contractors delivering quality construction services across Accra and Ghana.",
+        "slogan": "Building Dreams, Creating Futures",
+        "foundingDate": "2015",
+        "keywords": "skylinegh, skyline GH, Skylink GH, Skylink, construction Ghana, building contractors Ghana",
+        "address": {
+            "@type": "PostalAddress",
+            "streetAddress": site_settings.address_line_1 if site_settings and hasattr(site_settings, 'address_line_1') and site_settings.address_line_1 else "123 Independence Avenue",
+            "addressLocality": site_settings.city if site_settings and hasattr(site_settings, 'city') and site_settings.city else "East Legon",
+            "addressRegion": site_settings.region if site_settings and hasattr(site_settings, 'region') and site_settings.region else "Greater Accra",
+            "postalCode": site_settings.postal_code if site_settings and hasattr(site_settings, 'postal_code') and site_settings.postal_code else "GA-123-4567",
+            "addressCountry": "GH"
+        },
+        "geo": {
+            "@type": "GeoCoordinates",
+            "latitude": "5.6037",
+            "longitude": "-0.1870"
+        },
+        "contactPoint": [{
+            "@type": "ContactPoint",
+            "telephone": site_settings.phone_primary if site_settings and hasattr(site_settings, 'phone_primary') and site_settings.phone_primary else "+233-24-123-4567",
+            "contactType": "customer service",
+            "email": site_settings.email_primary if site_settings and hasattr(site_settings, 'email_primary') and site_settings.email_primary else "info@skylinegh.com",
+            "availableLanguage": ["English"],
+            "hoursAvailable": {
+                "@type": "OpeningHoursSpecification",
+                "dayOfWeek": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+                "opens": "08:00",
+                "closes": "18:00"
+            }
+        }],
+        "areaServed": [
+            {
+                "@type": "City",
+                "name": "Accra"
+            },
+            {
+                "@type": "City",
+                "name": "Kumasi"
+            },
+            {
+                "@type": "City",
+                "name": "Tamale"
             },
-            "geo": {
+            {
+                "@type": "City",
+                "name": "Cape Coast"
+            },
+            {
+                "@type": "Country",
+                "name": "Ghana"
+            }
+        ],
+        "serviceArea": {
+            "@type": "GeoCircle",
+            "geoMidpoint": {
                 "@type": "GeoCoordinates",
                 "latitude": "5.6037",
                 "longitude": "-0.1870"
             },
-            "contactPoint": [{
-                "@type": "ContactPoint",
-                "telephone": site_settings.phone_primary if site_settings and hasattr(site_settings, 'phone_primary') and site_settings.phone_primary else "+233-24-123-4567",
-                "contactType": "customer service",
-                "email": site_settings.email_primary if site_settings and hasattr(site_settings, 'email_primary') and site_settings.email_primary else "info@skylinegh.com",
-                "availableLanguage": ["English"],
-                "hoursAvailable": {
-                    "@type": "OpeningHoursSpecification",
-                    "dayOfWeek": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
-                    "opens": "08:00",
-                    "closes": "18:00"
-                }
-            }],
-            "areaServed": [
+            "geoRadius": "200000"
+        },
+        "priceRange": "$$",
+        "paymentAccepted": ["Cash", "Credit Card", "Bank Transfer", "Mobile Money"],
+        "currenciesAccepted": "GHS",
+        "openingHours": "Mo-Fr 08:00-18:00, Sa 09:00-16:00",
+        "aggregateRating": {
+            "@type": "AggregateRating",
+            "ratingValue": "4.8",
+            "reviewCount": "127",
+            "bestRating": "5",
+            "worstRating": "1"
+        },
+        "hasOfferCatalog": {
+            "@type": "OfferCatalog",
+            "name": "Construction Services",
+            "itemListElement": [
                 {
-                    "@type": "City",
-                    "name": "Accra"
-                },
-                {
-                    "@type": "City",
-                    "name": "Kumasi"
+                    "@type": "Offer",
+                    "itemOffered": {
+                        "@type": "Service",
+                        "name": "Residential Construction",
+                        "description": "Custom home building and residential construction services"
+                    }
                 },
                 {
-                    "@type": "City",
-                    "name": "Tamale"
+                    "@type": "Offer",
+                    "itemOffered": {
+                        "@type": "Service",
+                        "name": "Commercial Construction",
+                        "description": "Office buildings, retail spaces, and commercial construction"
+                    }
                 },
                 {
-                    "@type": "City",
-                    "name": "Cape Coast"
+                    "@type": "Offer",
+                    "itemOffered": {
+                        "@type": "Service",
+                        "name": "Industrial Construction",
+                        "description": "Warehouses, factories, and industrial facility construction"
+                    }
                 },
                 {
-                    "@type": "Country",
-                    "name": "Ghana"
+                    "@type": "Offer",
+                    "itemOffered": {
+                        "@type": "Service",
+                        "name": "Renovation Services",
+                        "description": "Building renovation and remodeling services"
+                    }
                 }
-            ],
-            "serviceArea": {
-                "@type": "GeoCircle",
-                "geoMidpoint": {
-                    "@type": "GeoCoordinates",
-                    "latitude": "5.6037",
-                    "longitude": "-0.1870"
-                },
-                "geoRadius": "200000"
-            },
-            "priceRange": "$$",
-            "paymentAccepted": ["Cash", "Credit Card", "Bank Transfer", "Mobile Money"],
-            "currenciesAccepted": "GHS",
-            "openingHours": "Mo-Fr 08:00-18:00, Sa 09:00-16:00",
-            "aggregateRating": {
-                "@type": "AggregateRating",
-                "ratingValue": "4.8",
-                "reviewCount": "127",
-                "bestRating": "5",
-                "worstRating": "1"
-            },
-            "hasOfferCatalog": {
-                "@type": "OfferCatalog",
-                "name": "Construction Services",
-                "itemListElement": [
-                    {
-                        "@type": "Offer",
-                        "itemOffered": {
-                            "@type": "Service",
-                            "name": "Residential Construction",
-                            "description": "Custom home building and residential construction services"
-                        }
-                    },
-                    {
-                        "@type": "Offer",
-                        "itemOffered": {
-                            "@type": "Service",
-                            "name": "Commercial Construction",
-                            "description": "Office buildings, retail spaces, and commercial construction"
-                        }
-                    },
-                    {
-                        "@type": "Offer",
-                        "itemOffered": {
-                            "@type": "Service",
-                            "name": "Industrial Construction",
-                            "description": "Warehouses, factories, and industrial facility construction"
-                        }
-                    },
-                    {
-                        "@type": "Offer",
-                        "itemOffered": {
-                            "@type": "Service",
-                            "name": "Renovation Services",
-                            "description": "Building renovation and remodeling services"
-                        }
+            ]
+        },
+        "sameAs": [
+            url for url in [
+                site_settings.facebook_url if site_settings and hasattr(site_settings, 'facebook_url') and site_settings.facebook_url else None,
+                site_settings.twitter_url if site_settings and hasattr(site_settings, 'twitter_url') and site_settings.twitter_url else None,
+                site_settings.instagram_url if site_settings and hasattr(site_settings, 'instagram_url') and site_settings.instagram_url else None,
+                site_settings.linkedin_url if site_settings and hasattr(site_settings, 'linkedin_url') and site_settings.linkedin_url else None,
+                # Fallback URLs if no admin settings
+                "https://www.facebook.com/skylineghana" if not (site_settings and hasattr(site_settings, 'facebook_url') and site_settings.facebook_url) else None,
+                "https://www.linkedin.com/company/skyline-ghana" if not (site_settings and hasattr(site_settings, 'linkedin_url') and site_settings.linkedin_url) else None,
+                "https://www.instagram.com/skylineghana" if not (site_settings and hasattr(site_settings, 'instagram_url') and site_settings.instagram_url) else None,
+            ] if url is not None
+        ],
+        "serviceArea": {
+            "@type": "Country",
+            "name": "Ghana"
+        },
+        "hasOfferCatalog": {
+            "@type": "OfferCatalog",
+            "name": "Construction Services",
+            "itemListElement": [
+                {
+                    "@type": "Offer",
+                    "itemOffered": {
+                        "@type": "Service",
+                        "name": "Residential Construction",
+                        "description": "Custom home building and residential construction services"
                     }
-                ]
-            },
-            "sameAs": [
-                url for url in [
-                    site_settings.facebook_url if site_settings and hasattr(site_settings, 'facebook_url') and site_settings.facebook_url else None,
-                    site_settings.twitter_url if site_settings and hasattr(site_settings, 'twitter_url') and site_settings.twitter_url else None,
-                    site_settings.instagram_url if site_settings and hasattr(site_settings, 'instagram_url') and site_settings.instagram_url else None,
-                    site_settings.linkedin_url if site_settings and hasattr(site_settings, 'linkedin_url') and site_settings.linkedin_url else None,
-                    # Fallback URLs if no admin settings
-                    "https://www.facebook.com/skylineghana" if not (site_settings and hasattr(site_settings, 'facebook_url') and site_settings.facebook_url) else None,
-                    "https://www.linkedin.com/company/skyline-ghana" if not (site_settings and hasattr(site_settings, 'linkedin_url') and site_settings.linkedin_url) else None,
-                    "https://www.instagram.com/skylineghana" if not (site_settings and hasattr(site_settings, 'instagram_url') and site_settings.instagram_url) else None,
-                ] if url is not None
-            ],
-            "serviceArea": {
-                "@type": "Country",
-                "name": "Ghana"
-            },
-            "hasOfferCatalog": {
-                "@type": "OfferCatalog",
-                "name": "Construction Services",
-                "itemListElement": [
-                    {
-                        "@type": "Offer",
-                        "itemOffered": {
-                            "@type": "Service",
-                            "name": "Residential Construction",
-                            "description": "Custom home building and residential construction services"
-                        }
-                    },
-                    {
-                        "@type": "Offer",
-                        "itemOffered": {
-                            "@type": "Service",
-                            "name": "Commercial Construction",
-                            "description": "Office buildings, retail spaces, and commercial construction"
-                        }
+                },
+                {
+                    "@type": "Offer",
+                    "itemOffered": {
+                        "@type": "Service",
+                        "name": "Commercial Construction",
+                        "description": "Office buildings, retail spaces, and commercial construction"
                     }
-                ]
-            }
-        })
+                }
+            ]
+        }
+    }
+
+
+def _build_structured_data(site_settings, obj, obj_type):
+    data = {
+        "@context": "https://schema.org",
+        "@type": obj_type,
+    }
+
+    # Add construction company specific data for homepage
+    if obj_type == 'WebPage' and not obj:
+        data.update(_organization_data(site_settings))
 
     if obj:
-        if hasattr(obj, 'get_meta_title'):
-            data["name"] = obj.get_meta_title()
-        if hasattr(obj, 'get_meta_description'):
-            data["description"] = obj.get_meta_description()
+        seo_data = obj.get_seo_data() if hasattr(obj, 'get_seo_data') else None
+        if seo_data:
+            data["name"] = seo_data['title']
+            data["description"] = seo_data['description']
+        else:
+            if hasattr(obj, 'get_meta_title'):
+                data["name"] = obj.get_meta_title()
+            if hasattr(obj, 'get_meta_description'):
+                data["description"] = obj.get_meta_description()
         if hasattr(obj, 'created_at'):
             data["datePublished"] = obj.created_at.isoformat()
         if hasattr(obj, 'updated_at'):
             data["dateModified"] = obj.updated_at.isoformat()
 
         # Add image if available
-        if hasattr(obj, 'featured_image') and obj.featured_image:
+        if seo_data:
+            if seo_data.get('og_image'):
+                data["image"] = seo_data['og_image']
+        elif hasattr(obj, 'featured_image') and obj.featured_image:
             data["image"] = obj.featured_image.url
         elif hasattr(obj, 'image') and obj.image:
             data["image"] = obj.image.url
@@ -267,9 +310,48 @@ def structured_data(context, obj=None, obj_type='WebPage'):
         "name": "Skyline Ghana Constructions",
         "url": "https://skylinegh.com"
     }
-    
-    import json
-    return mark_safe(f'<script type="application/ld+json">{json.dumps(data, indent=2)}</script>')
+
+    return mark_safe(f'<script type="application/ld+json">{json.dumps(data, separators=(",", ":"))}</script>')
+
+
+def _structured_data_key(site_settings, obj, obj_type):
+    """(obj_type, model, pk, updated_at, settings_version), or None if obj can't be versioned"""
+    settings_version = getattr(site_settings, 'version', 0) if site_settings else 0
+    if not obj:
+        return (obj_type, None, None, None, settings_version)
+    updated_at = getattr(obj, 'updated_at', None)
+    if getattr(obj, 'pk', None) is None or updated_at is None:
+        return None
+    return (obj_type, obj._meta.label_lower, obj.pk, updated_at.timestamp(), settings_version)
+
+
+@register.simple_tag(takes_context=True)
+def structured_data(context, obj=None, obj_type='WebPage'):
+    """
+    Generate JSON-LD structured data
+    Usage: {% structured_data object "Article" %}
+    Output is memoised per worker; the site-wide block is also shared via the cache.
+    """
+    site_settings = context.get('site_settings')
+    key = _structured_data_key(site_settings, obj, obj_type)
+    if key is None:
+        return _build_structured_data(site_settings, obj, obj_type)
+
+    html = _lru_get(key)
+    if html is not None:
+        return html
+
+    shared_key = None
+    if obj is None:
+        shared_key = 'jsonld:' + ':'.join(str(part) for part in key)
+        html = cache.get(shared_key)
+    if html is None:
+        html = _build_structured_data(site_settings, obj, obj_type)
+        if shared_key:
+            cache.set(shared_key, str(html), JSONLD_SHARED_TIMEOUT)
+    html = mark_safe(html)
+    _lru_set(key, html)
+    return html
 
 
 @register.simple_tag
@@ -0,0 +1,48 @@
+"""
+Template warm-up for Skyline Ghana Constructions
+Compiles every project template into the cached loader so the first request
+to each page after a worker (re)start does not pay the parse cost. Called
+from gunicorn's post_fork hook (gunicorn.conf.py) and by benchmark_templates.
+"""
+
+import logging
+import os
+import time
+
+from django.template import engines
+
+logger = logging.getLogger(__name__)
+
+
+def iter_template_names(engine):
+    """Yield the names of all .html/.txt/.xml templates under the engine's DIRS"""
+    for directory in engine.dirs:
+        directory = str(directory)
+        for root, _dirs, files in os.walk(directory):
+            for filename in sorted(files):
+                if filename.endswith(('.html', '.txt', '.xml')):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_template_cache():
+    """
+    Load every project template through the configured loaders.
+    Returns (compiled, failed, seconds).
+    """
+    started = time.perf_counter()
+    compiled = failed = 0
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None:
+            continue
+        for name in iter_template_names(engine):
+            try:
+                engine.get_template(name)
+                compiled += 1
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Template warm-up failed for {name}: {e}")
+    duration = time.perf_counter() - started
+    logger.info(f"Warmed {compiled} templates in {duration:.2f}s ({failed} failed)")
+    return compiled, failed, duration
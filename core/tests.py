@@ -1,3 +1,296 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from .cache import _Entry, _flight_locks
+from .models import FileDeletion, RelatedItem, StoredFile
+from .related import rebuild_related, refresh_related
+from .storage import LOCAL_FILE_ID, LocalMediaBackend, LocalStandInStorage, process_file_deletions
+
+LOCAL_STORAGES = {
+    'default': {'BACKEND': 'core.storage.LocalStandInStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Dedup, refcounts and the deletion queue, on the local stand-in backend"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(
+            STORAGES=LOCAL_STORAGES,
+            MEDIA_ROOT=self.media_root,
+            LOCAL_MEDIA_BACKEND_ROOT=self.media_root,
+            LOCAL_MEDIA_BACKEND_LATENCY=0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.storage = LocalStandInStorage()
+
+    def save(self, name, data=b'same bytes'):
+        return self.storage.save(name, ContentFile(data))
+
+    def test_duplicate_upload_shares_the_stored_file(self):
+        first = self.save('a.txt')
+        second = self.save('b.txt')
+
+        self.assertEqual(first, second)
+        stored = StoredFile.objects.get(name=first)
+        self.assertEqual(stored.ref_count, 2)
+        self.assertEqual(StoredFile.objects.count(), 1)
+
+    def test_different_content_is_stored_separately(self):
+        self.assertNotEqual(self.save('a.txt', b'one'), self.save('b.txt', b'two'))
+        self.assertEqual(StoredFile.objects.count(), 2)
+
+    def test_deleting_one_of_two_references_keeps_the_file(self):
+        name = self.save('a.txt')
+        self.save('b.txt')
+
+        self.storage.delete(name)
+
+        self.assertEqual(StoredFile.objects.get(name=name).ref_count, 1)
+        self.assertFalse(FileDeletion.objects.exists())
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+
+    def test_last_delete_queues_a_file_deletion(self):
+        name = self.save('a.txt')
+
+        self.storage.delete(name)
+
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+        deletion = FileDeletion.objects.get()
+        self.assertEqual((deletion.name, deletion.file_id, deletion.status), (name, name, 'pending'))
+
+    def test_processing_the_queue_deletes_the_file(self):
+        name = self.save('a.txt')
+        self.storage.delete(name)
+
+        self.assertEqual(process_file_deletions(), 1)
+
+        self.assertEqual(FileDeletion.objects.get().status, 'deleted')
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, name)))
+
+    def test_failed_bulk_delete_keeps_the_row_pending_with_backoff(self):
+        name = self.save('a.txt')
+        self.storage.delete(name)
+
+        before = timezone.now()
+        with mock.patch.object(LocalMediaBackend, 'bulk_delete', side_effect=Exception('provider down')):
+            self.assertEqual(process_file_deletions(), 0)
+
+        deletion = FileDeletion.objects.get()
+        self.assertEqual(deletion.status, 'pending')
+        self.assertEqual(deletion.attempts, 1)
+        self.assertEqual(deletion.last_error, 'provider down')
+        self.assertGreater(deletion.next_attempt_at, before)
+        # Not due yet, so the next sweep leaves it alone
+        with mock.patch.object(LocalMediaBackend, 'bulk_delete') as bulk_delete:
+            process_file_deletions()
+        bulk_delete.assert_not_called()
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+
+
+    def test_local_fallback_files_are_deleted_from_disk(self):
+        from django.core.files.storage import FileSystemStorage
+
+        name = FileSystemStorage().save('fallback.txt', ContentFile(b'saved while ImageKit was down'))
+        FileDeletion.objects.create(name=name, file_id=LOCAL_FILE_ID)
+
+        with mock.patch.object(LocalMediaBackend, 'bulk_delete') as bulk_delete:
+            process_file_deletions()
+
+        bulk_delete.assert_not_called()
+        self.assertEqual(FileDeletion.objects.get().status, 'deleted')
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, name)))
+
+
+TIERED_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'tiered': {
+        'BACKEND': 'core.cache.TieredCache',
+        'LOCATION': 'tests-tiered',
+        'TIMEOUT': 300,
+        'OPTIONS': {'SHARED_ALIAS': 'tiered-shared', 'LOCAL_TIMEOUT': 5, 'LOCK_TIMEOUT': 2},
+    },
+    'tiered-shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-tiered-shared'},
+}
+
+
+@override_settings(CACHES=TIERED_CACHES)
+class TieredCacheTests(SimpleTestCase):
+    """TieredCache over two locmem caches"""
+
+    def setUp(self):
+        self.cache = caches['tiered']
+        self.shared = caches['tiered-shared']
+        self.cache.clear()
+        self.cache.reset_stats()
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+        start = threading.Barrier(8)
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        def read():
+            start.wait()
+            results.append(caches['tiered'].get_or_set('key', compute, 60))
+
+        # No early refresh, so only the miss can trigger a compute
+        with mock.patch('core.cache.random.random', return_value=1.0):
+            threads = [threading.Thread(target=read) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 8)
+
+    def test_flight_locks_are_dropped_after_use(self):
+        with mock.patch('core.cache.random.random', return_value=1.0):
+            self.cache.get_or_set('key', lambda: 'value', 60)
+        with self.assertRaises(ZeroDivisionError):
+            self.cache.get_or_set('failing', lambda: 1 / 0, 60)
+
+        self.assertFalse([key for key in _flight_locks if key[0] == 'tests-tiered'])
+        # The shared compute lock is released even when the compute fails
+        self.assertIsNone(self.shared.get('failing:lock'))
+
+    def test_entry_close_to_expiry_is_refreshed_early(self):
+        self.cache.set('key', _Entry('old', time.time() + 1, 0.5), 60)
+
+        # jitter = -delta * log(0.1) = 1.15s, past the expiry 1s away
+        with mock.patch('core.cache.random.random', return_value=0.1):
+            self.assertEqual(self.cache.get_or_set('key', lambda: 'new', 60), 'new')
+        self.assertEqual(self.cache.process_stats()['early_refreshes'], 1)
+        self.assertEqual(self.shared.get('key').value, 'new')
+
+    def test_entry_far_from_expiry_is_served(self):
+        self.cache.set('key', _Entry('old', time.time() + 60, 0.5), 60)
+
+        with mock.patch('core.cache.random.random', return_value=0.1):
+            self.assertEqual(self.cache.get_or_set('key', lambda: 'new', 60), 'old')
+        self.assertEqual(self.cache.process_stats()['early_refreshes'], 0)
+
+    def test_shared_value_fills_the_local_tier(self):
+        self.shared.set('key', 'value')
+
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.shared.delete('key')
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.cache.process_stats()['local_hits'], 1)
+
+    def test_delete_reaches_the_shared_tier(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(self.shared.get('key'), 'value')
+
+        self.cache.delete('key')
+
+        self.assertIsNone(self.shared.get('key'))
+        self.assertIsNone(self.cache.get('key'))
+
+
+class RelatedContentRefreshTests(TestCase):
+    """Incremental refresh rules of core.related, on projects"""
+    label = 'projects.Project'
+
+    def setUp(self):
+        from projects.models import ProjectCategory, ProjectTag
+        from projects.related import ProjectRelated
+
+        limit = mock.patch.object(ProjectRelated, 'limit', 2)
+        limit.start()
+        self.addCleanup(limit.stop)
+        self.houses = ProjectCategory.objects.create(name='Houses')
+        self.roads = ProjectCategory.objects.create(name='Roads')
+        self.tag = ProjectTag.objects.create(name='Concrete')
+        self.first, self.second, self.third = (self.project(f'House {n}') for n in range(3))
+        rebuild_related(self.label)
+
+    def project(self, title, category=None, tags=()):
+        from projects.models import Project
+
+        project = Project.objects.create(
+            title=title, description=title, short_description=title, location='Accra',
+            project_type=category or self.houses,
+        )
+        project.tags.set(tags)
+        return project
+
+    def neighbours(self, project):
+        return list(
+            RelatedItem.objects.filter(model_name='project', source_id=project.pk)
+            .order_by('rank').values_list('target_id', flat=True)
+        )
+
+    def test_new_row_enters_a_full_list(self):
+        self.first.tags.add(self.tag)
+        self.assertEqual(len(self.neighbours(self.first)), 2)
+
+        newcomer = self.project('Concrete house', tags=[self.tag])
+        refresh_related(self.label, newcomer.pk)
+
+        # Same category and a shared tag outrank the category-only neighbours
+        self.assertEqual(self.neighbours(self.first)[0], newcomer.pk)
+        self.assertEqual(len(self.neighbours(self.first)), 2)
+        self.assertIn(self.first.pk, self.neighbours(newcomer))
+
+    def test_row_dropping_out_of_a_full_list_recomputes_it(self):
+        self.first.tags.add(self.tag)
+        newcomer = self.project('Concrete house', tags=[self.tag])
+        refresh_related(self.label, newcomer.pk)
+        self.assertEqual(len(self.neighbours(self.first)), 2)
+
+        newcomer.project_type = self.roads
+        newcomer.save()
+        newcomer.tags.clear()
+        refresh_related(self.label, newcomer.pk)
+
+        # The candidate cut when the newcomer arrived comes back
+        self.assertEqual(sorted(self.neighbours(self.first)), sorted([self.second.pk, self.third.pk]))
+
+    def test_deleted_row_leaves_every_list(self):
+        pk = self.second.pk
+        self.assertTrue(RelatedItem.objects.filter(model_name='project', target_id=pk).exists())
+
+        self.second.delete()
+        refresh_related(self.label, pk)
+
+        self.assertFalse(RelatedItem.objects.filter(model_name='project', target_id=pk).exists())
+        self.assertFalse(RelatedItem.objects.filter(model_name='project', source_id=pk).exists())
+        self.assertEqual(self.neighbours(self.first), [self.third.pk])
+
+    def test_refresh_reads_only_related_rows(self):
+        from projects.related import ProjectRelated
+
+        road = self.project('Road', category=self.roads)
+        loaded = set()
+        original = ProjectRelated.load_features
+
+        def load_features(engine, queryset=None):
+            features = original(engine, queryset)
+            loaded.update(features)
+            return features
+
+        with mock.patch.object(ProjectRelated, 'load_features', load_features):
+            refresh_related(self.label, road.pk)
+
+        # The houses share no tag or category with the road
+        self.assertEqual(loaded, {road.pk})
+        self.assertEqual(self.neighbours(road), [])
@@ -0,0 +1,166 @@
+"""
+Spooled uploads for Skyline Ghana Constructions
+Public forms (job applications) write attachments to local disk and commit
+their row straight away; the remote upload to media storage happens on the
+background pool with retries and backoff. The spool is per-machine disk, so
+each row records its spool host and only that machine uploads it. Rows in
+core.models.PendingUpload are also swept periodically (PERIODIC_TASKS) and
+can be drained with `manage.py process_pending_uploads`.
+"""
+
+import logging
+import socket
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+# Base delay before retrying a failed upload; doubles on every attempt
+RETRY_BASE_DELAY = 30
+MAX_RETRY_DELAY = 60 * 60
+# Uploads stuck in "uploading" this long (worker recycled mid-upload) are retried
+STALE_UPLOAD_AFTER = timedelta(minutes=15)
+
+
+def get_spool_host():
+    """Name of this machine, recorded with every spooled file"""
+    return getattr(settings, 'SPOOL_HOST', '') or socket.gethostname()
+
+
+def get_spool_storage():
+    return FileSystemStorage(location=getattr(settings, 'SPOOL_ROOT', settings.BASE_DIR / 'spool'))
+
+
+def spool_upload(instance, field_name, uploaded_file):
+    """
+    Write uploaded_file to the local spool and queue it for instance.field_name.
+    The instance must already be saved; call inside the request transaction so
+    the queue row commits together with it.
+    """
+    from .models import PendingUpload
+
+    field = instance._meta.get_field(field_name)
+    target_name = field.generate_filename(instance, uploaded_file.name)
+    spool_name = get_spool_storage().save(target_name, uploaded_file)
+
+    pending = PendingUpload.objects.create(
+        app_label=instance._meta.app_label,
+        model_name=instance._meta.model_name,
+        object_id=instance.pk,
+        field_name=field_name,
+        spool_name=spool_name,
+        spool_host=get_spool_host(),
+        target_name=target_name,
+    )
+    run_in_background(process_pending_uploads)
+    return pending
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY))
+
+
+def _claim(batch_size, max_attempts, host):
+    """
+    Mark a batch of due uploads spooled on this host as in progress so
+    concurrent sweeps skip them. Rows queued before hosts were recorded
+    (blank spool_host) may be claimed by any machine.
+    """
+    from .models import PendingUpload
+
+    now = timezone.now()
+    with transaction.atomic():
+        due = PendingUpload.objects.select_for_update(skip_locked=True).filter(
+            Q(status='pending', next_attempt_at__lte=now)
+            | Q(status='uploading', updated_at__lt=now - STALE_UPLOAD_AFTER),
+            Q(spool_host=host) | Q(spool_host=''),
+            attempts__lt=max_attempts,
+        ).order_by('next_attempt_at')[:batch_size]
+        ids = list(due.values_list('id', flat=True))
+        if ids:
+            PendingUpload.objects.filter(id__in=ids).update(status='uploading', updated_at=now)
+    return list(PendingUpload.objects.filter(id__in=ids))
+
+
+def _upload(pending, spool):
+    """Push one spooled file to media storage and point the model field at it"""
+    model = apps.get_model(pending.app_label, pending.model_name)
+
+    if not pending.stored_name:
+        with spool.open(pending.spool_name, 'rb') as fh:
+            pending.stored_name = default_storage.save(pending.target_name, fh)
+        # Record the stored name before touching the model row, so a retry
+        # never uploads the same file twice
+        pending.save(update_fields=['stored_name', 'updated_at'])
+
+    attached = model._default_manager.filter(pk=pending.object_id).update(
+        **{pending.field_name: pending.stored_name}
+    )
+    if not attached:
+        # Row was deleted while the upload was queued
+        default_storage.delete(pending.stored_name)
+        logger.info(f"Discarded upload for deleted {pending.app_label}.{pending.model_name} #{pending.object_id}")
+
+
+def process_pending_uploads(batch_size=20, max_attempts=5):
+    """
+    Upload due spooled files. Returns the number uploaded.
+    Failures are retried with exponential backoff until max_attempts.
+    """
+    spool = get_spool_storage()
+    host = get_spool_host()
+    uploaded = 0
+
+    while True:
+        batch = _claim(batch_size, max_attempts, host)
+        if not batch:
+            break
+
+        for pending in batch:
+            now = timezone.now()
+            try:
+                _upload(pending, spool)
+            except FileNotFoundError:
+                if pending.spool_host == host:
+                    # Spool lost (ephemeral disk replaced) - nothing left to retry
+                    pending.status = 'failed'
+                    pending.last_error = f"Spooled file {pending.spool_name} is missing"
+                    logger.error(pending.last_error)
+                else:
+                    # Legacy row, probably spooled on another machine - leave it to that one
+                    pending.attempts += 1
+                    pending.status = 'failed' if pending.attempts >= max_attempts else 'pending'
+                    pending.next_attempt_at = now + _retry_delay(pending.attempts)
+                    pending.last_error = f"Spooled file {pending.spool_name} is not on {host}"
+                    logger.warning(pending.last_error)
+            except Exception as e:
+                pending.attempts += 1
+                pending.last_error = str(e)
+                pending.status = 'failed' if pending.attempts >= max_attempts else 'pending'
+                pending.next_attempt_at = now + _retry_delay(pending.attempts)
+                logger.warning(f"Upload of {pending.target_name} failed (attempt {pending.attempts}): {e}")
+            else:
+                pending.status = 'uploaded'
+                pending.processed_at = now
+                pending.last_error = ''
+                uploaded += 1
+                try:
+                    spool.delete(pending.spool_name)
+                except OSError as e:
+                    logger.warning(f"Could not remove spooled file {pending.spool_name}: {e}")
+            pending.save(update_fields=[
+                'status', 'attempts', 'last_error', 'next_attempt_at', 'processed_at', 'updated_at',
+            ])
+
+        if len(batch) < batch_size:
+            break
+
+    return uploaded
@@ -12,5 +12,6 @@ urlpatterns = [
     path('privacy-policy/', views.PrivacyPolicyView.as_view(), name='privacy_policy'),
     path('terms-of-service/', views.TermsOfServiceView.as_view(), name='terms_of_service'),
     path('sitemap/', views.SitemapView.as_view(), name='sitemap'),
+    path('fragments/session/', views.SessionFragmentView.as_view(), name='session_fragment'),
     path('site.webmanifest', views.WebManifestView.as_view(), name='webmanifest'),
 ]
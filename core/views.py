@@ -1,38 +1,65 @@
 from django.shortcuts import render, redirect
 from django.views.generic import TemplateView, FormView, DetailView, View
 from django.contrib import messages
-from django.http import JsonResponse
-from django.core.mail import send_mail
+from django.http import FileResponse, Http404, JsonResponse
+from django.middleware.csrf import get_token
 from django.conf import settings
-from .models import SiteSettings, ContactInquiry, Newsletter, TeamMember, Testimonial
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from .cache_policy import cache_policy
+from .conditional import make_etag, template_digest
+from .context_processors import site_settings as site_settings_context
+from .models import ContactInquiry, Newsletter, TeamMember, Testimonial
 from .forms import ContactForm, NewsletterForm
+from .homepage import get_homepage
+from .outbox import queue_email
+from .surrogate import add_surrogate_keys, list_key, surrogate_key
+from .sitemaps import generate_sitemaps, get_sitemap_file_meta, get_sitemap_root, refresh_stale_sitemaps
 
 class BaseContextMixin:
     """Mixin to add common context to all views"""
+    # Extra surrogate keys for content pulled in beyond the view's own model
+    surrogate_keys = ()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        try:
-            context['site_settings'] = SiteSettings.objects.first()
-        except SiteSettings.DoesNotExist:
-            context['site_settings'] = None
+        # Same cached object the context processor provides
+        context['site_settings'] = site_settings_context(self.request)['site_settings']
+        add_surrogate_keys(self.request, *self.get_surrogate_keys())
         return context
 
+    def get_surrogate_keys(self):
+        """Keys for the content on this page (see core.surrogate)"""
+        keys = ['site-settings', *self.surrogate_keys]
+        if getattr(self, 'object', None) is not None:
+            keys.append(surrogate_key(self.object))
+        if getattr(self, 'object_list', None) is not None and getattr(self, 'model', None) is not None:
+            keys.append(list_key(self.model))
+        return keys
+
 class HomeView(BaseContextMixin, TemplateView):
     """Homepage view"""
     template_name = 'core/home.html'
+    surrogate_keys = (
+        'homepage-carousel-image-list', 'testimonial-list', 'project-list',
+        'service-list', 'service-category-list', 'blog-post-list',
+    )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Add featured testimonials for the homepage
-        try:
-            context['testimonials'] = Testimonial.objects.filter(is_active=True).order_by('-is_featured', '-created_at')[:8]
-        except Exception:
-            context['testimonials'] = []
+        # Everything the page renders comes from one cached bundle (see core.homepage)
+        homepage = get_homepage()
+        context.update({
+            'homepage': homepage,
+            'site_settings': homepage['site_settings'],
+            'testimonials': homepage['testimonials'],
+        })
         return context
 
 class AboutView(BaseContextMixin, TemplateView):
     """About page view"""
     template_name = 'core/about.html'
+    surrogate_keys = ('about-section-image-list', 'team-member-list', 'testimonial-list')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -67,17 +94,14 @@ class ContactView(BaseContextMixin, FormView):
         inquiry.user_agent = self.request.META.get('HTTP_USER_AGENT', '')
         inquiry.save()
 
-        # Send notification email
-        try:
-            send_mail(
-                subject=f'New Contact Inquiry: {inquiry.subject}',
-                message=f'Name: {inquiry.name}\nEmail: {inquiry.email}\nPhone: {inquiry.phone}\n\nMessage:\n{inquiry.message}',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.DEFAULT_FROM_EMAIL],
-                fail_silently=True,
-            )
-        except Exception:
-            pass
+        # Notification email goes through the outbox, sent after the response
+        queue_email(
+            subject=f'New Contact Inquiry: {inquiry.subject}',
+            body=f'Name: {inquiry.name}\nEmail: {inquiry.email}\nPhone: {inquiry.phone}\n\nMessage:\n{inquiry.message}',
+            to=[settings.DEFAULT_FROM_EMAIL],
+            reply_to=[inquiry.email],
+            dedup_key=f'contact-inquiry-{inquiry.pk}',
+        )
 
         messages.success(
             self.request,
@@ -149,17 +173,81 @@ class SitemapView(BaseContextMixin, TemplateView):
     template_name = 'core/sitemap.html'
 
 
+@cache_policy('no-store')
+class SessionFragmentView(View):
+    """
+    Per-visitor state for cached public pages, fetched by
+    static/js/session-fragment.js instead of being rendered into the page
+    """
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({
+            'csrf_token': get_token(request),
+            'authenticated': request.user.is_authenticated,
+        })
+
+
+def _sitemap_meta(request, filename='sitemap.xml'):
+    # condition() asks for the ETag and Last-Modified separately; read the meta once
+    if not hasattr(request, '_sitemap_meta'):
+        # Runs for 304s too: files changed on another machine are rebuilt here
+        refresh_stale_sitemaps(filename)
+        request._sitemap_meta = get_sitemap_file_meta(filename) or {}
+    return request._sitemap_meta
+
+
+@method_decorator(condition(
+    etag_func=lambda request, **kwargs: _sitemap_meta(request, **kwargs).get('etag'),
+    last_modified_func=lambda request, **kwargs: _sitemap_meta(request, **kwargs).get('lastmod'),
+), name='get')
+@cache_policy('crawler')
+class SitemapFileView(View):
+    """Serve pre-generated sitemap files from SITEMAP_ROOT (see core.sitemaps)"""
+
+    def get(self, request, filename='sitemap.xml'):
+        path = get_sitemap_root() / filename
+        if not path.exists():
+            if filename != 'sitemap.xml':
+                raise Http404('Sitemap not found')
+            # Fresh container before the boot step or first regeneration
+            generate_sitemaps()
+        content_type = 'application/x-gzip' if filename.endswith('.gz') else 'application/xml'
+        return FileResponse(open(path, 'rb'), content_type=content_type)
+
+
+def _robots_etag(request):
+    return make_etag(template_digest('robots.txt'), request.scheme, request.get_host())
+
+
+@method_decorator(condition(etag_func=_robots_etag), name='get')
+@cache_policy('crawler')
+class RobotsTxtView(TemplateView):
+    """robots.txt; only the template and the requested host change its body"""
+    template_name = 'robots.txt'
+    content_type = 'text/plain'
+
+
+def _manifest_settings(request):
+    # Cached SiteSettings from the context processor; no query on repeat fetches
+    return site_settings_context(request).get('site_settings')
+
+
+def _manifest_etag(request):
+    site_settings = _manifest_settings(request)
+    return make_etag('manifest', getattr(site_settings, 'version', 0), request.scheme, request.get_host())
+
+
+def _manifest_last_modified(request):
+    return getattr(_manifest_settings(request), 'updated_at', None)
+
+
+@method_decorator(condition(etag_func=_manifest_etag, last_modified_func=_manifest_last_modified), name='get')
+@cache_policy('crawler')
 class WebManifestView(View):
     """Web App Manifest for PWA support and better search results"""
 
     def get(self, request, *args, **kwargs):
-        from django.http import JsonResponse
-        from django.conf import settings
-
-        try:
-            site_settings = SiteSettings.objects.first()
-        except SiteSettings.DoesNotExist:
-            site_settings = None
+        site_settings = _manifest_settings(request)
 
         manifest = {
             "name": site_settings.site_name if site_settings else "Skyline Ghana Constructions",
@@ -0,0 +1,160 @@
+"""
+Cache warm-up for Skyline Ghana Constructions
+After a deploy or a worker recycle the shared cache, the page bundles and
+the compiled templates are cold, and the first visitors pay for it. The
+warmer walks every URL in the sitemap sections (core.sitemaps) and renders
+it in-process through the full middleware stack, so whatever a real request
+would cache gets cached. Used by the warm_cache command and the boot
+sequence. The warmer's own local cache tier dies with its process, so only
+the shared tier (and whatever it feeds) stays warm for the web workers.
+"""
+
+import logging
+import math
+import queue
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.db import connections
+from django.http.request import validate_host
+from django.test import Client
+from django.urls import Resolver404, resolve
+
+from .sitemaps import SITEMAPS, get_sitemap_domain
+
+logger = logging.getLogger(__name__)
+
+# Set on warm-up requests; a WSGI environ key, so real visitors cannot send it
+WARMUP_META_KEY = 'skyline.cache_warmup'
+# Contains "crawler" so visitor tracking skips it
+USER_AGENT = 'SkylineCacheWarmer/1.0 (internal crawler)'
+
+WarmResult = namedtuple('WarmResult', 'path url_name status milliseconds error')
+
+
+def is_cache_warmup(request):
+    """True for requests made by the warmer (skip view counters and the like)"""
+    return bool(request.META.get(WARMUP_META_KEY))
+
+
+def sitemap_paths(sections=None, limit=None):
+    """Paths listed in the given sitemap sections (all by default), at most limit per section"""
+    paths = []
+    for section in sections or SITEMAPS:
+        sitemap = SITEMAPS[section]()
+        items = sitemap.items()
+        if limit:
+            items = items[:limit]
+        for item in items:
+            path = sitemap.location(item)
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def warm_host():
+    """A Host header the app accepts: the sitemap domain, else the first concrete allowed host"""
+    domain = get_sitemap_domain()
+    if validate_host(domain, settings.ALLOWED_HOSTS):
+        return domain
+    for host in settings.ALLOWED_HOSTS:
+        if host and host != '*' and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def _url_name(path):
+    try:
+        return resolve(path).view_name
+    except Resolver404:
+        return path
+
+
+def _worker(jobs, results, host, deadline):
+    # Errors come back as 500 responses; re-raising would also catch other threads' exceptions
+    client = Client(
+        raise_request_exception=False,
+        HTTP_HOST=host,
+        HTTP_USER_AGENT=USER_AGENT,
+        **{WARMUP_META_KEY: True},
+    )
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            try:
+                path = jobs.get_nowait()
+            except queue.Empty:
+                return
+            started = time.perf_counter()
+            try:
+                response = client.get(path, secure=True)
+                status, error = response.status_code, ''
+            except Exception as e:
+                status, error = None, str(e)
+                logger.warning(f"Cache warm-up failed for {path}: {e}")
+            results.append(WarmResult(path, _url_name(path), status, (time.perf_counter() - started) * 1000, error))
+    finally:
+        # Each thread opened its own database connections
+        connections.close_all()
+
+
+def warm_urls(paths, concurrency=4, repeat=1, timeout=None):
+    """
+    Render every path repeat times with concurrency threads; returns
+    [WarmResult]. With a timeout (seconds) workers stop taking new paths once
+    it has passed, so the call ends within about timeout plus one render.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    jobs = queue.Queue()
+    for _ in range(max(repeat, 1)):
+        for path in paths:
+            jobs.put(path)
+    results = []
+    host = warm_host()
+    threads = [
+        threading.Thread(target=_worker, args=(jobs, results, host, deadline), name=f'cache-warmup-{i}')
+        for i in range(max(concurrency, 1))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(results):
+    """{url_name: {'count', 'errors', 'p50', 'p95', 'max'}} with times in milliseconds"""
+    grouped = defaultdict(list)
+    for result in results:
+        grouped[result.url_name].append(result)
+    summary = {}
+    for url_name, rows in grouped.items():
+        times = [row.milliseconds for row in rows]
+        summary[url_name] = {
+            'count': len(rows),
+            'errors': sum(1 for row in rows if row.status is None or row.status >= 400),
+            'p50': percentile(times, 50),
+            'p95': percentile(times, 95),
+            'max': max(times),
+        }
+    return summary
+
+
+def warm_cache(sections=None, concurrency=4, limit=None, repeat=1, timeout=None):
+    """Walk the sitemap and render every URL, stopping after timeout seconds; returns [WarmResult]"""
+    paths = sitemap_paths(sections, limit)
+    started = time.perf_counter()
+    results = warm_urls(paths, concurrency=concurrency, repeat=repeat, timeout=timeout)
+    errors = sum(1 for result in results if result.status is None or result.status >= 400)
+    logger.info(
+        f"Warmed {len(results)} of {len(paths) * max(repeat, 1)} URLs in {time.perf_counter() - started:.2f}s "
+        f"({concurrency} threads, {errors} errors)"
+    )
+    return results
@@ -0,0 +1,233 @@
+"""
+Activity log service for the dashboard
+Views record audit entries with log_activity() instead of creating
+ActivityLog rows inline. Entries join a per-process buffer once the
+surrounding transaction commits and are written with one bulk_create when
+the buffer fills (ACTIVITY_LOG_BATCH_SIZE) or a few seconds after the first
+entry arrives (ACTIVITY_LOG_FLUSH_INTERVAL). Pages that read the log call
+flush_activity_log() first, and the buffer is flushed at process exit.
+
+Retention: archive_activity_logs() moves entries older than
+ACTIVITY_LOG_RETENTION_DAYS to gzip-compressed NDJSON files in a private,
+durable storage (the STORAGES alias named by ACTIVITY_LOG_ARCHIVE_STORAGE;
+never the public media storage, and not the container disk, which does not
+survive a redeploy) and deletes them, so the table the dashboard pages sort
+by -created_at stays small.
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import InvalidStorageError, storages
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.storage import ContentAddressedStorage
+from core.tasks import run_in_background
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+_buffer = []
+_buffer_lock = threading.Lock()
+_flush_timer = None
+
+ARCHIVE_FIELDS = (
+    'id', 'created_at', 'updated_at', 'user_id', 'user__username', 'action', 'content_type',
+    'object_id', 'object_repr', 'description', 'ip_address', 'user_agent',
+)
+ARCHIVE_PREFIX = 'archives/activity/'
+
+
+class ArchiveError(Exception):
+    """The archive could not be confirmed in storage, so no rows were deleted"""
+
+
+def _batch_size():
+    return getattr(settings, 'ACTIVITY_LOG_BATCH_SIZE', 50)
+
+
+def _flush_interval():
+    return getattr(settings, 'ACTIVITY_LOG_FLUSH_INTERVAL', 5)
+
+
+def _client_ip(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded:
+        return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR') or None
+
+
+def log_activity(user, action, content_type='', object_id=None, object_repr='', description='', request=None):
+    """
+    Record an audit entry, written in a batch once the current transaction
+    commits. request fills in the IP address and user agent.
+    """
+    if user is None or not user.is_authenticated:
+        return
+    entry = ActivityLog(
+        user=user,
+        action=action,
+        content_type=content_type,
+        object_id=object_id or None,
+        object_repr=str(object_repr)[:200],
+        description=description,
+    )
+    if request is not None:
+        entry.ip_address = _client_ip(request)
+        entry.user_agent = request.META.get('HTTP_USER_AGENT', '')
+    # Entries from a rolled-back transaction are dropped, as inline creates were
+    transaction.on_commit(lambda: _enqueue(entry))
+
+
+def _enqueue(entry):
+    global _flush_timer
+    with _buffer_lock:
+        _buffer.append(entry)
+        full = len(_buffer) >= _batch_size()
+        start_timer = not full and _flush_timer is None
+        if start_timer:
+            _flush_timer = threading.Timer(_flush_interval(), run_in_background, args=(flush_activity_log,))
+            _flush_timer.daemon = True
+    if full:
+        flush_activity_log()
+    elif start_timer:
+        _flush_timer.start()
+
+
+def flush_activity_log():
+    """Write every buffered entry in one INSERT; returns the number written"""
+    global _flush_timer
+    with _buffer_lock:
+        entries = _buffer[:]
+        _buffer.clear()
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+    if not entries:
+        return 0
+    try:
+        ActivityLog.objects.bulk_create(entries)
+    except IntegrityError:
+        # A user deleted since their entry was buffered; keep everyone else's
+        from django.contrib.auth import get_user_model
+        existing = set(get_user_model().objects.filter(pk__in={e.user_id for e in entries}).values_list('pk', flat=True))
+        entries = [entry for entry in entries if entry.user_id in existing]
+        ActivityLog.objects.bulk_create(entries)
+    except Exception:
+        logger.exception(f"Could not write {len(entries)} activity log entries")
+        return 0
+    return len(entries)
+
+
+def _flush_at_exit():
+    try:
+        flush_activity_log()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
+
+
+def get_archive_storage():
+    """
+    The private storage named by ACTIVITY_LOG_ARCHIVE_STORAGE. The media
+    storage is refused: it is served publicly, and content-addressed storage
+    renames what it stores and treats unreferenced files as orphans.
+    """
+    alias = getattr(settings, 'ACTIVITY_LOG_ARCHIVE_STORAGE', '')
+    if not alias or alias in ('default', 'staticfiles'):
+        raise ArchiveError(
+            "Set ACTIVITY_LOG_ARCHIVE_STORAGE to a private STORAGES alias; "
+            "the media and static storages are public"
+        )
+    try:
+        storage = storages[alias]
+    except InvalidStorageError:
+        raise ArchiveError(f"ACTIVITY_LOG_ARCHIVE_STORAGE names an unknown storage alias {alias!r}")
+    location = getattr(storage, 'location', None)
+    in_media_root = location and os.path.commonpath(
+        [os.path.realpath(location), os.path.realpath(settings.MEDIA_ROOT)]
+    ) == os.path.realpath(settings.MEDIA_ROOT)
+    if isinstance(storage, ContentAddressedStorage) or in_media_root:
+        raise ArchiveError(f"Storage {alias!r} is the public media storage; archives need a private one")
+    return storage
+
+
+def _confirm_archive(storage, name, size, digest):
+    """Read the archive back from the storage and check it matches what was written"""
+    if not name.startswith(ARCHIVE_PREFIX) or not storage.exists(name):
+        return f"Archive {name} was not found in storage"
+    if storage.size(name) != size:
+        return f"Archive {name} reports {storage.size(name)} of {size} bytes"
+    stored = hashlib.sha256()
+    with storage.open(name, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            stored.update(chunk)
+    if stored.hexdigest() != digest:
+        return f"Archive {name} does not match the written content"
+    return None
+
+
+def archive_activity_logs(older_than_days=None, batch_size=5000, dry_run=False):
+    """
+    Move entries older than the retention period to a gzip NDJSON file in
+    the archive storage and delete them in batches. Rows are only deleted
+    once the archive has been read back from the storage and matches what
+    was written. Returns (rows archived, stored archive name or None).
+    """
+    days = older_than_days if older_than_days is not None else getattr(settings, 'ACTIVITY_LOG_RETENTION_DAYS', 180)
+    cutoff = timezone.now() - timedelta(days=days)
+    queryset = ActivityLog.objects.filter(created_at__lt=cutoff)
+    if dry_run:
+        return queryset.count(), None
+
+    # Only rows at or below this id are archived, so rows arriving meanwhile are left alone
+    last_id = queryset.order_by('-pk').values_list('pk', flat=True).first()
+    if last_id is None:
+        return 0, None
+    queryset = queryset.filter(pk__lte=last_id)
+
+    storage = get_archive_storage()
+    archived = 0
+    digest = hashlib.sha256()
+    with tempfile.TemporaryFile() as output:
+        with gzip.GzipFile(fileobj=output, mode='wb') as archive:
+            for row in queryset.order_by('pk').values(*ARCHIVE_FIELDS).iterator(chunk_size=batch_size):
+                archive.write((json.dumps(row, cls=DjangoJSONEncoder) + '\n').encode('utf-8'))
+                archived += 1
+        size = output.tell()
+        output.seek(0)
+        for chunk in iter(lambda: output.read(1024 * 1024), b''):
+            digest.update(chunk)
+        output.seek(0)
+
+        name = f"{ARCHIVE_PREFIX}activity_log_{timezone.localtime():%Y%m%d_%H%M%S}_before_{cutoff:%Y%m%d}.ndjson.gz"
+        name = storage.save(name, File(output, name=os.path.basename(name)))
+
+    try:
+        problem = _confirm_archive(storage, name, size, digest.hexdigest())
+    except Exception as e:
+        problem = f"Could not read back archive {name}: {e}"
+    if problem:
+        raise ArchiveError(f"{problem}; kept {archived} activity log entries")
+
+    while True:
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        ActivityLog.objects.filter(pk__in=ids).delete()
+    logger.info(f"Archived {archived} activity log entries older than {cutoff:%Y-%m-%d} to {name}")
+    return archived, name
@@ -0,0 +1,210 @@
+"""
+Streaming exports for dashboard lists
+Rows are read with .iterator(chunk_size=...) and written as they are read,
+so exporting 100k inquiries or log entries keeps memory flat. CSV is
+streamed straight to the client; XLSX (a zip archive) is written to a
+spooled temporary file that moves to disk past a few megabytes, then
+streamed from there. Export views reuse their list view's get_queryset,
+so the filters on screen are the filters in the file.
+"""
+
+import csv
+import re
+import tempfile
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from .activity import log_activity
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+
+# Control characters XML 1.0 cannot carry; one in a form field would corrupt the sheet
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+# Spreadsheets evaluate cells starting with these as formulas
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Echo:
+    """File-like object whose write() returns the line for csv.writer to hand back"""
+
+    def write(self, value):
+        return value
+
+
+def _resolve(obj, accessor):
+    """Value for an accessor: a callable, or a dotted attribute path ('position.title')"""
+    if callable(accessor):
+        return accessor(obj)
+    value = obj
+    for part in accessor.split('.'):
+        if value is None:
+            return ''
+        value = getattr(value, part)
+        if callable(value):
+            value = value()
+    return value
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    # Text is mostly public form input: drop XML-illegal characters and defuse formulas
+    value = _ILLEGAL_XML_CHARS.sub('', str(value))
+    if value.startswith(_FORMULA_PREFIXES):
+        value = "'" + value
+    return value
+
+
+def iter_rows(queryset, columns, chunk_size):
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        yield [_cell(_resolve(obj, accessor)) for _, accessor in columns]
+
+
+def stream_csv(queryset, columns, chunk_size=2000):
+    """Encoded CSV lines, header first; the BOM lets Excel detect UTF-8"""
+    writer = csv.writer(_Echo())
+    yield '﻿' + writer.writerow([header for header, _ in columns])
+    for row in iter_rows(queryset, columns, chunk_size):
+        yield writer.writerow(row)
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_row(number, values):
+    cells = ''.join(
+        f'<c r="{_column_letter(i)}{number}" t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+        for i, value in enumerate(values)
+        if value != ''
+    )
+    return f'<row r="{number}">{cells}</row>'
+
+
+_XLSX_STATIC = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def write_xlsx(queryset, columns, sheet_name='Export', chunk_size=2000):
+    """
+    Write a single-sheet workbook (inline strings, no styles) to a spooled
+    temporary file and return it rewound. No spreadsheet library needed.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024)
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC.items():
+            archive.writestr(name, content)
+        archive.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(sheet_name[:31])}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ))
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(1, [header for header, _ in columns]).encode('utf-8'))
+            for number, row in enumerate(iter_rows(queryset, columns, chunk_size), start=2):
+                sheet.write(_xlsx_row(number, row).encode('utf-8'))
+            sheet.write(b'</sheetData></worksheet>')
+    output.seek(0)
+    return output
+
+
+class ExportMixin:
+    """
+    Mix into a subclass of a list view (after LoginRequiredMixin) to serve
+    the list's queryset as CSV or XLSX (?format=xlsx). Subclasses set
+    export_columns to [(header, accessor)] and export_name.
+    """
+    export_columns = ()
+    export_name = 'export'
+    export_chunk_size = 2000
+
+    def get_export_queryset(self):
+        return self.get_queryset()
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            export_format = 'csv'
+        queryset = self.get_export_queryset()
+        filename = f"{self.export_name}_{timezone.localtime():%Y%m%d_%H%M%S}.{export_format}"
+        self.log_export(export_format)
+
+        if export_format == 'xlsx':
+            workbook = write_xlsx(queryset, self.export_columns, self.export_name.title(), self.export_chunk_size)
+            return FileResponse(
+                workbook,
+                as_attachment=True,
+                filename=filename,
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            )
+
+        response = StreamingHttpResponse(
+            stream_csv(queryset, self.export_columns, self.export_chunk_size),
+            content_type='text/csv; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def log_export(self, export_format):
+        filters = self.request.GET.copy()
+        for param in ('format', 'page'):
+            filters.pop(param, None)
+        log_activity(
+            self.request.user, 'export', self.model.__name__,
+            object_repr=filters.urlencode(),
+            description=f"Exported {self.export_name.replace('_', ' ')} as {export_format.upper()}",
+            request=self.request,
+        )
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.activity import ArchiveError, archive_activity_logs, flush_activity_log
+
+
+class Command(BaseCommand):
+    help = 'Move old dashboard activity log entries to compressed NDJSON archives in durable storage and delete them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.ACTIVITY_LOG_RETENTION_DAYS,
+            help=f'Archive entries older than this many days (default: {settings.ACTIVITY_LOG_RETENTION_DAYS})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows read and deleted per query',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many entries would be archived',
+        )
+
+    def handle(self, *args, **options):
+        flush_activity_log()
+        try:
+            archived, name = archive_activity_logs(
+                older_than_days=options['days'],
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+        except ArchiveError as e:
+            raise CommandError(str(e))
+        if options['dry_run']:
+            self.stdout.write(f"🔍 {archived} entries older than {options['days']} days would be archived")
+        elif name:
+            self.stdout.write(self.style.SUCCESS(f'📦 Archived {archived} activity log entries to {name}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ No entries older than {options['days']} days"))
@@ -112,10 +112,36 @@ class ActivityLog(TimeStampedModel):
         ordering = ['-created_at']
         verbose_name = "Activity Log"
         verbose_name_plural = "Activity Logs"
+        indexes = [
+            # Every dashboard view of the log sorts by newest first; archiving filters on age
+            models.Index(fields=['-created_at'], name='activitylog_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} {self.action} {self.content_type} at {self.created_at}"
 
+    @classmethod
+    def log_many(cls, user, action, content_type, rows, description=''):
+        """One entry per (object_id, object_repr) in rows, written in a single INSERT"""
+        return cls.objects.bulk_create([
+            cls(
+                user=user,
+                action=action,
+                content_type=content_type,
+                object_id=object_id,
+                object_repr=str(object_repr)[:200],
+                description=description,
+            )
+            for object_id, object_repr in rows
+        ])
+
+class NotificationQuerySet(models.QuerySet):
+    def mark_as_read(self):
+        """Mark every unread notification in the queryset as read in one UPDATE"""
+        now = timezone.now()
+        return self.filter(is_read=False).update(is_read=True, read_at=now, updated_at=now)
+
+
 class Notification(TimeStampedModel):
     """System notifications for dashboard users"""
     NOTIFICATION_TYPES = [
@@ -142,6 +168,8 @@ class Notification(TimeStampedModel):
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Notification"
@@ -152,9 +180,8 @@ class Notification(TimeStampedModel):
 
     def mark_as_read(self):
         """Mark notification as read"""
-        self.is_read = True
-        self.read_at = timezone.now()
-        self.save()
+        Notification.objects.filter(pk=self.pk).mark_as_read()
+        self.refresh_from_db(fields=['is_read', 'read_at', 'updated_at'])
 
 class SystemMetrics(TimeStampedModel):
     """Store system metrics for analytics"""
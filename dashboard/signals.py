@@ -0,0 +1,41 @@
+"""
+Signal handlers for dashboard.
+Dashboard notifications are mirrored by email (through the core outbox) to
+recipients who have email notifications enabled.
+"""
+
+from django.db.models.signals import post_save
+
+from core.outbox import queue_email
+
+from .models import Notification
+
+
+def email_notification(sender, instance, created, **kwargs):
+    """Queue an email copy of a new notification"""
+    if not created or kwargs.get('raw'):
+        return
+    recipient = instance.recipient
+    if not recipient.email:
+        return
+    profile = getattr(recipient, 'profile', None)
+    if profile is not None and not profile.email_notifications:
+        return
+
+    body = instance.message
+    if instance.action_url:
+        body = f'{body}\n\n{instance.action_url}'
+    queue_email(
+        subject=instance.title,
+        body=body,
+        to=[recipient.email],
+        dedup_key=f'notification-{instance.pk}',
+    )
+
+
+def connect_notification_emails():
+    post_save.connect(
+        email_notification,
+        sender=Notification,
+        dispatch_uid='dashboard_notification_email',
+    )
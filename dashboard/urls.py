@@ -36,9 +36,12 @@ urlpatterns = [
 
     # Inquiry management
     path('inquiries/', views.InquiryListView.as_view(), name='inquiry_list'),
+    path('inquiries/export/', views.InquiryExportView.as_view(), name='inquiry_export'),
 
     # Career management
     path('careers/', views.CareerListView.as_view(), name='career_list'),
+    path('careers/export/', views.CareerExportView.as_view(), name='career_export'),
+    path('careers/applications/export/', views.ApplicationExportView.as_view(), name='application_export'),
     path('careers/create/', views.CareerCreateView.as_view(), name='career_create'),
     path('careers/<int:pk>/update/', views.CareerUpdateView.as_view(), name='career_update'),
     path('careers/<int:pk>/delete/', views.CareerDeleteView.as_view(), name='career_delete'),
@@ -88,6 +91,7 @@ urlpatterns = [
 
     # Activity logs
     path('activity/', views.ActivityLogListView.as_view(), name='activity'),
+    path('activity/export/', views.ActivityLogExportView.as_view(), name='activity_export'),
 
     # Notifications (simple)
     path('notifications/', views.NotificationsView.as_view(), name='notifications'),
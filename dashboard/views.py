@@ -16,6 +16,8 @@ from projects.models import Project, ProjectImage, ProjectCategory
 from services.models import Service, ServiceCategory, ServicePageImage
 from core.models import ContactInquiry, SiteSettings, Testimonial, HomepageCarouselImage
 from .models import ActivityLog, SystemMetrics
+from .activity import flush_activity_log, log_activity
+from .exports import ExportMixin
 from careers.models import JobPosition, JobApplication
 from blog.models import BlogPost
 from django.contrib.auth.models import User
@@ -103,17 +105,13 @@ class DashboardLoginView(LoginView):
 
     def form_valid(self, form):
         response = super().form_valid(form)
-        try:
-            ActivityLog.objects.create(
-                user=self.request.user,
-                action='login',
-                content_type='User',
-                object_id=self.request.user.pk,
-                object_repr=self.request.user.username,
-                description='User logged in'
-            )
-        except Exception as e:
-            print(f"Error logging login activity: {e}")
+        log_activity(
+            self.request.user, 'login', 'User',
+            object_id=self.request.user.pk,
+            object_repr=self.request.user.username,
+            description='User logged in',
+            request=self.request,
+        )
         return response
 
 class DashboardLogoutView(View):
@@ -134,19 +132,14 @@ class DashboardLogoutView(View):
         user = request.user if request.user.is_authenticated else None
 
         # Log the logout activity
-        try:
-            if user:
-                ActivityLog.objects.create(
-                    user=user,
-                    action='logout',
-                    content_type='User',
-                    object_id=user.pk,
-                    object_repr=user.username,
-                    description='User logged out'
-                )
-        except Exception as e:
-            # Log the error but don't break logout
-            print(f"Error logging logout activity: {e}")
+        if user:
+            log_activity(
+                user, 'logout', 'User',
+                object_id=user.pk,
+                object_repr=user.username,
+                description='User logged out',
+                request=request,
+            )
 
         # Perform logout
         logout(request)
@@ -406,6 +399,7 @@ class NotificationsView(LoginRequiredMixin, TemplateView):
     login_url = '/my-admin/login/'
 
     def get(self, request, *args, **kwargs):
+        flush_activity_log()
         logs = ActivityLog.objects.select_related('user').order_by('-created_at')[:8]
         context = {'logs': logs}
         return self.render_to_response(context)
@@ -788,7 +782,37 @@ class InquiryListView(LoginRequiredMixin, ListView):
     login_url = '/my-admin/login/'
 
     def get_queryset(self):
-        return ContactInquiry.objects.all().order_by('-created_at')
+        queryset = ContactInquiry.objects.select_related('responded_by').order_by('-created_at')
+        status = self.request.GET.get('status')
+        if status == 'responded':
+            queryset = queryset.filter(responded_at__isnull=False)
+        elif status and status != 'all':
+            queryset = queryset.filter(status=status)
+        search = self.request.GET.get('search')
+        if search:
+            queryset = queryset.filter(
+                Q(name__icontains=search) |
+                Q(email__icontains=search) |
+                Q(subject__icontains=search)
+            )
+        return queryset
+
+
+class InquiryExportView(ExportMixin, InquiryListView):
+    """Download the filtered inquiry list as CSV or XLSX"""
+    export_name = 'inquiries'
+    export_columns = [
+        ('Received', 'created_at'),
+        ('Name', 'name'),
+        ('Email', 'email'),
+        ('Phone', 'phone'),
+        ('Type', 'get_inquiry_type_display'),
+        ('Subject', 'subject'),
+        ('Message', 'message'),
+        ('Status', 'get_status_display'),
+        ('Responded By', 'responded_by.username'),
+        ('Responded At', 'responded_at'),
+    ]
 
 # Career Management Views
 class CareerListView(LoginRequiredMixin, ListView):
@@ -818,6 +842,74 @@ class CareerListView(LoginRequiredMixin, ListView):
         context['applications_total'] = JobApplication.objects.count()
         return context
 
+
+class CareerExportView(ExportMixin, CareerListView):
+    """Download the filtered job position list as CSV or XLSX"""
+    export_name = 'job_positions'
+    export_columns = [
+        ('Title', 'title'),
+        ('Department', 'department.name'),
+        ('Type', 'get_job_type_display'),
+        ('Experience', 'get_experience_level_display'),
+        ('Location', 'location'),
+        ('Status', 'get_status_display'),
+        ('Applications', 'applications_count'),
+        ('Deadline', 'application_deadline'),
+        ('Created', 'created_at'),
+    ]
+
+    def get_export_queryset(self):
+        return self.get_queryset().select_related('department').defer(
+            'summary', 'description', 'responsibilities', 'requirements', 'qualifications', 'benefits'
+        )
+
+
+class ApplicationExportView(ExportMixin, LoginRequiredMixin, ListView):
+    """Download job applications as CSV or XLSX, filtered by ?position=, ?status= and ?search="""
+    model = JobApplication
+    login_url = '/my-admin/login/'
+    export_name = 'applications'
+    export_columns = [
+        ('Submitted', 'created_at'),
+        ('Position', 'position.title'),
+        ('First Name', 'first_name'),
+        ('Last Name', 'last_name'),
+        ('Email', 'email'),
+        ('Phone', 'phone'),
+        ('City', 'city'),
+        ('Country', 'country'),
+        ('Current Position', 'current_position'),
+        ('Current Company', 'current_company'),
+        ('Years of Experience', 'years_of_experience'),
+        ('Expected Salary', 'expected_salary'),
+        ('Available From', 'availability_date'),
+        ('Portfolio', 'portfolio_url'),
+        ('Status', 'get_status_display'),
+        ('Reviewed At', 'reviewed_at'),
+    ]
+
+    def get_queryset(self):
+        queryset = JobApplication.objects.select_related('position').only(
+            'created_at', 'first_name', 'last_name', 'email', 'phone', 'city', 'country',
+            'current_position', 'current_company', 'years_of_experience', 'expected_salary',
+            'availability_date', 'portfolio_url', 'status', 'reviewed_at', 'position__title',
+        ).order_by('-created_at')
+        position = self.request.GET.get('position')
+        if position:
+            queryset = queryset.filter(position_id=position) if position.isdigit() else queryset.filter(position__slug=position)
+        status = self.request.GET.get('status')
+        if status:
+            queryset = queryset.filter(status=status)
+        search = self.request.GET.get('search')
+        if search:
+            queryset = queryset.filter(
+                Q(first_name__icontains=search) |
+                Q(last_name__icontains=search) |
+                Q(email__icontains=search) |
+                Q(position__title__icontains=search)
+            )
+        return queryset
+
 class CareerCreateView(LoginRequiredMixin, CreateView):
     """Create new job position"""
     model = JobPosition
@@ -937,17 +1029,13 @@ class TestimonialCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         messages.success(self.request, 'Testimonial created successfully!')
         response = super().form_valid(form)
-        try:
-            ActivityLog.objects.create(
-                user=self.request.user,
-                action='create',
-                content_type='Testimonial',
-                object_id=self.object.pk,
-                object_repr=self.object.name,
-                description=f"Created testimonial for {self.object.name}"
-            )
-        except Exception:
-            pass
+        log_activity(
+            self.request.user, 'create', 'Testimonial',
+            object_id=self.object.pk,
+            object_repr=self.object.name,
+            description=f"Created testimonial for {self.object.name}",
+            request=self.request,
+        )
         return response
 
 class BlogDeleteView(LoginRequiredMixin, DeleteView):
@@ -963,17 +1051,13 @@ class BlogDeleteView(LoginRequiredMixin, DeleteView):
         pk = obj.pk
         messages.success(request, 'Blog post deleted successfully!')
         response = super().delete(request, *args, **kwargs)
-        try:
-            ActivityLog.objects.create(
-                user=request.user,
-                action='delete',
-                content_type='BlogPost',
-                object_id=pk,
-                object_repr=title,
-                description=f"Deleted blog post '{title}'"
-            )
-        except Exception:
-            pass
+        log_activity(
+            request.user, 'delete', 'BlogPost',
+            object_id=pk,
+            object_repr=title,
+            description=f"Deleted blog post '{title}'",
+            request=request,
+        )
         return response
 
 class TestimonialUpdateView(LoginRequiredMixin, UpdateView):
@@ -987,17 +1071,13 @@ class TestimonialUpdateView(LoginRequiredMixin, UpdateView):
     def form_valid(self, form):
         messages.success(self.request, 'Testimonial updated successfully!')
         response = super().form_valid(form)
-        try:
-            ActivityLog.objects.create(
-                user=self.request.user,
-                action='update',
-                content_type='Testimonial',
-                object_id=self.object.pk,
-                object_repr=self.object.name,
-                description=f"Updated testimonial for {self.object.name}"
-            )
-        except Exception:
-            pass
+        log_activity(
+            self.request.user, 'update', 'Testimonial',
+            object_id=self.object.pk,
+            object_repr=self.object.name,
+            description=f"Updated testimonial for {self.object.name}",
+            request=self.request,
+        )
         return response
 
 class TestimonialDeleteView(LoginRequiredMixin, DeleteView):
@@ -1017,17 +1097,13 @@ class TestimonialDeleteView(LoginRequiredMixin, DeleteView):
             pk = ''
             name = ''
         response = super().delete(request, *args, **kwargs)
-        try:
-            ActivityLog.objects.create(
-                user=request.user,
-                action='delete',
-                content_type='Testimonial',
-                object_id=pk,
-                object_repr=name,
-                description=f"Deleted testimonial for {name}"
-            )
-        except Exception:
-            pass
+        log_activity(
+            request.user, 'delete', 'Testimonial',
+            object_id=pk,
+            object_repr=name,
+            description=f"Deleted testimonial for {name}",
+            request=request,
+        )
         return response
 
 
@@ -1060,17 +1136,13 @@ class BlogCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         messages.success(self.request, 'Blog post created successfully!')
         response = super().form_valid(form)
-        try:
-            ActivityLog.objects.create(
-                user=self.request.user,
-                action='create',
-                content_type='BlogPost',
-                object_id=self.object.pk,
-                object_repr=self.object.title,
-                description=f"Created blog post '{self.object.title}'"
-            )
-        except Exception:
-            pass
+        log_activity(
+            self.request.user, 'create', 'BlogPost',
+            object_id=self.object.pk,
+            object_repr=self.object.title,
+            description=f"Created blog post '{self.object.title}'",
+            request=self.request,
+        )
         return response
 
 class BlogUpdateView(LoginRequiredMixin, UpdateView):
@@ -1084,17 +1156,13 @@ class BlogUpdateView(LoginRequiredMixin, UpdateView):
     def form_valid(self, form):
         messages.success(self.request, 'Blog post updated successfully!')
         response = super().form_valid(form)
-        try:
-            ActivityLog.objects.create(
-                user=self.request.user,
-                action='update',
-                content_type='BlogPost',
-                object_id=self.object.pk,
-                object_repr=self.object.title,
-                description=f"Updated blog post '{self.object.title}'"
-            )
-        except Exception:
-            pass
+        log_activity(
+            self.request.user, 'update', 'BlogPost',
+            object_id=self.object.pk,
+            object_repr=self.object.title,
+            description=f"Updated blog post '{self.object.title}'",
+            request=self.request,
+        )
         return response
 
 
@@ -1155,17 +1223,13 @@ class SettingsView(LoginRequiredMixin, TemplateView):
         if form.is_valid():
             obj = form.save()
             messages.success(request, 'Settings updated successfully!')
-            try:
-                ActivityLog.objects.create(
-                    user=request.user,
-                    action='update',
-                    content_type='SiteSettings',
-                    object_id=obj.pk,
-                    object_repr='Site Settings',
-                    description='Updated site settings'
-                )
-            except Exception:
-                pass
+            log_activity(
+                request.user, 'update', 'SiteSettings',
+                object_id=obj.pk,
+                object_repr='Site Settings',
+                description='Updated site settings',
+                request=request,
+            )
             return redirect('dashboard:settings')
         context = self.get_context_data(form=form)
         return self.render_to_response(context)
@@ -1239,18 +1303,35 @@ class ActivityLogListView(LoginRequiredMixin, ListView):
     login_url = '/my-admin/login/'
 
     def get_queryset(self):
+        flush_activity_log()
         qs = ActivityLog.objects.select_related('user').all()
         search = self.request.GET.get('search')
         if search:
             qs = qs.filter(
                 Q(user__username__icontains=search) |
                 Q(action__icontains=search) |
-                Q(model_name__icontains=search) |
-                Q(message__icontains=search)
+                Q(content_type__icontains=search) |
+                Q(object_repr__icontains=search) |
+                Q(description__icontains=search)
             )
         return qs.order_by('-created_at')
 
 
+class ActivityLogExportView(ExportMixin, ActivityLogListView):
+    """Download the filtered audit log as CSV or XLSX"""
+    export_name = 'activity_log'
+    export_columns = [
+        ('When', 'created_at'),
+        ('User', 'user.username'),
+        ('Action', 'get_action_display'),
+        ('Model', 'content_type'),
+        ('Object ID', 'object_id'),
+        ('Object', 'object_repr'),
+        ('Description', 'description'),
+        ('IP Address', 'ip_address'),
+    ]
+
+
 # ==========================
 # Homepage Carousel Image Management
 # ==========================
@@ -1289,17 +1370,13 @@ class HomepageCarouselCreateView(LoginRequiredMixin, CreateView):
 
         messages.success(self.request, 'Homepage carousel image added successfully!')
         response = super().form_valid(form)
-        try:
-            ActivityLog.objects.create(
-                user=self.request.user,
-                action='create',
-                content_type='HomepageCarouselImage',
-                object_id=self.object.pk,
-                object_repr=f"Carousel Image #{self.object.pk}",
-                description=f"Added homepage carousel image #{self.object.pk}"
-            )
-        except Exception:
-            pass
+        log_activity(
+            self.request.user, 'create', 'HomepageCarouselImage',
+            object_id=self.object.pk,
+            object_repr=f"Carousel Image #{self.object.pk}",
+            description=f"Added homepage carousel image #{self.object.pk}",
+            request=self.request,
+        )
         return response
 
     def get_context_data(self, **kwargs):
@@ -1319,17 +1396,13 @@ class HomepageCarouselUpdateView(LoginRequiredMixin, UpdateView):
     def form_valid(self, form):
         messages.success(self.request, 'Homepage carousel image updated successfully!')
         response = super().form_valid(form)
-        try:
-            ActivityLog.objects.create(
-                user=self.request.user,
-                action='update',
-                content_type='HomepageCarouselImage',
-                object_id=self.object.pk,
-                object_repr=f"Carousel Image #{self.object.pk}",
-                description=f"Updated homepage carousel image #{self.object.pk}"
-            )
-        except Exception:
-            pass
+        log_activity(
+            self.request.user, 'update', 'HomepageCarouselImage',
+            object_id=self.object.pk,
+            object_repr=f"Carousel Image #{self.object.pk}",
+            description=f"Updated homepage carousel image #{self.object.pk}",
+            request=self.request,
+        )
         return response
 
     def get_context_data(self, **kwargs):
@@ -1350,15 +1423,11 @@ class HomepageCarouselDeleteView(LoginRequiredMixin, DeleteView):
         pk = obj.pk
         messages.success(request, 'Homepage carousel image deleted successfully!')
         response = super().delete(request, *args, **kwargs)
-        try:
-            ActivityLog.objects.create(
-                user=request.user,
-                action='delete',
-                content_type='HomepageCarouselImage',
-                object_id=pk,
-                object_repr=f"Carousel Image #{pk}",
-                description=f"Deleted homepage carousel image #{pk}"
-            )
-        except Exception:
-            pass
+        log_activity(
+            request.user, 'delete', 'HomepageCarouselImage',
+            object_id=pk,
+            object_repr=f"Carousel Image #{pk}",
+            description=f"Deleted homepage carousel image #{pk}",
+            request=request,
+        )
         return response
@@ -0,0 +1,17 @@
+"""
+Gunicorn hooks for Skyline Ghana Constructions.
+Command-line flags in entrypoint.sh still set workers, threads and timeouts.
+"""
+
+
+def post_fork(server, worker):
+    """Compile all project templates and start the queue sweeps before the worker takes requests"""
+    import django
+    django.setup()
+
+    from core.templating import warm_template_cache
+    compiled, failed, duration = warm_template_cache()
+    server.log.info(f"Worker {worker.pid}: warmed {compiled} templates in {duration:.2f}s ({failed} failed)")
+
+    from core.tasks import start_periodic_tasks
+    start_periodic_tasks()
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        from core.signals import connect_related_content
+        from .related import ProjectRelated
+        connect_related_content(ProjectRelated())
+
+        from .signals import connect_project_bundle_invalidation
+        connect_project_bundle_invalidation()
+
+        from core.signals import connect_facet_counts
+        from .facets import GalleryFacets, ProjectFacets
+        connect_facet_counts(ProjectFacets())
+        connect_facet_counts(GalleryFacets())
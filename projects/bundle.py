@@ -0,0 +1,58 @@
+"""
+Project detail bundle
+Everything the project detail page renders (the project with its category
+and service category, and its ordered gallery images) is loaded in two
+queries and cached as a single object per project. Saving a project or one
+of its images drops that project's bundle; renaming a category, which many
+pages show, moves a shared generation number forward and retires them all.
+"""
+
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from core.cache import bump_generation, get_generation
+
+BUNDLE_TIMEOUT = 60 * 60
+GENERATION_KEY = 'project_bundle_generation'
+
+ProjectBundle = namedtuple('ProjectBundle', 'project images')
+
+
+def bump_bundle_generation():
+    """Retire every cached bundle"""
+    bump_generation(GENERATION_KEY)
+
+
+def bundle_key(slug):
+    return f'project_bundle:{get_generation(GENERATION_KEY)}:{slug}'
+
+
+def invalidate_bundle(*slugs):
+    """Drop the cached bundles for these slugs"""
+    cache.delete_many([bundle_key(slug) for slug in set(slugs) if slug])
+
+
+def build_project_bundle(slug):
+    """Load a published project's bundle in two queries; None if there is none"""
+    from .models import Project, ProjectImage
+
+    project = (
+        Project.objects.filter(is_published=True, slug=slug)
+        .select_related('project_type', 'service_category')
+        .prefetch_related(
+            Prefetch('images', queryset=ProjectImage.objects.order_by('order', 'id'), to_attr='ordered_images'),
+        )
+        .first()
+    )
+    if project is None:
+        return None
+    return ProjectBundle(project=project, images=project.ordered_images)
+
+
+def get_project_bundle(slug):
+    """Cached bundle for the project detail page, or None for unknown/unpublished slugs"""
+    # Misses are cached too (as False) so unknown slugs cost no queries either
+    bundle = cache.get_or_set(bundle_key(slug), lambda: build_project_bundle(slug) or False, BUNDLE_TIMEOUT)
+    return bundle or None
@@ -0,0 +1,42 @@
+"""
+Filter counts for the project list and the gallery (see core.facets)
+"""
+
+from django.db.models import Q
+
+from core.facets import Facet, FacetSet
+
+from .models import Project, ProjectCategory, ProjectImage
+
+
+class ProjectFacets(FacetSet):
+    name = 'projects'
+    facets = (Facet('category', 'project_type__slug'),)
+    filter_params = ('search',)
+    watched_models = (Project, ProjectCategory)
+
+    def base_queryset(self):
+        return Project.objects.filter(is_published=True)
+
+    def filter_extra(self, queryset, params):
+        search_query = params.get('search')
+        if search_query:
+            queryset = queryset.filter(
+                Q(title__icontains=search_query) |
+                Q(description__icontains=search_query) |
+                Q(location__icontains=search_query) |
+                Q(client_name__icontains=search_query)
+            )
+        return queryset
+
+
+class GalleryFacets(FacetSet):
+    name = 'gallery'
+    facets = (
+        Facet('category', 'project__project_type__slug'),
+        Facet('project', 'project__slug'),
+    )
+    watched_models = (Project, ProjectCategory, ProjectImage)
+
+    def base_queryset(self):
+        return ProjectImage.objects.filter(project__is_published=True)
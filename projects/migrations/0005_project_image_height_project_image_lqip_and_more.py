@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_add_default_project_categories'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_lqip',
+            field=models.TextField(blank=True, editable=False, help_text='Base64 data URI of a tiny preview'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_placeholder_for',
+            field=models.CharField(blank=True, editable=False, help_text='Image name the stored dimensions/preview were computed from', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='image_lqip',
+            field=models.TextField(blank=True, editable=False, help_text='Base64 data URI of a tiny preview'),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='image_placeholder_for',
+            field=models.CharField(blank=True, editable=False, help_text='Image name the stored dimensions/preview were computed from', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_image_height_project_image_lqip_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='seo_data',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 from core.models import TimeStampedModel
-from core.mixins import SEOMixin, TimestampMixin, SlugMixin, StatusMixin
+from core.mixins import SEOMixin, TimestampMixin, SlugMixin, StatusMixin, ImagePlaceholderMixin
 from services.models import ServiceCategory
 from PIL import Image
 import os
@@ -29,8 +29,10 @@ class ProjectCategory(TimeStampedModel):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
-class Project(SEOMixin, TimeStampedModel):
+class Project(SEOMixin, ImagePlaceholderMixin, TimeStampedModel):
     """Portfolio projects"""
+    placeholder_image_field = 'featured_image'
+
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     description = models.TextField()
@@ -88,9 +90,8 @@ class Project(SEOMixin, TimeStampedModel):
         return reverse('projects:project_detail', kwargs={'slug': self.slug})
 
     def increment_views(self):
-        """Increment view count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """Increment view count in the database without a read-modify-write or save signals"""
+        Project.objects.filter(pk=self.pk).update(views_count=models.F('views_count') + 1)
 
     @property
     def status(self):
@@ -102,12 +103,19 @@ class Project(SEOMixin, TimeStampedModel):
         else:
             return "Completed"
 
+    def get_related_projects(self, limit=3):
+        """Projects sharing tags, type or service category (precomputed, see projects.related)"""
+        from core.related import related_queryset
+        queryset = Project.objects.filter(is_published=True).select_related('project_type', 'service_category')
+        fallback = queryset.filter(project_type_id=self.project_type_id).order_by('order', '-created_at')
+        return related_queryset(self, queryset, limit, fallback)
+
     @property
     def has_before_after(self):
         """Check if project has before/after images"""
         return bool(self.before_image and self.after_image)
 
-class ProjectImage(TimeStampedModel):
+class ProjectImage(ImagePlaceholderMixin, TimeStampedModel):
     """Project gallery images"""
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='projects/gallery/')
@@ -0,0 +1,30 @@
+"""
+Related projects: shared tags, the same project type, then the same service
+category, with recency as a tie-breaker (see core.related)
+"""
+
+from core.related import RelatedContent
+
+
+class ProjectRelated(RelatedContent):
+    label = 'projects.Project'
+    tag_field = 'tags'
+    categories = {'project_type_id': 1.5, 'service_category_id': 1.0}
+
+    def candidates(self):
+        return self.model.objects.filter(is_published=True).only(
+            'pk', 'title', 'short_description', 'project_type_id', 'service_category_id',
+            'completion_date', 'created_at',
+        )
+
+    def prepare(self, queryset):
+        return queryset.prefetch_related('tags')
+
+    def get_tags(self, obj):
+        return frozenset(tag.pk for tag in obj.tags.all())
+
+    def get_date(self, obj):
+        return obj.created_at
+
+    def get_text(self, obj):
+        return f'{obj.title} {obj.short_description}'
@@ -0,0 +1,61 @@
+"""
+Signal handlers for projects.
+A cached project detail bundle (projects.bundle) is dropped when its project
+or one of the project's images changes, including when image placeholders
+are stored. Category changes retire every bundle.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from core.images import placeholder_updated
+from core.signals import COUNTER_UPDATE_FIELDS
+from services.models import ServiceCategory
+
+from .bundle import bump_bundle_generation, invalidate_bundle
+from .models import Project, ProjectCategory, ProjectImage
+
+# Shown on many projects' pages, and rarely edited
+CATEGORY_MODELS = (ProjectCategory, ServiceCategory)
+
+
+def _skip(kwargs):
+    if kwargs.get('raw'):
+        return True
+    update_fields = kwargs.get('update_fields')
+    return bool(update_fields and set(update_fields) <= COUNTER_UPDATE_FIELDS)
+
+
+def remember_project_slug(sender, instance, **kwargs):
+    """A renamed project's bundle is cached under its previous slug"""
+    if instance.pk and not kwargs.get('raw'):
+        instance._bundle_slug = Project.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
+
+
+def invalidate_project_bundle(sender, instance, **kwargs):
+    if _skip(kwargs):
+        return
+    invalidate_bundle(instance.slug, getattr(instance, '_bundle_slug', None))
+
+
+def invalidate_image_bundle(sender, instance, **kwargs):
+    if _skip(kwargs):
+        return
+    invalidate_bundle(Project.objects.filter(pk=instance.project_id).values_list('slug', flat=True).first())
+
+
+def invalidate_project_bundles(sender, **kwargs):
+    if _skip(kwargs):
+        return
+    bump_bundle_generation()
+
+
+def connect_project_bundle_invalidation():
+    handlers = [(Project, invalidate_project_bundle), (ProjectImage, invalidate_image_bundle)]
+    handlers += [(model, invalidate_project_bundles) for model in CATEGORY_MODELS]
+    for model, handler in handlers:
+        label = model._meta.label_lower
+        post_save.connect(handler, sender=model, dispatch_uid=f'project_bundle_save_{label}')
+        post_delete.connect(handler, sender=model, dispatch_uid=f'project_bundle_delete_{label}')
+        # Dimensions and LQIP are stored with update(), which sends no post_save
+        placeholder_updated.connect(handler, sender=model, dispatch_uid=f'project_bundle_placeholder_{label}')
+    pre_save.connect(remember_project_slug, sender=Project, dispatch_uid='project_bundle_slug')
@@ -1,7 +1,9 @@
 from django.shortcuts import render
 from django.views.generic import ListView, DetailView
-from django.db.models import Q
+from core.facets import get_facet_set, with_counts
 from core.views import BaseContextMixin
+from core.warmup import is_cache_warmup
+from .bundle import get_project_bundle
 from .models import Project, ProjectCategory, ProjectImage
 from django.shortcuts import redirect
 from django.http import Http404
@@ -14,28 +16,15 @@ class ProjectListView(BaseContextMixin, ListView):
     paginate_by = 12
 
     def get_queryset(self):
-        queryset = Project.objects.filter(is_published=True).select_related('project_type', 'service_category')
-
-        # Filter by category
-        category_slug = self.request.GET.get('category')
-        if category_slug:
-            queryset = queryset.filter(project_type__slug=category_slug)
-
-        # Search functionality
-        search_query = self.request.GET.get('search')
-        if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(location__icontains=search_query) |
-                Q(client_name__icontains=search_query)
-            )
-
-        return queryset
+        # Category and search filters live in projects.facets so counts match the list
+        return get_facet_set('projects').filtered_queryset(self.request.GET).select_related(
+            'project_type', 'service_category'
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = ProjectCategory.objects.filter(is_active=True)
+        counts = get_facet_set('projects').counts(self.request.GET)
+        context['categories'] = with_counts(ProjectCategory.objects.filter(is_active=True), counts['category'])
         context['current_category'] = self.request.GET.get('category', '')
         context['search_query'] = self.request.GET.get('search', '')
         return context
@@ -50,10 +39,19 @@ class ProjectDetailView(BaseContextMixin, DetailView):
         return Project.objects.filter(is_published=True)
 
     def get_object(self):
-        obj = super().get_object()
-        obj.increment_views()
+        self.bundle = get_project_bundle(self.kwargs['slug'])
+        if self.bundle is None:
+            raise Http404("No project found matching the query")
+        obj = self.bundle.project
+        if not is_cache_warmup(self.request):
+            obj.increment_views()
         return obj
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['images'] = self.bundle.images
+        return context
+
     def get(self, request, *args, **kwargs):
         try:
             return super().get(request, *args, **kwargs)
@@ -69,24 +67,17 @@ class GalleryView(BaseContextMixin, ListView):
     paginate_by = 24
 
     def get_queryset(self):
-        qs = (
-            ProjectImage.objects
+        # Optional filtering by project or category via query params (see projects.facets)
+        return (
+            get_facet_set('gallery').filtered_queryset(self.request.GET)
             .select_related('project')
-            .filter(project__is_published=True)
             .order_by('project__order', 'order', 'id')
         )
-        # Optional filtering by project or category via query params
-        project_slug = self.request.GET.get('project')
-        category_slug = self.request.GET.get('category')
-        if project_slug:
-            qs = qs.filter(project__slug=project_slug)
-        if category_slug:
-            qs = qs.filter(project__project_type__slug=category_slug)
-        return qs
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = ProjectCategory.objects.filter(is_active=True)
+        counts = get_facet_set('gallery').counts(self.request.GET)
+        context['categories'] = with_counts(ProjectCategory.objects.filter(is_active=True), counts['category'])
         context['current_category'] = self.request.GET.get('category', '')
         context['current_project'] = self.request.GET.get('project', '')
         return context
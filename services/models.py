@@ -2,6 +2,7 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 from core.models import TimeStampedModel
+from core.mixins import ImagePlaceholderMixin
 from PIL import Image
 import os
 
@@ -39,7 +40,7 @@ class ServiceCategory(TimeStampedModel):
         return reverse('services:category_detail', kwargs={'slug': self.slug})
 
 
-class ServicePageImage(models.Model):
+class ServicePageImage(ImagePlaceholderMixin, models.Model):
     """Images for service category pages - allows admin to upload custom images for each service category"""
     category = models.ForeignKey('ServiceCategory', on_delete=models.CASCADE, related_name='page_images')
     title = models.CharField(max_length=200, help_text="Title/caption for the image")
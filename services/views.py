@@ -7,6 +7,7 @@ from .models import ServiceCategory, Service
 class ServiceListView(BaseContextMixin, ListView):
     """List all service categories"""
     model = ServiceCategory
+    surrogate_keys = ('service-list', 'service-page-image-list')
     template_name = 'services/service_list.html'
     context_object_name = 'categories'
 
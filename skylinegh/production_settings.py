@@ -52,15 +52,28 @@ STORAGES = {
         'BACKEND': 'core.storage.ImageKitStorage',
     },
     'staticfiles': {
-        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+        'BACKEND': 'core.staticfiles.MinifiedManifestStaticFilesStorage',
     },
 }
 MEDIA_URL = IMAGEKIT_URL_ENDPOINT + '/'
 
+# Private S3 bucket for dashboard activity log archives (needs boto3)
+if os.getenv('ACTIVITY_LOG_ARCHIVE_BUCKET'):
+    STORAGES['activity_archive'] = {
+        'BACKEND': 'storages.backends.s3boto3.S3Boto3Storage',
+        'OPTIONS': {
+            'bucket_name': os.environ['ACTIVITY_LOG_ARCHIVE_BUCKET'],
+            'default_acl': 'private',
+            'querystring_auth': True,
+            'file_overwrite': False,
+        },
+    }
+    ACTIVITY_LOG_ARCHIVE_STORAGE = 'activity_archive'
+
 # Static files with WhiteNoise
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
 # Keep for backward compatibility (Django <5); STORAGES['staticfiles'] is authoritative in Django 5+
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STATICFILES_STORAGE = 'core.staticfiles.MinifiedManifestStaticFilesStorage'
 
 # Static files configuration
 STATIC_URL = '/static/'
@@ -72,7 +85,9 @@ STATICFILES_DIRS = [
 # WhiteNoise configuration for optimal performance
 WHITENOISE_USE_FINDERS = False  # Disable in production for performance
 WHITENOISE_AUTOREFRESH = False  # Disable in production
-WHITENOISE_MAX_AGE = 31536000  # 1 year cache for static files
+# Hashed names are always served "immutable" for 10 years; this only applies
+# to the unhashed copies (favicon, robots.txt, direct links)
+WHITENOISE_MAX_AGE = 3600
 WHITENOISE_SKIP_COMPRESS_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'zip', 'gz', 'tgz', 'bz2', 'tbz', 'xz', 'br']
 
 # Security settings
@@ -89,21 +104,20 @@ SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
 
 # Optimized caching for better performance and cost savings
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-        'LOCATION': 'cache_table',
-        'TIMEOUT': 300,  # 5 minutes default
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-            'CULL_FREQUENCY': 3,
-        }
+CACHES['shared'] = {
+    'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+    'LOCATION': 'cache_table',
+    'TIMEOUT': 300,  # 5 minutes default
+    'OPTIONS': {
+        'MAX_ENTRIES': 1000,
+        'CULL_FREQUENCY': 3,
     }
 }
 
-# Cache sessions in database for better performance
+# Cache sessions in database for better performance. Sessions skip the
+# per-process tier so a logout is seen by every worker immediately.
 SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
-SESSION_CACHE_ALIAS = 'default'
+SESSION_CACHE_ALIAS = 'shared'
 SESSION_COOKIE_AGE = 86400  # 24 hours
 
 # Logging
@@ -132,14 +146,7 @@ LOGGING = {
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
-# Template caching for better performance
-TEMPLATES[0]['APP_DIRS'] = False  # Must be False when using custom loaders
-TEMPLATES[0]['OPTIONS']['loaders'] = [
-    ('django.template.loaders.cached.Loader', [
-        'django.template.loaders.filesystem.Loader',
-        'django.template.loaders.app_directories.Loader',
-    ]),
-]
+# Template caching: the cached loader is configured explicitly in settings.py
 
 # Optimize middleware for performance
 MIDDLEWARE = [
@@ -147,7 +154,9 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'core.middleware.WWWRedirectMiddleware',  # Add WWW redirect
+    'core.middleware.SurrogateKeyMiddleware',  # Tag cacheable pages for CDN purges
     'core.middleware.CacheControlMiddleware',  # Add cache control
+    'django.middleware.http.ConditionalGetMiddleware',  # ETag + 304 for unchanged pages
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -54,7 +54,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'core.middleware.WWWRedirectMiddleware',  # Add WWW redirect before other middleware
+    'core.middleware.SurrogateKeyMiddleware',  # Tag cacheable pages for CDN purges
     'core.middleware.CacheControlMiddleware',  # Add cache control for performance
+    'django.middleware.http.ConditionalGetMiddleware',  # ETag + 304 for unchanged pages
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -70,7 +72,7 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
+        'APP_DIRS': False,  # Must be False when loaders are set explicitly
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -80,6 +82,14 @@ TEMPLATES = [
                 'django.template.context_processors.media',
                 'core.context_processors.site_settings',
             ],
+            # Compiled templates are kept per process; warmed at worker start
+            # by core.templating.warm_template_cache (see gunicorn.conf.py)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -133,32 +143,79 @@ USE_I18N = True
 USE_TZ = True
 
 # Caching Configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/1'),
-        'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-        },
-        'KEY_PREFIX': 'skylinegh',
-        'TIMEOUT': 300,  # 5 minutes default
-    }
+# 'shared' is the cross-process cache; 'default' puts a short-lived
+# per-process LRU in front of it (core.cache.TieredCache)
+SHARED_CACHE = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    'OPTIONS': {
+        'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+    },
+    'KEY_PREFIX': 'skylinegh',
+    'TIMEOUT': 300,  # 5 minutes default
 }
 
 # Fallback to database cache if Redis is not available
 if not os.getenv('REDIS_URL'):
-    CACHES = {
-        'default': {
-            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-            'LOCATION': 'cache_table',
-        }
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'cache_table',
     }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.TieredCache',
+        'LOCATION': 'default',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'SHARED_ALIAS': 'shared',
+            'LOCAL_TIMEOUT': 5,  # other workers may see a deleted value this long
+            'LOCAL_MAX_ENTRIES': 1000,
+            'LOCAL_MAX_VALUE_SIZE': 64 * 1024,
+        },
+    },
+    'shared': SHARED_CACHE,
+}
+
 # Cache middleware
 CACHE_MIDDLEWARE_ALIAS = 'default'
 CACHE_MIDDLEWARE_SECONDS = 600  # 10 minutes
 CACHE_MIDDLEWARE_KEY_PREFIX = 'skylinegh'
 
+# Cache-Control per URL name (see core.cache_policy for the presets).
+# Responses carrying cookies, CSRF tokens or messages are always sent private.
+CACHE_POLICY_DEFAULT = 'private'
+CACHE_POLICIES = {
+    'core:home': 'public',
+    'core:about': 'public',
+    'core:team_member_detail': 'public',
+    'core:privacy_policy': 'public',
+    'core:terms_of_service': 'public',
+    'core:sitemap': 'public',
+    'core:contact': 'no-store',
+    'core:newsletter_signup': 'no-store',
+    'projects:*': 'public',
+    'services:*': 'public',
+    'blog:*': 'public',
+    'careers:*': 'public',
+    'careers:job_apply': 'no-store',
+    'careers:application_success': 'private',
+    'dashboard:*': 'no-store',
+    'healthz': 'no-store',
+}
+
+# Surrogate keys (core.surrogate): pages are tagged with the content they
+# show and purged from the CDN when it changes. Without a purge URL nothing
+# is sent; core.surrogate.LocalPurger records purges for tests.
+SURROGATE_KEY_HEADER = config('SURROGATE_KEY_HEADER', default='Surrogate-Key')
+SURROGATE_PURGE_URL = config('SURROGATE_PURGE_URL', default='')
+SURROGATE_PURGE_TOKEN = config('SURROGATE_PURGE_TOKEN', default='')
+SURROGATE_PURGE_TOKEN_HEADER = config('SURROGATE_PURGE_TOKEN_HEADER', default='Fastly-Key')
+SURROGATE_PURGER = config(
+    'SURROGATE_PURGER',
+    default='core.surrogate.HTTPPurger' if SURROGATE_PURGE_URL else 'core.surrogate.NullPurger',
+)
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
@@ -173,6 +230,49 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Background tasks (core.tasks) run on a small in-process thread pool;
+# set BACKGROUND_TASKS_EAGER=True to run them inline (tests, debugging)
+BACKGROUND_TASKS_EAGER = config('BACKGROUND_TASKS_EAGER', default=False, cast=bool)
+BACKGROUND_TASK_WORKERS = config('BACKGROUND_TASK_WORKERS', default=2, cast=int)
+# Queue sweeps each gunicorn worker runs on a timer ({dotted path: seconds}),
+# so retries with backoff run without waiting for the next queued item
+PERIODIC_TASKS = {
+    'core.uploads.process_pending_uploads': 60,
+    'core.outbox.send_queued_emails': 60,
+    'core.storage.process_file_deletions': 300,
+}
+
+# Pre-generated sitemap files (core.sitemaps), rewritten when content changes
+SITEMAP_ROOT = config('SITEMAP_ROOT', default=str(BASE_DIR / 'sitemaps'))
+SITEMAP_DOMAIN = config('SITEMAP_DOMAIN', default='skylinegh.com')
+
+# Dashboard activity log (dashboard.activity): entries are buffered and written
+# in batches; archive_activity_logs moves old entries to gzip NDJSON files in
+# the named STORAGES alias. Archives hold usernames and IP addresses, so this
+# must be a private, durable storage - never the media storage or the
+# container disk. Archiving is refused until it is set.
+ACTIVITY_LOG_BATCH_SIZE = config('ACTIVITY_LOG_BATCH_SIZE', default=50, cast=int)
+ACTIVITY_LOG_FLUSH_INTERVAL = config('ACTIVITY_LOG_FLUSH_INTERVAL', default=5, cast=float)
+ACTIVITY_LOG_RETENTION_DAYS = config('ACTIVITY_LOG_RETENTION_DAYS', default=180, cast=int)
+ACTIVITY_LOG_ARCHIVE_STORAGE = config('ACTIVITY_LOG_ARCHIVE_STORAGE', default='')
+
+# Local spool for form attachments awaiting background upload (core.uploads)
+SPOOL_ROOT = config('SPOOL_ROOT', default=str(BASE_DIR / 'spool'))
+
+# Content-addressed media storage on the local filesystem. Mirrors the ImageKit
+# upload path (hashing, dedup, refcounts, deletion queue) without network access.
+if config('USE_LOCAL_MEDIA_STAND_IN', default=False, cast=bool):
+    STORAGES = {
+        'default': {
+            'BACKEND': 'core.storage.LocalStandInStorage',
+        },
+        'staticfiles': {
+            'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+        },
+    }
+    # Seconds of artificial latency per upload/delete, for load testing
+    LOCAL_MEDIA_BACKEND_LATENCY = config('LOCAL_MEDIA_BACKEND_LATENCY', default=0, cast=float)
+
 # Performance optimizations
 USE_ETAGS = True
 USE_L10N = True
@@ -15,27 +15,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.http import HttpResponse
 from django.conf import settings
 from django.conf.urls.static import static
-from django.contrib.sitemaps.views import sitemap
-from django.views.generic import TemplateView
-from core.sitemaps import (
-    StaticViewSitemap, ProjectSitemap, ServiceSitemap,
-    ServiceCategorySitemap, BlogSitemap, JobSitemap
-)
 from core.health import health_check
-
-# Sitemap configuration
-sitemaps = {
-    'static': StaticViewSitemap,
-    'projects': ProjectSitemap,
-    'services': ServiceSitemap,
-    'service_categories': ServiceCategorySitemap,
-    'blog': BlogSitemap,
-    'jobs': JobSitemap,
-}
+from core.views import RobotsTxtView, SitemapFileView
 
 urlpatterns = [
     # Health check endpoint for Fly.io load balancer
@@ -49,8 +34,10 @@ urlpatterns = [
     path('blog/', include('blog.urls')),
 
     # SEO URLs
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
-    path('robots.txt', TemplateView.as_view(template_name='robots.txt', content_type='text/plain')),
+    # Sitemaps are pre-generated files (core.sitemaps); see generate_sitemaps
+    path('sitemap.xml', SitemapFileView.as_view(), name='sitemap_index'),
+    re_path(r'^(?P<filename>sitemap-[\w-]+\.xml\.gz)$', SitemapFileView.as_view(), name='sitemap_section'),
+    path('robots.txt', RobotsTxtView.as_view()),
 ]
 
 # Serve media files in development
@@ -0,0 +1,46 @@
+/*
+ * Public pages are cached and shared between visitors, so they carry no CSRF
+ * token. Forms with an empty [data-csrf-fragment] input fetch one from
+ * core:session_fragment when they are first submitted.
+ */
+(function () {
+    var script = document.currentScript;
+    var url = script && script.getAttribute('data-url');
+    if (!url) {
+        return;
+    }
+    var pending = null;
+
+    function fetchFragment() {
+        if (!pending) {
+            pending = fetch(url, {
+                credentials: 'same-origin',
+                headers: {'X-Requested-With': 'XMLHttpRequest'}
+            }).then(function (response) {
+                if (!response.ok) {
+                    throw new Error('Session fragment failed: ' + response.status);
+                }
+                return response.json();
+            });
+            pending.catch(function () {
+                pending = null;
+            });
+        }
+        return pending;
+    }
+
+    document.addEventListener('submit', function (event) {
+        var form = event.target;
+        var input = form.querySelector && form.querySelector('input[data-csrf-fragment]');
+        if (!input || input.value) {
+            return;
+        }
+        event.preventDefault();
+        fetchFragment().then(function (fragment) {
+            document.querySelectorAll('input[data-csrf-fragment]').forEach(function (field) {
+                field.value = fragment.csrf_token;
+            });
+            form.submit();
+        });
+    });
+})();